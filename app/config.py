@@ -17,6 +17,73 @@ class Config:
     UDP_TIMEOUT = 5.0  # 초
     UDP_BUFFER_SIZE = 1024
     
+    # 카메라 스트리밍 설정
+    CAMERA_TARGET_FPS = float(os.getenv("CAMERA_TARGET_FPS", 30))  # 캡처 루프 목표 FPS
+    CAMERA_SOURCE_TYPE = os.getenv("CAMERA_SOURCE_TYPE", "camera")  # camera, video, images, synthetic
+    CAMERA_SOURCE_PATH = os.getenv("CAMERA_SOURCE_PATH")  # 동영상 파일 또는 이미지 폴더 경로
+    CAMERA_SOURCE_REALTIME = os.getenv("CAMERA_SOURCE_REALTIME", "true").lower() == "true"  # False면 최대 속도
+    CAMERA_OVERLAY_MODE = os.getenv("CAMERA_OVERLAY_MODE", "server")  # server: 픽셀에 그림, client: 브라우저에서 그림
+    STREAM_CLIENT_QUEUE_SIZE = int(os.getenv("STREAM_CLIENT_QUEUE_SIZE", 2))  # 클라이언트별 대기 프레임 수
+    CAMERA_MAX_STREAMS = int(os.getenv("CAMERA_MAX_STREAMS", 4))  # 한 프로세스에서 동시에 운영할 카메라(카운터) 수
+    
+    # 얼굴 탐지 설정
+    FACE_DETECTION_MAX_SIDE = int(os.getenv("FACE_DETECTION_MAX_SIDE", 0))  # 탐지 입력 최대 변 길이 (0: 원본)
+    FACE_TRACKING_ENABLED = os.getenv("FACE_TRACKING_ENABLED", "true").lower() == "true"  # 키프레임 사이 트래커 사용
+    FACE_DETECTION_INTERVAL = int(os.getenv("FACE_DETECTION_INTERVAL", 5))  # 키프레임 간격 (프레임)
+    FACE_TRACK_MIN_CONFIDENCE = float(os.getenv("FACE_TRACK_MIN_CONFIDENCE", 0.5))  # 재탐지 트리거 신뢰도
+    
+    # 얼굴 인식 설정
+    FACE_ALIGNMENT_MODE = os.getenv("FACE_ALIGNMENT_MODE", "landmarks")  # landmarks: MediaPipe 키포인트, mtcnn: MTCNN 재탐지
+    FACE_MTCNN_FALLBACK = os.getenv("FACE_MTCNN_FALLBACK", "true").lower() == "true"  # 키포인트 없을 때 MTCNN 사용
+    FACE_INFERENCE_BACKEND = os.getenv("FACE_INFERENCE_BACKEND", "eager")  # eager, torchscript, int8, onnx
+    FACE_BACKEND_FIXTURES = os.getenv("FACE_BACKEND_FIXTURES", "./fixtures/faces")  # 백엔드 정확도 검증용 정렬된 얼굴 이미지 폴더
+    FACE_BACKEND_MIN_FIXTURES = int(os.getenv("FACE_BACKEND_MIN_FIXTURES", 8))  # 검증에 필요한 최소 얼굴 이미지 수
+    FACE_BACKEND_MIN_COSINE = float(os.getenv("FACE_BACKEND_MIN_COSINE", 0.99))  # fp32 대비 최소 코사인 유사도
+    
+    # 얼굴 갤러리 설정 (사용자별 다중 템플릿)
+    FACE_MAX_TEMPLATES = int(os.getenv("FACE_MAX_TEMPLATES", 5))  # 사용자당 최대 템플릿 수
+    FACE_SEARCH_INDEX = os.getenv("FACE_SEARCH_INDEX", "bruteforce")  # 후보 검색 인덱스: bruteforce, chroma, ivfpq
+    FACE_EMBEDDING_STORAGE = os.getenv("FACE_EMBEDDING_STORAGE", "float32")  # 갤러리 저장 형식: float32, float16, int8 (메모리 절감용, 손실 압축)
+    FACE_SEARCH_SHORTLIST = int(os.getenv("FACE_SEARCH_SHORTLIST", 10))  # 템플릿으로 재정렬할 후보 사용자 수
+    FACE_TEMPLATE_ADD_SIMILARITY = float(os.getenv("FACE_TEMPLATE_ADD_SIMILARITY", 0.8))  # 인식 결과를 템플릿으로 추가할 최소 유사도
+    FACE_TEMPLATE_DUPLICATE_SIMILARITY = float(os.getenv("FACE_TEMPLATE_DUPLICATE_SIMILARITY", 0.95))  # 기존 템플릿과 중복 판정 유사도
+    FACE_TEMPLATE_MIN_INTERVAL = float(os.getenv("FACE_TEMPLATE_MIN_INTERVAL", 10.0))  # 사용자별 템플릿 추가 최소 간격 (초)
+    
+    # 갤러리 스냅샷 설정 (mmap 시작 및 노드 간 복제)
+    GALLERY_SNAPSHOT_DIR = os.getenv("GALLERY_SNAPSHOT_DIR", "./faces_snapshot")  # 스냅샷 폴더
+    GALLERY_LOAD_SNAPSHOT_ON_START = os.getenv("GALLERY_LOAD_SNAPSHOT_ON_START", "true").lower() == "true"  # 시작 시 스냅샷 사용
+    
+    # 대량 등록 설정
+    BULK_ENROLL_WORKERS = int(os.getenv("BULK_ENROLL_WORKERS", max(1, (os.cpu_count() or 2) - 1)))  # 탐지/정렬 프로세스 수
+    BULK_ENROLL_BATCH_SIZE = int(os.getenv("BULK_ENROLL_BATCH_SIZE", 32))  # FaceNet 배치 및 DB 삽입 단위
+    
+    # 얼굴 품질 평가 설정
+    FACE_QUALITY_MIN_SCORE = float(os.getenv("FACE_QUALITY_MIN_SCORE", 0.45))  # 임베딩 단계로 보낼 최소 품질 점수
+    FACE_QUALITY_MIN_SIZE = int(os.getenv("FACE_QUALITY_MIN_SIZE", 40))  # 최소 얼굴 크기 (px)
+    ENROLLMENT_WINDOW_SECONDS = float(os.getenv("ENROLLMENT_WINDOW_SECONDS", 1.5))  # 등록 프레임 수집 시간 (초)
+    ENROLLMENT_TOP_K = int(os.getenv("ENROLLMENT_TOP_K", 3))  # 등록에 사용할 상위 품질 프레임 수
+    ENROLLMENT_MAX_WAIT = float(os.getenv("ENROLLMENT_MAX_WAIT", 5.0))  # 기준 통과 프레임을 기다릴 최대 시간 (초)
+    
+    # 얼굴 인식 워커 설정
+    RECOGNITION_QUEUE_SIZE = int(os.getenv("RECOGNITION_QUEUE_SIZE", 4))  # 대기 가능한 인식 작업 수
+    RECOGNITION_BATCH_SIZE = int(os.getenv("RECOGNITION_BATCH_SIZE", 4))  # 한 번에 임베딩할 최대 얼굴 수
+    
+    # 트랙별 임베딩 캐시 설정
+    EMBEDDING_CACHE_TTL = float(os.getenv("EMBEDDING_CACHE_TTL", 30.0))  # 캐시 유효 시간 (초)
+    EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", 64))  # 최대 캐시 트랙 수
+    EMBEDDING_CACHE_REFRESH_MARGIN = float(os.getenv("EMBEDDING_CACHE_REFRESH_MARGIN", 0.15))  # 재임베딩할 품질 향상 폭
+    
+    # 트랙별 신원 투표 설정
+    IDENTITY_VOTE_WINDOW = int(os.getenv("IDENTITY_VOTE_WINDOW", 5))  # 트랙별로 모을 최근 검색 결과 수
+    IDENTITY_VOTE_TOP_K = int(os.getenv("IDENTITY_VOTE_TOP_K", 3))  # 검색 한 번에 투표할 후보 수
+    IDENTITY_COMMIT_CONFIDENCE = float(os.getenv("IDENTITY_COMMIT_CONFIDENCE", 0.7))  # 신원 확정 신뢰도
+    IDENTITY_MIN_VOTES = int(os.getenv("IDENTITY_MIN_VOTES", 2))  # 확정에 필요한 최소 검색 횟수
+    IDENTITY_INSTANT_SIMILARITY = float(os.getenv("IDENTITY_INSTANT_SIMILARITY", 0.85))  # 1회로 확정할 유사도
+    
+    # 세션 설정 (카메라, 트랙)별 얼굴 상태
+    SESSION_FACE_TIMEOUT = float(os.getenv("SESSION_FACE_TIMEOUT", 5.0))  # 트랙이 사라진 뒤 상태를 유지할 시간 (초)
+    SESSION_MAX_TRACKS_PER_CAMERA = int(os.getenv("SESSION_MAX_TRACKS_PER_CAMERA", 4))  # 카메라당 동시에 인식할 최대 얼굴 수
+    
     @classmethod
     def get_robot_address(cls):
         """로봇 제어 PC 주소 반환"""
@@ -1,8 +1,11 @@
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from .routers import chatbot, camera, robot, face
+from .services.lazy_service import get_lazy_services, warm_up_services
+from .config import config
+import asyncio
 import os
 
 # FastAPI 애플리케이션 초기화
@@ -104,10 +107,32 @@ async def health_check():
             "robot": "/robot/*",
             "face": "/face/*",
             "docs": "/docs",
-            "health": "/health"
+            "health": "/health",
+            "ready": "/ready"
         }
     }
 
+# 준비 상태 확인 엔드포인트
+@app.get("/ready", summary="모델 준비 상태 확인")
+async def readiness_check():
+    """
+    모델 등 무거운 컴포넌트의 로딩/워밍업 상태를 반환합니다.
+    모든 컴포넌트가 준비되기 전에는 503을 반환합니다.
+    
+    Returns:
+        JSONResponse: 전체 준비 여부와 컴포넌트별 상태 및 로딩 시간
+    """
+    components = {name: service.get_load_status() for name, service in get_lazy_services().items()}
+    ready = all(component["ready"] for component in components.values())
+    
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "ready": ready,
+            "components": components
+        }
+    )
+
 # API 문서 정보 업데이트
 @app.get("/info", summary="시스템 정보")
 async def get_system_info():
@@ -166,22 +191,15 @@ async def startup_event():
     print("=" * 60)
     print("📋 시스템 초기화 중...")
     
-    # 서비스들 초기화 확인
-    try:
-        from .services.face_detection_service import face_detection_service
-        from .services.face_recognition_service import face_recognition_service  
-        from .services.face_database_service import face_database_service
-        from .services.session_manager import session_manager
-        from .services.communication_service import communication_service
-        
-        print("✅ 얼굴 탐지 서비스 활성화")
-        print("✅ 얼굴 인식 서비스 활성화") 
-        print("✅ 얼굴 데이터베이스 활성화")
-        print("✅ 세션 매니저 활성화")
-        print("✅ 로봇 통신 서비스 활성화")
-        
-    except Exception as e:
-        print(f"⚠️ 서비스 초기화 중 오류 발생: {e}")
+    # eager 이외의 추론 백엔드는 운영자가 넣은 얼굴 이미지로 정확도를 검증한 뒤에만 쓰므로,
+    # 검증용 이미지가 없으면 eager로 조용히 되돌아가지 않고 시작을 중단
+    if config.FACE_INFERENCE_BACKEND != "eager":
+        from .services.inference_backends import check_fixture_faces
+        check_fixture_faces(config.FACE_BACKEND_FIXTURES, config.FACE_BACKEND_MIN_FIXTURES)
+    
+    # 무거운 모델은 백그라운드에서 병렬로 로딩/워밍업 (/health는 즉시 응답)
+    app.state.warmup_task = asyncio.create_task(warm_up_services())
+    print("⏳ 얼굴 탐지/인식 모델 및 얼굴 데이터베이스 백그라운드 로딩 시작 (/ready에서 확인)")
     
     print("🚀 서버가 성공적으로 시작되었습니다!")
     print("🌐 웹 인터페이스: http://localhost:8000")
@@ -200,14 +218,23 @@ async def shutdown_event():
     
     try:
         # 카메라 리소스 정리
-        from .routers.camera import camera_manager
-        camera_manager.stop_camera()
+        from .routers.camera import camera_managers
+        # 카메라별 캡처 스레드 종료 대기를 병렬로 (이벤트 루프는 막지 않음)
+        await asyncio.gather(*(
+            asyncio.to_thread(manager.stop_camera) for manager in list(camera_managers.values())
+        ))
         print("✅ 카메라 리소스 정리 완료")
         
-        # 얼굴 탐지 서비스 정리
+        # 얼굴 인식 워커 정리
+        from .services.recognition_worker import recognition_worker
+        recognition_worker.stop()
+        print("✅ 얼굴 인식 워커 정리 완료")
+        
+        # 얼굴 탐지 서비스 정리 (생성된 경우에만)
         from .services.face_detection_service import face_detection_service
-        face_detection_service.close()
-        print("✅ 얼굴 탐지 서비스 정리 완료")
+        if face_detection_service.is_loaded:
+            face_detection_service.close()
+            print("✅ 얼굴 탐지 서비스 정리 완료")
         
         # 세션 매니저 정리
         from .services.session_manager import session_manager
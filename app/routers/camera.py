@@ -1,156 +1,595 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
+import asyncio
+import json
 import cv2
 import threading
 import time
-from typing import Optional
+from typing import Optional, Dict
 from ..services.face_detection_service import face_detection_service
+from ..services.frame_broadcaster import FrameBroadcaster
+from ..services.frame_pacer import FramePacer
+from ..services.frame_sources import create_frame_source
+from ..services.frame_buffers import FrameBufferRing
+from ..services.recognition_worker import (
+    recognition_worker, RecognitionJob, FaceSample, EnrollmentWindow, crop_face_region
+)
+from ..services.face_quality import face_quality_scorer
+from ..services.session_manager import session_manager
+from ..services.embedding_cache import embedding_cache
+from ..config import config
 
 router = APIRouter()
 
 class CameraManager:
-    def __init__(self):
+    def __init__(self, camera_id: int = 0):
+        """
+        카메라 매니저 초기화
+        
+        Args:
+            camera_id (int): 카메라(카운터) ID - 세션과 트래커가 이 ID로 분리됨
+        """
+        self.camera_id = camera_id
         self.camera = None
         self.is_streaming = False
         self.lock = threading.Lock()
+        
+        # 단일 캡처 스레드가 인코딩한 프레임을 모든 뷰어에게 공유
+        self.broadcaster = FrameBroadcaster()
+        self.capture_thread: Optional[threading.Thread] = None
+        
+        # 캡처 스레드마다 자기 종료 이벤트를 가짐 (늦게 끝난 이전 스레드가 새 스트림을 닫지 못하게 함)
+        self.stop_event: Optional[threading.Event] = None
+        
+        # start/stop은 API 요청마다 워커 스레드에서 실행되므로 서로 겹치지 않게 직렬화
+        self.lifecycle_lock = threading.RLock()
+        
+        # 처리 시간을 반영하는 데드라인 기반 FPS 조절
+        self.pacer = FramePacer(target_fps=config.CAMERA_TARGET_FPS)
+        
+        # 캡처/반전용 사전 할당 버퍼 (루프 안에서 프레임 배열을 새로 만들지 않음)
+        self.capture_buffers = FrameBufferRing(size=2)
+        self.output_buffers = FrameBufferRing(size=3)
+        self.frame_shape = None  # 첫 프레임으로 확인한 소스 해상도
+        
+        # 오버레이 모드: "server"는 박스를 픽셀에 그려 인코딩, "client"는 원본만 인코딩하고
+        # 박스는 /camera/detections 메타데이터로 보내 브라우저에서 그림
+        self.overlay_mode = config.CAMERA_OVERLAY_MODE
+        
+        # 얼굴 등록 요청 시 품질 상위 프레임 수집 구간
+        self.enrollment_window: Optional[EnrollmentWindow] = None
+    
+    def start_camera(self, camera_index: int = 0, fps: Optional[float] = None,
+                     source_type: Optional[str] = None, source_path: Optional[str] = None,
+                     realtime: Optional[bool] = None):
+        """
+        카메라(프레임 소스)를 시작합니다.
+        
+        Args:
+            camera_index (int): 카메라 인덱스 (camera 소스)
+            fps (Optional[float]): 목표 FPS (기본값: 설정값)
+            source_type (Optional[str]): "camera", "video", "images", "synthetic" (기본값: 설정값)
+            source_path (Optional[str]): 동영상 파일 또는 이미지 폴더 경로
+            realtime (Optional[bool]): False면 파일/합성 소스를 최대 속도로 처리 (벤치마크용)
+        """
+        with self.lifecycle_lock:
+            return self._start_camera(camera_index, fps, source_type, source_path, realtime)
     
-    def start_camera(self, camera_index: int = 0):
-        """카메라를 시작합니다."""
+    def _start_camera(self, camera_index: int, fps: Optional[float], source_type: Optional[str],
+                      source_path: Optional[str], realtime: Optional[bool]) -> bool:
+        """lifecycle_lock을 잡은 상태에서 카메라를 시작합니다."""
+        # 이전 캡처 스레드가 있다면 먼저 정리
+        self.stop_camera()
+        
+        source_type = source_type or config.CAMERA_SOURCE_TYPE
+        source_path = source_path or config.CAMERA_SOURCE_PATH
+        realtime = config.CAMERA_SOURCE_REALTIME if realtime is None else realtime
+        fps = fps or config.CAMERA_TARGET_FPS
+        
         with self.lock:
-            if self.camera is not None:
-                self.camera.release()
-            
             try:
-                self.camera = cv2.VideoCapture(camera_index)
-                if not self.camera.isOpened():
-                    raise Exception(f"카메라 {camera_index}를 열 수 없습니다.")
-                
-                # 카메라 설정
-                self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-                self.camera.set(cv2.CAP_PROP_FPS, 30)
+                self.camera = create_frame_source(
+                    source_type,
+                    path=source_path,
+                    camera_index=camera_index,
+                    fps=fps,
+                    realtime=realtime
+                )
+                if not self.camera.open():
+                    raise Exception(f"프레임 소스 '{source_type}'를 열 수 없습니다.")
                 
                 self.is_streaming = True
-                print(f"카메라 {camera_index} 시작됨 (얼굴 탐지 활성화)")
-                return True
                 
             except Exception as e:
                 print(f"카메라 시작 오류: {e}")
+                if self.camera is not None:
+                    self.camera.release()
                 self.camera = None
                 self.is_streaming = False
                 return False
+        
+        # 얼굴 인식은 별도 워커 스레드에서 처리 (영상 루프를 막지 않음)
+        recognition_worker.start()
+        
+        # 캡처/처리/인코딩 스레드 시작 (뷰어 수와 무관하게 하나만 실행)
+        # 최대 속도 모드에서는 파이프라인 페이싱도 끔
+        self.pacer.set_target_fps(fps if realtime else 0)
+        stop_event = threading.Event()
+        with self.lock:
+            self.stop_event = stop_event
+            self.frame_shape = None
+            self.broadcaster.reset()
+        self.capture_thread = threading.Thread(target=self._capture_loop, args=(stop_event,), daemon=True)
+        self.capture_thread.start()
+        print(f"카메라 {self.camera_id}: 프레임 소스 '{source_type}' 시작됨 (얼굴 탐지 활성화)")
+        return True
     
     def stop_camera(self):
-        """카메라를 중지합니다."""
+        """
+        카메라를 중지합니다.
+        
+        캡처 스레드 종료를 최대 2초 기다리므로 이벤트 루프에서는 asyncio.to_thread로 호출합니다.
+        """
+        with self.lifecycle_lock:
+            with self.lock:
+                if self.stop_event is not None:
+                    self.stop_event.set()
+                    self.stop_event = None
+                self.is_streaming = False
+                self.broadcaster.close()
+            
+            # 캡처 스레드 종료 대기 (스레드가 lock을 잡을 수 있으므로 lock 밖에서 대기)
+            thread = self.capture_thread
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout=2.0)
+                if thread.is_alive():
+                    print(f"카메라 {self.camera_id}: 이전 캡처 스레드가 아직 종료되지 않았습니다 (종료 이벤트로 분리됨)")
+            self.capture_thread = None
+            
+            with self.lock:
+                if self.camera is not None:
+                    self.camera.release()
+                    self.camera = None
+                    print(f"카메라 {self.camera_id} 중지됨")
+            
+            # 이 카메라의 트랙과 세션 정리 (다른 카메라에는 영향 없음)
+            self.enrollment_window = None
+            if face_detection_service.is_loaded:
+                face_detection_service.release_camera(self.camera_id)
+            session_manager.reset_face_state(self.camera_id)
+    
+    def _capture_loop(self, stop_event: threading.Event):
+        """
+        프레임을 캡처, 처리, 인코딩하여 공유 슬롯에 한 번만 게시합니다.
+        
+        Args:
+            stop_event (threading.Event): 이 스레드 전용 종료 이벤트
+        """
+        while not stop_event.is_set():
+            if not self.capture_frame(stop_event):
+                break
+            
+            # 목표 FPS에 맞춰 남은 시간만큼만 대기
+            self.pacer.wait()
+        
+        # 소스가 끝나 스스로 종료한 경우에만 스트림을 닫음 (이미 새 스레드로 교체되었다면 건드리지 않음)
         with self.lock:
-            self.is_streaming = False
-            if self.camera is not None:
-                self.camera.release()
-                self.camera = None
-                print("카메라 중지됨")
+            if self.stop_event is stop_event:
+                self.is_streaming = False
+                self.broadcaster.close()
     
-    def generate_frames(self):
-        """프레임을 생성합니다."""
-        frame_count = 0
+    def capture_frame(self, stop_event: threading.Event) -> bool:
+        """
+        프레임 하나를 캡처, 처리, 인코딩하여 공유 슬롯에 게시합니다 (캡처 루프의 한 반복).
         
-        while self.is_streaming:
-            with self.lock:
-                if self.camera is None or not self.camera.isOpened():
-                    break
+        Args:
+            stop_event (threading.Event): 캡처 스레드의 종료 이벤트
+            
+        Returns:
+            bool: 계속 캡처할 수 있으면 True (소스 종료, 읽기 실패, 중지 요청 시 False)
+        """
+        with self.lock:
+            # 종료 이벤트를 lock 안에서 확인하여, 분리된 이전 스레드가 새 프레임 소스를 읽지 않게 함
+            if stop_event.is_set() or self.camera is None or not self.camera.isOpened():
+                return False
+            
+            # 첫 프레임으로 크기를 확인한 뒤부터는 미리 할당한 버퍼에 직접 읽음
+            capture_buffer = self.capture_buffers.acquire(self.frame_shape) if self.frame_shape else None
+            success, raw_frame = self.camera.read(capture_buffer) if capture_buffer is not None else self.camera.read()
+        
+        if not success:
+            print("프레임을 읽을 수 없습니다.")
+            return False
+        
+        frame_shape = self.frame_shape = raw_frame.shape
+        
+        # 미러 효과 (좌우 반전, 출력 버퍼에 기록)
+        frame = cv2.flip(raw_frame, 1, dst=self.output_buffers.acquire(frame_shape))
+        
+        # 얼굴 탐지 및 바운딩 박스 그리기 (항상 활성화)
+        bboxes, track_ids, user_ids = [], [], []
+        try:
+            # 키프레임에서만 탐지하고 사이 프레임은 트래커로 전파 (트랙 ID 유지)
+            tracks = face_detection_service.detect_and_track(frame, camera_id=self.camera_id)
+            bboxes = [track.int_bbox(frame_shape[1], frame_shape[0]) for track in tracks]
+            track_ids = [track.track_id for track in tracks]
+            
+            # 인식/등록 작업은 워커 큐에만 넣고 기다리지 않음 (박스를 그리기 전 원본에서 크롭)
+            user_ids = self._update_recognition(frame, tracks, bboxes)
+            
+            if self.overlay_mode == "server":
+                face_detection_service.draw_face_boxes(frame, bboxes, inplace=True)
+        except Exception as e:
+            print(f"얼굴 탐지 오류: {e}")
+            # 얼굴 탐지에 실패해도 원본 프레임을 계속 전송
+        
+        # 프레임을 JPEG로 인코딩 (모든 뷰어가 같은 결과를 공유)
+        ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+        if ret and not stop_event.is_set():
+            # 탐지 결과도 함께 게시하여 /face-count가 카메라를 다시 읽지 않도록 함
+            self.broadcaster.publish(
+                buffer.tobytes(), bboxes,
+                track_ids=track_ids,
+                user_ids=user_ids,
+                frame_size=(frame_shape[1], frame_shape[0])
+            )
+        return True
+    
+    def _update_recognition(self, frame, tracks, bboxes) -> list:
+        """
+        화면의 얼굴들을 이 카메라의 (트랙별) 세션에 반영하고, 필요한 경우 인식/등록 작업을 워커에 제출합니다.
+        
+        큰 얼굴부터 최대 SESSION_MAX_TRACKS_PER_CAMERA개까지 동시에 인식하며,
+        등록은 요청 시점에 지정된 트랙에서만 수집합니다 (다른 손님이 더 가까이 와도 바뀌지 않음).
+        
+        Returns:
+            list: 트랙별 인식된 사용자 ID (오버레이 표시용)
+        """
+        if not tracks:
+            session_manager.update_faces(self.camera_id, [])
+            return []
+        
+        areas = [(x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in bboxes]
+        order = sorted(range(len(tracks)), key=lambda i: areas[i], reverse=True)
+        primary = order[0]
+        
+        # 프레임당 한 번만 세션을 갱신하고, 이후에는 반환된 불변 스냅샷을 읽음
+        session = session_manager.update_faces(
+            self.camera_id,
+            [(track.track_id, bbox) for track, bbox in zip(tracks, bboxes)],
+            primary_track_id=tracks[primary].track_id
+        )
+        
+        pending_registration = session.pending_registration
+        targets = order[:max(1, config.SESSION_MAX_TRACKS_PER_CAMERA)]
+        if pending_registration is not None:
+            # 등록 대상 트랙은 크기 순위와 관계없이 항상 처리
+            targets += [i for i in order[len(targets):] if tracks[i].track_id == pending_registration["track_id"]]
+        
+        for i in targets:
+            track, bbox = tracks[i], bboxes[i]
+            # 선명도/크기/포즈/밝기 품질 평가 (기준 미달 크롭은 임베딩하지 않음)
+            quality = face_quality_scorer.score(frame, bbox, track.keypoints)
+            state = session.faces.get(track.track_id)
+            kind = None
+            
+            if pending_registration is not None and track.track_id == pending_registration["track_id"]:
+                # 등록은 수집 구간 동안 품질 상위 k개 프레임을 모아 한 번에 제출
+                self._collect_enrollment(frame, track, bbox, quality, pending_registration["user_id"])
+            elif state is not None and not state.search_performed:
+                # 같은 트랙을 이미 인식했다면 캐시된 결과를 재사용 (임베딩 생략)
+                # 캐시 조회는 실제로 임베딩을 제출할 프레임에서만 하여 적중/실패 통계가 임베딩 수와 맞도록 함
+                if quality.passed and not recognition_worker.is_pending("search", track.track_id):
+                    cached = embedding_cache.get(track.track_id, quality.score)
+                    if cached is None:
+                        kind = "search"
+                    elif cached.user_id is not None:
+                        session_manager.set_recognized_user(cached.user_id, track_id=track.track_id,
+                                                            camera_id=self.camera_id)
+                    else:
+                        session_manager.set_unknown_user(track_id=track.track_id, camera_id=self.camera_id)
+            elif (quality.passed and not recognition_worker.is_pending("search", track.track_id)
+                  and embedding_cache.needs_refresh(track.track_id, quality.score)):
+                # 캐시가 없거나 만료되었거나 얼굴 품질이 충분히 좋아졌으면 다시 인식
+                # (재인식 작업이 진행 중인 프레임은 판단하지 않아 적중/실패 통계에 넣지 않음)
+                kind = "search"
+            
+            if kind is not None and not recognition_worker.is_pending(kind, track.track_id):
+                cropped = crop_face_region(frame, bbox, track.keypoints)
+                if cropped is not None:
+                    face_crop, local_bbox, local_keypoints = cropped
+                    recognition_worker.submit(RecognitionJob(
+                        frame_id=self.broadcaster.frame_id + 1,
+                        track_id=track.track_id,
+                        face_crop=face_crop,
+                        bbox=local_bbox,
+                        keypoints=local_keypoints,
+                        kind=kind,
+                        quality=quality.score,
+                        camera_id=self.camera_id
+                    ))
+        
+        # 세션에 확정된 결과를 표시하고, 인식 대상에서 빠진 트랙은 캐시된 결과를 표시
+        session = session_manager.get_snapshot(self.camera_id)
+        user_ids = []
+        for track in tracks:
+            state = session.faces.get(track.track_id)
+            if state is not None and state.search_performed:
+                user_ids.append(state.user_id if state.is_recognized else None)
+            else:
+                cached = embedding_cache.peek(track.track_id)
+                user_ids.append(cached.user_id if cached is not None else None)
+        return user_ids
+    
+    def _collect_enrollment(self, frame, track, bbox, quality, user_id: str):
+        """등록 수집 구간에 현재 얼굴을 추가하고, 구간이 끝나면 상위 품질 크롭으로 등록 작업을 제출합니다."""
+        if recognition_worker.is_pending("register", track.track_id):
+            return
+        
+        window = self.enrollment_window
+        if window is None or window.user_id != user_id or window.track_id != track.track_id:
+            # 새 요청이거나 등록 대상 얼굴이 바뀌면 수집을 다시 시작
+            window = self.enrollment_window = EnrollmentWindow(
+                user_id, track.track_id,
+                duration=config.ENROLLMENT_WINDOW_SECONDS,
+                top_k=config.ENROLLMENT_TOP_K,
+                max_wait=config.ENROLLMENT_MAX_WAIT
+            )
+        
+        if window.accepts(quality.score, quality.passed):
+            cropped = crop_face_region(frame, bbox, track.keypoints)
+            if cropped is not None:
+                face_crop, local_bbox, local_keypoints = cropped
+                window.add(FaceSample(face_crop, local_bbox, local_keypoints, quality.score), quality.passed)
+        
+        if not window.is_complete():
+            return
+        
+        self.enrollment_window = None
+        samples = window.select()
+        if not samples:
+            return
+        
+        best = samples[0]
+        print(f"등록 프레임 선택: {len(samples)}/{window.frames_seen}개 (최고 품질 {best.quality:.2f})")
+        recognition_worker.submit(RecognitionJob(
+            frame_id=self.broadcaster.frame_id + 1,
+            track_id=track.track_id,
+            face_crop=best.face_crop,
+            bbox=best.bbox,
+            keypoints=best.keypoints,
+            kind="register",
+            user_id=user_id,
+            quality=best.quality,
+            extra_samples=samples[1:],
+            camera_id=self.camera_id
+        ))
+    
+    async def generate_frames(self, client: str = "unknown"):
+        """
+        공유 슬롯에서 최신 프레임을 받아 MJPEG 청크로 내보냅니다.
+        
+        클라이언트마다 작은 큐를 두어 느린 클라이언트는 프레임을 건너뛰고,
+        캡처 스레드나 다른 클라이언트를 지연시키지 않습니다.
+        """
+        subscriber = self.broadcaster.subscribe(
+            asyncio.get_running_loop(),
+            maxsize=config.STREAM_CLIENT_QUEUE_SIZE,
+            client=client
+        )
+        
+        try:
+            while self.is_streaming:
+                try:
+                    item = await asyncio.wait_for(subscriber.queue.get(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    continue
                 
-                success, frame = self.camera.read()
-                if not success:
-                    print("프레임을 읽을 수 없습니다.")
+                # 스트림 종료 신호
+                if item is None:
                     break
                 
-                # 미러 효과 (좌우 반전)
-                frame = cv2.flip(frame, 1)
-                
-                # 얼굴 탐지 및 바운딩 박스 그리기 (항상 활성화)
+                _, frame_bytes = item
+                yield (b'--frame\r\n'
+                       b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+                subscriber.delivered_frames += 1
+        finally:
+            self.broadcaster.unsubscribe(subscriber)
+    
+    async def generate_detection_events(self, client: str = "unknown"):
+        """
+        프레임별 탐지 메타데이터(바운딩 박스, 트랙 ID, 사용자 ID)를 SSE 이벤트로 내보냅니다.
+        
+        프레임 ID가 함께 전송되므로 클라이언트가 원본 스트림 위에 오버레이를 그릴 수 있습니다.
+        """
+        subscriber = self.broadcaster.subscribe(
+            asyncio.get_running_loop(),
+            maxsize=config.STREAM_CLIENT_QUEUE_SIZE,
+            client=client,
+            channel="detections"
+        )
+        
+        try:
+            while self.is_streaming:
                 try:
-                    frame = face_detection_service.process_frame(frame)
-                except Exception as e:
-                    print(f"얼굴 탐지 오류: {e}")
-                    # 얼굴 탐지에 실패해도 원본 프레임을 계속 전송
-                
-                # 프레임을 JPEG로 인코딩
-                ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-                if not ret:
+                    snapshot = await asyncio.wait_for(subscriber.queue.get(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    # 연결 유지용 주석 이벤트
+                    yield ": keep-alive\n\n"
                     continue
                 
-                frame_bytes = buffer.tobytes()
+                if snapshot is None:
+                    break
                 
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-            
-            # FPS 조절 (약 30 FPS)
-            time.sleep(0.033)
-            frame_count += 1
+                yield f"id: {snapshot.frame_id}\ndata: {json.dumps(snapshot.to_dict())}\n\n"
+                subscriber.delivered_frames += 1
+        finally:
+            self.broadcaster.unsubscribe(subscriber)
+
+# 전역 카메라 매니저 인스턴스 (기본 카메라 0번)
+camera_manager = CameraManager(camera_id=0)
+
+# 카메라 ID별 매니저 (카운터마다 독립된 캡처 루프, 트래커, 세션을 가짐)
+camera_managers: Dict[int, CameraManager] = {0: camera_manager}
+camera_managers_lock = threading.Lock()
 
-# 전역 카메라 매니저 인스턴스
-camera_manager = CameraManager()
+def get_camera_manager(camera_id: int = 0, create: bool = False) -> CameraManager:
+    """
+    카메라 ID에 해당하는 매니저를 반환합니다.
+    
+    Args:
+        camera_id (int): 카메라 ID
+        create (bool): 없으면 새로 만듦 (CAMERA_MAX_STREAMS대까지)
+    """
+    manager = camera_managers.get(camera_id)
+    if manager is not None:
+        return manager
+    if not create:
+        raise HTTPException(status_code=404, detail=f"카메라 {camera_id}가 등록되지 않았습니다.")
+    
+    with camera_managers_lock:
+        manager = camera_managers.get(camera_id)
+        if manager is None:
+            if len(camera_managers) >= config.CAMERA_MAX_STREAMS:
+                raise HTTPException(status_code=400, detail=f"카메라는 최대 {config.CAMERA_MAX_STREAMS}대까지 사용할 수 있습니다.")
+            manager = camera_managers[camera_id] = CameraManager(camera_id=camera_id)
+        return manager
 
 @router.get("/stream")
-async def video_stream():
+async def video_stream(request: Request, camera_id: int = 0):
     """비디오 스트림을 반환합니다."""
-    if not camera_manager.is_streaming:
-        # 카메라가 시작되지 않았다면 시작 시도
-        if not camera_manager.start_camera():
+    manager = get_camera_manager(camera_id)
+    if not manager.is_streaming:
+        # 카메라가 시작되지 않았다면 시작 시도 (이전 스레드 종료 대기가 이벤트 루프를 막지 않도록 워커 스레드에서)
+        if not await asyncio.to_thread(manager.start_camera):
             raise HTTPException(status_code=500, detail="카메라를 시작할 수 없습니다.")
     
     return StreamingResponse(
-        camera_manager.generate_frames(),
+        manager.generate_frames(client=request.client.host if request.client else "unknown"),
         media_type="multipart/x-mixed-replace; boundary=frame"
     )
 
+@router.get("/detections")
+async def detection_stream(request: Request, camera_id: int = 0):
+    """프레임별 얼굴 탐지 메타데이터를 Server-Sent Events로 반환합니다."""
+    manager = get_camera_manager(camera_id)
+    if not manager.is_streaming:
+        raise HTTPException(status_code=409, detail="카메라가 활성화되지 않음")
+    
+    return StreamingResponse(
+        manager.generate_detection_events(client=request.client.host if request.client else "unknown"),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/overlay")
+async def set_overlay_mode(mode: str, camera_id: int = 0):
+    """바운딩 박스 오버레이 방식을 변경합니다 ("server" 또는 "client")."""
+    if mode not in ("server", "client"):
+        raise HTTPException(status_code=400, detail="mode는 'server' 또는 'client'여야 합니다.")
+    
+    get_camera_manager(camera_id).overlay_mode = mode
+    return {"message": f"오버레이 모드: {mode}", "status": "success", "overlay_mode": mode}
+
 @router.post("/start")
-async def start_camera(camera_index: int = 0):
-    """카메라를 시작합니다."""
+async def start_camera(camera_index: int = 0, fps: Optional[float] = None,
+                       source: Optional[str] = None, path: Optional[str] = None,
+                       realtime: Optional[bool] = None, camera_id: int = 0):
+    """
+    카메라(또는 동영상/이미지 폴더/합성 영상 소스)를 시작합니다.
+    
+    camera_id는 카운터(세션) 번호이고 camera_index는 장치 번호입니다.
+    새 camera_id로 시작하면 별도의 캡처 루프가 추가됩니다.
+    """
     try:
-        success = camera_manager.start_camera(camera_index)
+        manager = get_camera_manager(camera_id, create=True)
+        success = await asyncio.to_thread(manager.start_camera, camera_index, fps, source, path, realtime)
         if success:
-            return {"message": f"카메라 {camera_index} 시작됨", "status": "success"}
+            return {"message": f"카메라 {camera_index} 시작됨", "status": "success", "camera_id": camera_id}
         else:
             raise HTTPException(status_code=500, detail="카메라를 시작할 수 없습니다.")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/stop")
-async def stop_camera():
+async def stop_camera(camera_id: int = 0):
     """카메라를 중지합니다."""
     try:
-        camera_manager.stop_camera()
-        return {"message": "카메라 중지됨", "status": "success"}
+        await asyncio.to_thread(get_camera_manager(camera_id).stop_camera)
+        return {"message": "카메라 중지됨", "status": "success", "camera_id": camera_id}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/status")
-async def camera_status():
+async def camera_status(camera_id: int = 0):
     """카메라 상태를 반환합니다."""
+    manager = get_camera_manager(camera_id)
     return {
-        "is_streaming": camera_manager.is_streaming,
-        "camera_active": camera_manager.camera is not None and camera_manager.camera.isOpened(),
-        "face_detection_enabled": True  # 항상 활성화
+        "camera_id": manager.camera_id,
+        "is_streaming": manager.is_streaming,
+        "camera_active": manager.camera is not None and manager.camera.isOpened(),
+        "face_detection_enabled": True,  # 항상 활성화
+        "overlay_mode": manager.overlay_mode,
+        "detection_max_side": face_detection_service.detection_max_side,
+        "tracking": face_detection_service.get_tracking_info(),
+        "source": manager.camera.get_info() if manager.camera is not None else None,
+        "pacing": manager.pacer.get_stats(),
+        "clients": manager.broadcaster.get_subscriber_stats()
+    }
+
+@router.get("/cameras")
+async def list_cameras():
+    """등록된 모든 카메라(카운터)의 상태를 반환합니다."""
+    return {
+        "max_streams": config.CAMERA_MAX_STREAMS,
+        "cameras": [
+            {
+                "camera_id": manager.camera_id,
+                "is_streaming": manager.is_streaming,
+                "source": manager.camera.get_info() if manager.camera is not None else None,
+                "pacing": manager.pacer.get_stats(),
+                "current_user": session_manager.get_current_user_id(manager.camera_id),
+                "active_faces": len(session_manager.get_snapshot(manager.camera_id).faces)
+            }
+            for manager in sorted(list(camera_managers.values()), key=lambda m: m.camera_id)
+        ]
     }
 
 @router.get("/face-count")
-async def get_face_count():
-    """현재 프레임에서 탐지된 얼굴 개수를 반환합니다."""
+async def get_face_count(max_age_ms: Optional[float] = None, camera_id: int = 0):
+    """
+    파이프라인이 게시한 최신 탐지 결과에서 얼굴 개수를 반환합니다.
+    
+    Args:
+        max_age_ms (Optional[float]): 스냅샷이 이보다 오래되었으면 다음 프레임의 결과를 기다림
+        camera_id (int): 카메라 ID
+    """
     try:
-        if not camera_manager.is_streaming or camera_manager.camera is None:
+        manager = get_camera_manager(camera_id)
+        if not manager.is_streaming or manager.camera is None:
             return {"face_count": 0, "message": "카메라가 활성화되지 않음"}
         
-        with camera_manager.lock:
-            success, frame = camera_manager.camera.read()
-            if not success:
-                return {"face_count": 0, "message": "프레임을 읽을 수 없음"}
-            
-            frame = cv2.flip(frame, 1)
-            face_count = face_detection_service.get_face_count(frame)
-            
-            return {
-                "face_count": face_count,
-                "message": f"{face_count}개의 얼굴이 탐지됨"
-            }
+        snapshot = manager.broadcaster.get_detection_snapshot()
+        
+        if max_age_ms is not None and (snapshot is None or snapshot.age_ms() > max_age_ms):
+            # 카메라를 직접 읽지 않고 파이프라인의 다음 프레임 결과를 기다림
+            last_frame_id = snapshot.frame_id if snapshot is not None else 0
+            await asyncio.to_thread(manager.broadcaster.wait_for_frame, last_frame_id)
+            snapshot = manager.broadcaster.get_detection_snapshot()
+        
+        if snapshot is None:
+            return {"face_count": 0, "message": "아직 처리된 프레임이 없음"}
+        
+        return {
+            "face_count": snapshot.face_count,
+            "message": f"{snapshot.face_count}개의 얼굴이 탐지됨",
+            **snapshot.to_dict()
+        }
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,19 +1,48 @@
 from fastapi import APIRouter, HTTPException
+import asyncio
+import os
 from pydantic import BaseModel
 from typing import Optional, List, Dict
 from ..services.face_database_service import face_database_service
 from ..services.face_recognition_service import face_recognition_service
 from ..services.session_manager import session_manager
+from ..services.recognition_worker import recognition_worker
+from ..services.embedding_cache import embedding_cache
+from ..services.identity_voting import identity_voter
+from ..services.face_quality import face_quality_scorer
+from ..services.bulk_enrollment import bulk_enrollment_manager
+from ..services import gallery_snapshot
 
 router = APIRouter()
 
 # 요청 데이터 구조 정의
 class UserRegistrationRequest(BaseModel):
     user_id: str
+    camera_id: int = 0  # 등록할 얼굴이 보이는 카메라
 
 class DeleteUserRequest(BaseModel):
     user_id: str
 
+class BulkEnrollmentRequest(BaseModel):
+    path: str  # 서버의 이미지 폴더 또는 zip 파일 경로
+    manifest: Optional[str] = None  # manifest CSV (헤더: image,user_id)
+    workers: Optional[int] = None
+    batch_size: Optional[int] = None
+
+class SnapshotExportRequest(BaseModel):
+    directory: Optional[str] = None  # 기본값: 설정된 스냅샷 폴더
+
+class SnapshotImportRequest(BaseModel):
+    directory: str
+    version: Optional[int] = None  # 기본값: 최신 버전
+
+class SnapshotPullRequest(BaseModel):
+    master_url: str  # 예: http://192.168.0.10:8000
+
+class InferenceBackendRequest(BaseModel):
+    backend: str
+    fixtures_path: Optional[str] = None
+
 @router.get("/status")
 async def get_face_system_status():
     """얼굴 인식 시스템 상태를 반환합니다."""
@@ -33,13 +62,36 @@ async def get_face_system_status():
         return {
             "status": "active",
             "recognition_service": recognition_info,
+            "recognition_worker": recognition_worker.get_stats(),
+            "embedding_cache": embedding_cache.get_stats(),
+            "identity_voting": identity_voter.get_stats(),
+            "face_quality": face_quality_scorer.get_stats(),
             "database": db_info,
+            "gallery_memory": face_database_service.get_memory_info(),
             "session": session_info,
             "current_face": face_info
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"상태 조회 오류: {str(e)}")
 
+@router.post("/inference-backend")
+async def set_inference_backend(request: InferenceBackendRequest):
+    """FaceNet 추론 백엔드를 변경합니다 (fp32 대비 정확도 검증 통과 시에만 적용)."""
+    try:
+        report = await asyncio.to_thread(
+            face_recognition_service.set_inference_backend,
+            request.backend,
+            request.fixtures_path
+        )
+        
+        return {
+            "status": "success" if report.get("passed") else "rejected",
+            "active_backend": face_recognition_service.backend.name,
+            "accuracy": report
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"추론 백엔드 변경 오류: {str(e)}")
+
 @router.post("/register-current-face")
 async def register_current_face(request: UserRegistrationRequest):
     """현재 화면에 있는 얼굴을 등록합니다."""
@@ -52,20 +104,21 @@ async def register_current_face(request: UserRegistrationRequest):
         if len(user_id) < 2:
             raise HTTPException(status_code=400, detail="사용자 ID는 2글자 이상이어야 합니다.")
         
-        # 현재 얼굴 바운딩 박스 가져오기
-        bbox = session_manager.get_face_bbox()
+        # 현재 주 얼굴 가져오기 (등록은 이 트랙에서만 수집)
+        primary = session_manager.get_snapshot(request.camera_id).primary_face
         
-        if bbox is None:
+        if primary is None or primary.bbox is None:
             raise HTTPException(status_code=400, detail="현재 화면에 얼굴이 감지되지 않습니다.")
         
         # 등록 대기 상태로 설정
-        session_manager.set_pending_registration(user_id, bbox)
+        session_manager.set_pending_registration(user_id, primary.bbox, camera_id=request.camera_id,
+                                                 track_id=primary.track_id)
         
         return {
             "status": "success",
             "message": f"사용자 '{user_id}' 얼굴 등록이 요청되었습니다.",
             "user_id": user_id,
-            "next_step": "카메라에서 얼굴을 등록 중입니다."
+            "next_step": "카메라에서 품질이 좋은 얼굴 프레임을 모아 등록 중입니다."
         }
         
     except HTTPException:
@@ -73,6 +126,134 @@ async def register_current_face(request: UserRegistrationRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"얼굴 등록 오류: {str(e)}")
 
+@router.post("/bulk-enroll")
+async def start_bulk_enrollment(request: BulkEnrollmentRequest):
+    """폴더 또는 zip의 이미지들을 대량 등록하는 작업을 시작합니다."""
+    try:
+        if not os.path.exists(request.path):
+            raise HTTPException(status_code=400, detail=f"경로를 찾을 수 없습니다: {request.path}")
+        
+        job = bulk_enrollment_manager.start(
+            request.path,
+            request.manifest,
+            workers=request.workers,
+            batch_size=request.batch_size
+        )
+        
+        return {
+            "status": "success",
+            "message": "대량 등록 작업이 시작되었습니다.",
+            "job": job.get_status()
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"대량 등록 시작 오류: {str(e)}")
+
+@router.get("/bulk-enroll/{job_id}")
+async def get_bulk_enrollment_status(job_id: str):
+    """대량 등록 작업의 진행 상황과 이미지별 실패 사유를 반환합니다."""
+    job = bulk_enrollment_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="대량 등록 작업을 찾을 수 없습니다.")
+    
+    return {
+        "status": "success",
+        "job": job.get_status()
+    }
+
+@router.get("/snapshot")
+async def get_snapshot_info():
+    """갤러리 스냅샷 상태(최신/시작 시 버전, 마스터 동기화 상태)를 반환합니다."""
+    try:
+        return {
+            "status": "success",
+            "snapshot": face_database_service.get_snapshot_info()
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"스냅샷 정보 조회 오류: {str(e)}")
+
+@router.post("/snapshot/export")
+async def export_gallery_snapshot(request: SnapshotExportRequest):
+    """현재 갤러리를 새 버전의 스냅샷으로 내보냅니다."""
+    try:
+        result = await asyncio.to_thread(face_database_service.export_snapshot, request.directory)
+        
+        return {
+            "status": "success",
+            "message": f"스냅샷 v{result['version']}을 내보냈습니다.",
+            "snapshot": result
+        }
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"스냅샷 내보내기 오류: {str(e)}")
+
+@router.post("/snapshot/import")
+async def import_gallery_snapshot(request: SnapshotImportRequest):
+    """스냅샷으로 갤러리와 데이터베이스를 교체합니다."""
+    try:
+        result = await asyncio.to_thread(face_database_service.import_snapshot, request.directory, request.version)
+        
+        # 이전 갤러리 기준의 인식 결과는 더 이상 유효하지 않음
+        embedding_cache.clear()
+        identity_voter.clear()
+        
+        return {
+            "status": "success",
+            "message": f"스냅샷 v{result['version']}을 가져왔습니다.",
+            "snapshot": result
+        }
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"스냅샷 가져오기 오류: {str(e)}")
+
+@router.get("/snapshot/delta")
+async def get_gallery_snapshot_delta(since_version: int = 0):
+    """since_version 이후 최신 스냅샷까지의 변경분을 반환합니다 (복제 노드가 호출)."""
+    try:
+        directory = face_database_service.snapshot_dir
+        if not directory:
+            raise HTTPException(status_code=400, detail="스냅샷 폴더가 설정되지 않았습니다.")
+        
+        delta = await asyncio.to_thread(gallery_snapshot.compute_delta, directory, since_version)
+        if delta is None:
+            raise HTTPException(status_code=404, detail="내보낸 스냅샷이 없습니다.")
+        
+        return {
+            "status": "success",
+            "delta": delta
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"스냅샷 변경분 조회 오류: {str(e)}")
+
+@router.post("/snapshot/pull")
+async def pull_gallery_snapshot(request: SnapshotPullRequest):
+    """마스터 노드에서 마지막 동기화 이후의 변경분만 받아 적용합니다."""
+    try:
+        result = await asyncio.to_thread(face_database_service.pull_from_master, request.master_url)
+        
+        if result["added"] or result["removed"]:
+            embedding_cache.clear()
+            identity_voter.clear()
+        
+        return {
+            "status": "success",
+            "message": f"마스터 v{result['master_version']}과 동기화되었습니다.",
+            "sync": result
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"마스터 동기화 오류: {str(e)}")
+
 @router.delete("/users/{user_id}")
 async def delete_user_face(user_id: str):
     """특정 사용자의 얼굴 정보를 삭제합니다."""
@@ -80,6 +261,8 @@ async def delete_user_face(user_id: str):
         success = face_database_service.delete_user(user_id)
         
         if success:
+            embedding_cache.invalidate_user(user_id)
+            identity_voter.invalidate_user(user_id)
             return {
                 "status": "success",
                 "message": f"사용자 '{user_id}' 얼굴 정보가 삭제되었습니다.",
@@ -94,45 +277,71 @@ async def delete_user_face(user_id: str):
         raise HTTPException(status_code=500, detail=f"사용자 삭제 오류: {str(e)}")
 
 @router.get("/users")
-async def get_all_users():
-    """등록된 모든 사용자 목록을 반환합니다."""
+async def get_all_users(limit: int = 50, cursor: Optional[str] = None, prefix: str = ""):
+    """등록된 사용자 목록을 ID 순으로 한 페이지씩 반환합니다 (prefix로 ID 접두사 검색)."""
     try:
-        users = face_database_service.get_all_users()
+        if limit < 1 or limit > 500:
+            raise HTTPException(status_code=400, detail="limit은 1-500 사이여야 합니다.")
+        
+        page = face_database_service.list_users(limit, cursor, prefix)
         
         return {
             "status": "success",
-            "total_users": len(users),
-            "users": users
+            "total_users": page["total_users"],
+            "matched": page["matched"],
+            "users": page["users"],
+            "next_cursor": page["next_cursor"]
         }
         
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"사용자 목록 조회 오류: {str(e)}")
 
 @router.get("/current-session")
-async def get_current_session():
-    """현재 세션 정보를 반환합니다."""
+async def get_current_session(camera_id: int = 0):
+    """카메라의 현재 세션 정보를 반환합니다 (주 얼굴과 함께 인식된 모든 사용자 포함)."""
     try:
-        face_info = session_manager.get_current_face_info()
-        current_user = session_manager.get_current_user_id()
-        pending_registration = session_manager.get_pending_registration()
+        # 불변 스냅샷 하나에서 읽어 항목 간 일관성을 유지 (영상 루프를 막지 않음)
+        session = session_manager.get_snapshot(camera_id)
+        primary = session.primary_face
+        face_info = session_manager.get_current_face_info(camera_id) if primary is None else primary.to_dict()
         
         return {
             "status": "success",
-            "current_user": current_user,
+            "camera_id": camera_id,
+            "current_user": primary.user_id if primary is not None and primary.is_recognized else None,
             "face_detected": face_info["has_face"],
             "is_recognized": face_info["is_recognized"],
-            "pending_registration": pending_registration is not None,
-            "face_info": face_info
+            "pending_registration": session.pending_registration is not None,
+            "face_info": face_info,
+            "recognized_users": [state.to_dict() for state in session.recognized_faces()],
+            "version": session.version
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"세션 정보 조회 오류: {str(e)}")
+
+@router.get("/sessions")
+async def get_all_sessions():
+    """모든 카메라의 (트랙별) 세션과 현재 인식된 사용자를 반환합니다."""
+    try:
+        return {
+            "status": "success",
+            "recognized_users": session_manager.get_recognized_users(),
+            **session_manager.get_session_stats()
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"세션 정보 조회 오류: {str(e)}")
 
 @router.post("/reset-session")
-async def reset_current_session():
-    """현재 세션을 초기화합니다."""
+async def reset_current_session(camera_id: Optional[int] = None):
+    """세션을 초기화합니다 (camera_id가 없으면 모든 카메라)."""
     try:
-        session_manager.reset_face_state()
+        session_manager.reset_face_state(camera_id)
         
         return {
             "status": "success",
@@ -149,8 +358,10 @@ async def clear_face_database():
         success = face_database_service.clear_database()
         
         if success:
-            # 세션도 함께 초기화
+            # 세션, 임베딩 캐시, 신원 투표 기록도 함께 초기화
             session_manager.reset_face_state()
+            embedding_cache.clear()
+            identity_voter.clear()
             
             return {
                 "status": "success",
@@ -165,11 +376,11 @@ async def clear_face_database():
         raise HTTPException(status_code=500, detail=f"데이터베이스 초기화 오류: {str(e)}")
 
 @router.get("/similarity-test/{user_id}")
-async def test_similarity_with_current_face(user_id: str):
+async def test_similarity_with_current_face(user_id: str, camera_id: int = 0):
     """현재 얼굴과 특정 사용자의 유사도를 테스트합니다."""
     try:
         # 현재 얼굴 바운딩 박스 가져오기
-        bbox = session_manager.get_face_bbox()
+        bbox = session_manager.get_face_bbox(camera_id)
         
         if bbox is None:
             raise HTTPException(status_code=400, detail="현재 화면에 얼굴이 감지되지 않습니다.")
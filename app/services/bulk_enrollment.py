@@ -0,0 +1,315 @@
+import argparse
+import csv
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+import cv2
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Tuple
+from ..config import config
+from .face_detection_service import FaceDetectionService
+from .face_alignment import align_face_array
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+# 실패 목록 최대 보관 수 (수천 장 등록 시 상태 응답이 너무 커지지 않도록)
+MAX_REPORTED_FAILURES = 1000
+
+@dataclass
+class EnrollmentItem:
+    """대량 등록할 이미지 한 장"""
+    image_path: str
+    user_id: str
+
+def load_manifest(root: str, manifest_path: Optional[str] = None) -> List[EnrollmentItem]:
+    """
+    등록 목록을 읽습니다.
+
+    manifest(CSV, 헤더: image,user_id)가 있으면 그대로 사용하고, 없으면 폴더 안의 이미지를 찾아
+    하위 폴더 이름(없으면 파일 이름)을 사용자 ID로 사용합니다.
+
+    Args:
+        root (str): 이미지 폴더
+        manifest_path (Optional[str]): manifest 경로 (기본값: root/manifest.csv가 있으면 사용)
+
+    Returns:
+        List[EnrollmentItem]: 등록 목록
+    """
+    if manifest_path is None and os.path.exists(os.path.join(root, "manifest.csv")):
+        manifest_path = os.path.join(root, "manifest.csv")
+
+    if manifest_path is not None:
+        items = []
+        with open(manifest_path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                image, user_id = (row.get("image") or "").strip(), (row.get("user_id") or "").strip()
+                if image and user_id:
+                    items.append(EnrollmentItem(os.path.join(root, image), user_id))
+        return items
+
+    items = []
+    for directory, _, files in sorted(os.walk(root)):
+        for name in sorted(files):
+            stem, extension = os.path.splitext(name)
+            if extension.lower() not in IMAGE_EXTENSIONS:
+                continue
+            relative_dir = os.path.relpath(directory, root)
+            user_id = stem if relative_dir == "." else relative_dir.split(os.sep)[0]
+            items.append(EnrollmentItem(os.path.join(directory, name), user_id))
+    return items
+
+# 프로세스 풀 작업자별 탐지기 (작업자 초기화 시 생성)
+_detector: Optional[FaceDetectionService] = None
+
+def _init_worker(detection_max_side: int):
+    global _detector
+    cv2.setNumThreads(1)
+    _detector = FaceDetectionService(detection_max_side=detection_max_side)
+
+def _prepare_image(image_path: str) -> Tuple[Optional[np.ndarray], Optional[str], int]:
+    """
+    이미지 한 장을 읽어 가장 큰 얼굴을 탐지하고 FaceNet 입력으로 정렬합니다 (작업자 프로세스에서 실행).
+
+    Returns:
+        Tuple: (정렬된 얼굴 배열 또는 None, 실패 사유, 탐지된 얼굴 수)
+    """
+    # 손상되었거나 특이한 이미지에서 cv2/MediaPipe가 예외를 던져도 작업 전체를 멈추지 않고 해당 이미지만 실패 처리
+    try:
+        image = cv2.imread(image_path)
+        if image is None:
+            return None, "unreadable_image", 0
+
+        detections = _detector.detect_faces_detailed(image)
+        if not detections:
+            return None, "no_face", 0
+
+        largest = max(detections, key=lambda d: (d.bbox[2] - d.bbox[0]) * (d.bbox[3] - d.bbox[1]))
+        aligned = align_face_array(image, largest.keypoints)
+        if aligned is None:
+            return None, "alignment_failed", len(detections)
+        return aligned, None, len(detections)
+    except Exception as e:
+        return None, f"error: {e}", 0
+
+class BulkEnrollmentJob:
+    """
+    폴더/zip 이미지의 대량 얼굴 등록 작업
+
+    탐지와 정렬은 프로세스 풀에서 병렬로 수행하고, FaceNet 임베딩은 메인 프로세스에서 배치로 계산한 뒤
+    갤러리에 배치 단위로 저장합니다. 진행 상황과 이미지별 실패 사유를 기록합니다.
+    """
+
+    def __init__(self, path: str, manifest_path: Optional[str] = None,
+                 workers: int = 2, batch_size: int = 32, detection_max_side: int = 640):
+        """
+        대량 등록 작업 초기화
+
+        Args:
+            path (str): 이미지 폴더 또는 zip 파일 경로
+            manifest_path (Optional[str]): manifest CSV 경로 (zip이면 압축 내부 기준 상대 경로)
+            workers (int): 탐지/정렬 프로세스 수
+            batch_size (int): FaceNet 배치 크기이자 DB 삽입 단위
+            detection_max_side (int): 탐지 입력 최대 변 길이 (큰 사진의 탐지 비용 절감)
+        """
+        self.job_id = uuid.uuid4().hex[:8]
+        self.path = path
+        self.manifest_path = manifest_path
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.detection_max_side = detection_max_side
+
+        self.status = "pending"  # pending, running, completed, failed
+        self.error: Optional[str] = None
+        self.total = 0
+        self.processed = 0
+        self.enrolled = 0
+        self.failures: List[Dict[str, Any]] = []
+        self.failed = 0
+        self.users = set()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def _record_failure(self, item: EnrollmentItem, reason: str):
+        self.failed += 1
+        if len(self.failures) < MAX_REPORTED_FAILURES:
+            self.failures.append({"image": item.image_path, "user_id": item.user_id, "error": reason})
+
+    def run(self, progress_callback=None):
+        """작업을 실행합니다 (호출한 스레드에서 끝까지 수행)."""
+        self.status = "running"
+        self.started_at = time.time()
+        extracted_dir = None
+
+        try:
+            root = self.path
+            manifest_path = self.manifest_path
+            if zipfile.is_zipfile(self.path):
+                extracted_dir = tempfile.mkdtemp(prefix="bulk_enroll_")
+                with zipfile.ZipFile(self.path) as archive:
+                    archive.extractall(extracted_dir)
+                root = extracted_dir
+                if manifest_path is not None and not os.path.isabs(manifest_path):
+                    manifest_path = os.path.join(extracted_dir, manifest_path)
+            elif not os.path.isdir(self.path):
+                raise ValueError(f"폴더 또는 zip 파일이 아닙니다: {self.path}")
+
+            items = load_manifest(root, manifest_path)
+            self.total = len(items)
+            self._process_items(items, progress_callback)
+            self.status = "completed"
+
+        except Exception as e:
+            self.status = "failed"
+            self.error = str(e)
+            print(f"대량 등록 오류: {e}")
+
+        finally:
+            self.finished_at = time.time()
+            if extracted_dir is not None:
+                shutil.rmtree(extracted_dir, ignore_errors=True)
+
+    def _process_items(self, items: List[EnrollmentItem], progress_callback=None):
+        pending: List[Tuple[EnrollmentItem, np.ndarray]] = []
+
+        # 작업자는 torch를 불러오지 않도록 spawn으로 시작 (메인 프로세스의 스레드 상태와 분리)
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(self.detection_max_side,)) as executor:
+            paths = [item.image_path for item in items]
+            for item, (aligned, error, _) in zip(items, executor.map(_prepare_image, paths, chunksize=4)):
+                if aligned is None:
+                    self._record_failure(item, error)
+                    self.processed += 1
+                else:
+                    pending.append((item, aligned))
+
+                if len(pending) >= self.batch_size:
+                    self._embed_and_store(pending)
+                    pending = []
+                    if progress_callback is not None:
+                        progress_callback(self)
+
+            if pending:
+                self._embed_and_store(pending)
+                if progress_callback is not None:
+                    progress_callback(self)
+
+    def _embed_and_store(self, batch: List[Tuple[EnrollmentItem, np.ndarray]]):
+        """정렬된 얼굴을 한 번의 FaceNet forward로 임베딩하고 한 번에 저장합니다."""
+        import torch
+        from .face_recognition_service import face_recognition_service
+        from .face_database_service import face_database_service
+
+        embeddings = face_recognition_service.embed_face_tensors(
+            [torch.from_numpy(aligned) for _, aligned in batch]
+        )
+
+        entries, stored_items = [], []
+        for (item, _), embedding in zip(batch, embeddings):
+            if embedding is None:
+                self._record_failure(item, "embedding_failed")
+            else:
+                entries.append((item.user_id, embedding))
+                stored_items.append(item)
+
+        try:
+            face_database_service.add_templates_bulk(entries, source="bulk")
+            self.enrolled += len(entries)
+            self.users.update(item.user_id for item in stored_items)
+        except Exception as e:
+            for item in stored_items:
+                self._record_failure(item, f"store_failed: {e}")
+
+        self.processed += len(batch)
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        작업 진행 상황을 반환합니다.
+
+        Returns:
+            Dict: 상태, 진행 수, 등록/실패 수, 처리 속도, 실패 목록
+        """
+        end = self.finished_at or time.time()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "path": self.path,
+            "total": self.total,
+            "processed": self.processed,
+            "enrolled": self.enrolled,
+            "failed": self.failed,
+            "users": len(self.users),
+            "elapsed_seconds": round(elapsed, 1),
+            "images_per_minute": round(self.processed / elapsed * 60, 1) if elapsed > 0 else None,
+            "error": self.error,
+            "failures": self.failures
+        }
+
+class BulkEnrollmentManager:
+    """대량 등록 작업을 백그라운드 스레드로 실행하고 작업 ID로 조회할 수 있게 관리합니다."""
+
+    def __init__(self):
+        self.jobs: Dict[str, BulkEnrollmentJob] = {}
+        self.lock = threading.Lock()
+
+    def start(self, path: str, manifest_path: Optional[str] = None,
+              workers: Optional[int] = None, batch_size: Optional[int] = None) -> BulkEnrollmentJob:
+        """
+        대량 등록 작업을 시작합니다.
+
+        Args:
+            path (str): 서버의 이미지 폴더 또는 zip 파일 경로
+            manifest_path (Optional[str]): manifest CSV 경로
+            workers (Optional[int]): 탐지/정렬 프로세스 수 (기본값: 설정값)
+            batch_size (Optional[int]): 배치 크기 (기본값: 설정값)
+
+        Returns:
+            BulkEnrollmentJob: 시작된 작업
+        """
+        job = BulkEnrollmentJob(
+            path, manifest_path,
+            workers=workers or config.BULK_ENROLL_WORKERS,
+            batch_size=batch_size or config.BULK_ENROLL_BATCH_SIZE
+        )
+        with self.lock:
+            self.jobs[job.job_id] = job
+        threading.Thread(target=job.run, daemon=True).start()
+        return job
+
+    def get(self, job_id: str) -> Optional[BulkEnrollmentJob]:
+        with self.lock:
+            return self.jobs.get(job_id)
+
+# 전역 인스턴스
+bulk_enrollment_manager = BulkEnrollmentManager()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="얼굴 대량 등록")
+    parser.add_argument("--path", required=True, help="이미지 폴더 또는 zip 파일")
+    parser.add_argument("--manifest", default=None, help="manifest CSV (헤더: image,user_id)")
+    parser.add_argument("--workers", type=int, default=config.BULK_ENROLL_WORKERS)
+    parser.add_argument("--batch-size", type=int, default=config.BULK_ENROLL_BATCH_SIZE)
+    args = parser.parse_args()
+
+    def print_progress(job: BulkEnrollmentJob):
+        status = job.get_status()
+        print(f"[{status['processed']}/{status['total']}] 등록 {status['enrolled']}  실패 {status['failed']}  "
+              f"({status['images_per_minute']} 장/분)")
+
+    job = BulkEnrollmentJob(args.path, args.manifest, workers=args.workers, batch_size=args.batch_size)
+    job.run(progress_callback=print_progress)
+
+    status = job.get_status()
+    print(f"완료: {status['status']} - 등록 {status['enrolled']}장 / 사용자 {status['users']}명 / 실패 {status['failed']}장")
+    for failure in status["failures"][:20]:
+        print(f"  실패: {failure['image']} ({failure['user_id']}) - {failure['error']}")
+    if status["error"]:
+        print(f"오류: {status['error']}")
@@ -2,6 +2,7 @@ import cv2
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import time
+from .frame_sources import create_frame_source
 
 class CameraService:
     def __init__(self):
@@ -9,25 +10,32 @@ class CameraService:
         self.executor = ThreadPoolExecutor(max_workers=4)  # 카메라별 스레드
         self.last_frame_time = {}  # 프레임 타이밍 관리
     
-    def open_camera(self, camera_id: int):
-        """카메라를 열고 초기화합니다."""
+    def open_camera(self, camera_id: int, source_type: str = "camera", source_path: str = None,
+                    realtime: bool = True):
+        """
+        카메라(프레임 소스)를 열고 초기화합니다.
+        
+        Args:
+            camera_id (int): 카메라 ID (camera 소스에서는 장치 인덱스)
+            source_type (str): "camera", "video", "images", "synthetic"
+            source_path (str): 동영상 파일 또는 이미지 폴더 경로
+            realtime (bool): False면 파일/합성 소스를 최대 속도로 읽음
+        """
         if camera_id not in self.cameras:
             try:
-                cap = cv2.VideoCapture(camera_id)
+                if source_type == "camera":
+                    # 카메라 설정 최적화 (버퍼 최소화 + MJPEG 코덱)
+                    cap = create_frame_source(
+                        "camera", camera_index=camera_id, fps=30,
+                        buffer_size=1, fourcc='MJPG'
+                    )
+                else:
+                    cap = create_frame_source(source_type, path=source_path, fps=30, realtime=realtime)
                 
-                if not cap.isOpened():
+                if not cap.open():
                     print(f"Cannot open camera {camera_id}")
                     return False
                 
-                # 카메라 설정 최적화 (옛날 코드 스타일)
-                cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-                cap.set(cv2.CAP_PROP_FPS, 30)
-                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # 버퍼 크기 최소화
-                
-                # 추가 최적화 설정
-                cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))  # MJPEG 코덱
-                
                 self.cameras[camera_id] = cap
                 self.last_frame_time[camera_id] = time.time()
                 print(f"Camera {camera_id} opened successfully")
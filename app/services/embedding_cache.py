@@ -0,0 +1,190 @@
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any
+from ..config import config
+
+@dataclass
+class CachedEmbedding:
+    """트랙별로 캐시된 임베딩과 인식 결과"""
+    track_id: int
+    embedding: np.ndarray
+    quality: float  # 임베딩을 추출한 얼굴의 품질 점수
+    user_id: Optional[str] = None  # None이면 미등록 사용자
+    similarity: Optional[float] = None
+    created_at: float = field(default_factory=time.time)
+    reuse_counted: bool = False  # 이 항목으로 재임베딩을 생략한 것을 이미 집계했는지
+
+class EmbeddingCache:
+    """
+    트래커 ID 기준 임베딩 캐시
+
+    이미 인식한 트랙은 다시 임베딩하지 않고 캐시된 결과를 재사용합니다.
+    항목이 만료되었거나 현재 얼굴 품질이 캐시 당시보다 충분히 좋아진 경우에만 새로 임베딩하여,
+    흐릿하거나 옆모습인 첫 프레임의 결과가 계속 유지되지 않도록 합니다.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 64, refresh_margin: float = 0.15):
+        """
+        임베딩 캐시 초기화
+
+        Args:
+            ttl (float): 캐시 항목 유효 시간 (초)
+            max_entries (int): 최대 항목 수 (초과 시 가장 오래 사용하지 않은 항목 제거)
+            refresh_margin (float): 이 값 이상 품질이 좋아지면 다시 임베딩
+        """
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.refresh_margin = refresh_margin
+        self.entries: "OrderedDict[int, CachedEmbedding]" = OrderedDict()
+        self.lock = threading.Lock()
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.evictions = 0
+
+    def _is_expired(self, entry: CachedEmbedding, now: float) -> bool:
+        return now - entry.created_at >= self.ttl
+
+    def _improved(self, entry: CachedEmbedding, quality: Optional[float]) -> bool:
+        return quality is not None and quality >= entry.quality + self.refresh_margin
+
+    def get(self, track_id: Optional[int], quality: Optional[float] = None) -> Optional[CachedEmbedding]:
+        """
+        임베딩이 필요한 시점에 캐시를 조회합니다 (적중/실패 통계에 반영).
+
+        Args:
+            track_id (Optional[int]): 트랙 ID
+            quality (Optional[float]): 현재 얼굴 품질 점수
+
+        Returns:
+            Optional[CachedEmbedding]: 재사용 가능한 항목 (만료되었거나 품질이 충분히 좋아졌으면 None)
+        """
+        if track_id is None:
+            return None
+
+        with self.lock:
+            entry = self.entries.get(track_id)
+            if entry is None or self._is_expired(entry, time.time()) or self._improved(entry, quality):
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(track_id)
+            self.hits += 1
+            entry.reuse_counted = True
+            return entry
+
+    def peek(self, track_id: Optional[int]) -> Optional[CachedEmbedding]:
+        """통계에 반영하지 않고 유효한 항목을 조회합니다 (오버레이 표시 등)."""
+        if track_id is None:
+            return None
+
+        with self.lock:
+            entry = self.entries.get(track_id)
+            if entry is None or self._is_expired(entry, time.time()):
+                return None
+            return entry
+
+    def needs_refresh(self, track_id: Optional[int], quality: Optional[float]) -> bool:
+        """
+        이미 인식된 트랙을 다시 임베딩해야 하는지 확인합니다 (적중/실패 통계에 반영).
+
+        항목이 없으면(만료 후 다른 트랙의 put에서 정리되었거나 최대 개수 초과로 밀려난 경우) 다시 임베딩합니다.
+        True를 반환하면 호출 측이 임베딩을 제출하므로 실패로 집계합니다. 유효한 항목은 매 프레임 다시 확인되므로,
+        같은 항목으로 생략한 재임베딩은 항목당 한 번만 적중으로 집계합니다 (작업 진행 중에는 호출하지 않아야 함).
+
+        Args:
+            track_id (Optional[int]): 트랙 ID
+            quality (Optional[float]): 현재 얼굴 품질 점수
+
+        Returns:
+            bool: 캐시 항목이 없거나 만료되었거나 품질이 충분히 좋아졌으면 True
+        """
+        if track_id is None:
+            return False
+
+        with self.lock:
+            entry = self.entries.get(track_id)
+            if entry is None or self._is_expired(entry, time.time()) or self._improved(entry, quality):
+                self.misses += 1
+                return True
+
+            self.entries.move_to_end(track_id)
+            if not entry.reuse_counted:
+                entry.reuse_counted = True
+                self.hits += 1
+            return False
+
+    def put(self, track_id: Optional[int], embedding: np.ndarray, quality: float,
+            user_id: Optional[str] = None, similarity: Optional[float] = None):
+        """
+        새로 추출한 임베딩과 인식 결과를 저장합니다.
+
+        Args:
+            track_id (Optional[int]): 트랙 ID (None이면 저장하지 않음)
+            embedding (np.ndarray): 얼굴 임베딩
+            quality (float): 임베딩을 추출한 얼굴의 품질 점수
+            user_id (Optional[str]): 인식된 사용자 ID
+            similarity (Optional[float]): 인식 유사도
+        """
+        if track_id is None:
+            return
+
+        with self.lock:
+            if track_id in self.entries:
+                self.refreshes += 1
+            self.entries[track_id] = CachedEmbedding(track_id, embedding, quality, user_id, similarity)
+            self.entries.move_to_end(track_id)
+            self._evict(time.time())
+
+    def _evict(self, now: float):
+        """만료된 항목과 최대 개수를 넘는 오래된 항목을 제거합니다."""
+        for track_id in [tid for tid, entry in self.entries.items() if self._is_expired(entry, now)]:
+            del self.entries[track_id]
+            self.evictions += 1
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate_user(self, user_id: str):
+        """특정 사용자로 인식된 항목을 제거합니다 (사용자 삭제 시)."""
+        with self.lock:
+            for track_id in [tid for tid, entry in self.entries.items() if entry.user_id == user_id]:
+                del self.entries[track_id]
+
+    def clear(self):
+        """모든 항목을 제거합니다."""
+        with self.lock:
+            self.entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계를 반환합니다.
+
+        Returns:
+            Dict: 항목 수, 적중률, 절약한 임베딩 수, 갱신/제거 횟수
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "embeddings_avoided": self.hits,
+                "refreshes": self.refreshes,
+                "evictions": self.evictions
+            }
+
+# 전역 인스턴스
+embedding_cache = EmbeddingCache(
+    ttl=config.EMBEDDING_CACHE_TTL,
+    max_entries=config.EMBEDDING_CACHE_SIZE,
+    refresh_margin=config.EMBEDDING_CACHE_REFRESH_MARGIN
+)
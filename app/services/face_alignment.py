@@ -0,0 +1,45 @@
+import cv2
+import numpy as np
+from typing import List, Tuple, Optional
+
+# FaceNet 입력(160x160)에서 MediaPipe 키포인트가 놓일 기준 위치
+# (이미지상 왼쪽 눈, 오른쪽 눈, 코끝, 입 중앙 - MTCNN 크롭의 얼굴 배치에 맞춤)
+FACENET_INPUT_SIZE = 160
+ALIGNMENT_TEMPLATE = np.array([
+    [54.0, 64.0],
+    [106.0, 64.0],
+    [80.0, 92.0],
+    [80.0, 122.0]
+], dtype=np.float32)
+
+def align_face_array(image: np.ndarray, keypoints: Optional[List[Tuple[float, float]]]) -> Optional[np.ndarray]:
+    """
+    MediaPipe 키포인트로 얼굴을 FaceNet 입력(160x160)에 맞게 정렬합니다 (torch 없이 사용 가능).
+
+    Args:
+        image (np.ndarray): 입력 이미지 (BGR)
+        keypoints (Optional[List[Tuple]]): MediaPipe 키포인트 (오른눈, 왼눈, 코끝, 입, ...) - image 기준 좌표
+
+    Returns:
+        Optional[np.ndarray]: 정규화된 얼굴 배열 (3, 160, 160) float32 또는 None
+    """
+    if keypoints is None or len(keypoints) < 4:
+        return None
+
+    # 눈, 코, 입 4점으로 유사 변환(회전+균등 스케일+이동) 추정
+    source_points = np.array(keypoints[:4], dtype=np.float32)
+    if source_points[0, 0] > source_points[1, 0]:
+        # 좌우 반전 프레임에서도 템플릿과 같은 순서(이미지상 왼쪽 눈 먼저)가 되도록 정렬
+        source_points[[0, 1]] = source_points[[1, 0]]
+    matrix, _ = cv2.estimateAffinePartial2D(source_points, ALIGNMENT_TEMPLATE, method=cv2.LMEDS)
+    if matrix is None:
+        return None
+
+    aligned = cv2.warpAffine(
+        image, matrix, (FACENET_INPUT_SIZE, FACENET_INPUT_SIZE),
+        flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE
+    )
+    aligned_rgb = cv2.cvtColor(aligned, cv2.COLOR_BGR2RGB)
+
+    # MTCNN(post_process=True)과 같은 정규화: (x - 127.5) / 128
+    return (aligned_rgb.transpose(2, 0, 1).astype(np.float32) - 127.5) / 128.0
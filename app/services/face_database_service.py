@@ -3,30 +3,134 @@ import numpy as np
 import datetime
 from typing import Optional, List, Tuple, Dict
 import os
+import json
+import threading
+import time
+import uuid
+from ..config import config
+from .lazy_service import LazyService
+from .gallery_index import TemplateGallery, decode_rows
+from . import gallery_snapshot
+
+COLLECTION_NAME = 'face_embeddings'
 
 class FaceDatabaseService:
-    def __init__(self, db_path='./faces'):
+    def __init__(self, db_path='./faces', max_templates: int = 5, shortlist: int = 10,
+                 template_add_similarity: float = 0.8, template_duplicate_similarity: float = 0.95,
+                 template_min_interval: float = 10.0, snapshot_dir: Optional[str] = None,
+                 load_snapshot_on_start: bool = True, search_index: str = "bruteforce",
+                 storage: str = "float32"):
         """
         얼굴 데이터베이스 서비스 초기화
         
         Args:
             db_path (str): ChromaDB 저장 경로
+            max_templates (int): 사용자당 최대 템플릿 수
+            shortlist (int): 중심 검색 후 템플릿으로 재정렬할 후보 사용자 수
+            template_add_similarity (float): 인식 결과를 새 템플릿으로 추가할 최소 유사도
+            template_duplicate_similarity (float): 기존 템플릿과 이보다 비슷하면 추가하지 않음
+            template_min_interval (float): 같은 사용자에게 템플릿을 추가하는 최소 간격 (초)
+            snapshot_dir (Optional[str]): 갤러리 스냅샷 폴더
+            load_snapshot_on_start (bool): 스냅샷이 있으면 ChromaDB 대신 mmap 스냅샷으로 바로 시작
+            search_index (str): 후보 사용자 검색 인덱스 ("bruteforce", "chroma", "ivfpq")
+            storage (str): 메모리 갤러리 임베딩 저장 형식 ("float32", "float16", "int8")
         """
-        # ChromaDB 클라이언트 초기화
-        self.client = chromadb.PersistentClient(db_path)
+        self.db_path = db_path
+        self.snapshot_dir = snapshot_dir
+        self.template_add_similarity = template_add_similarity
+        self.template_duplicate_similarity = template_duplicate_similarity
+        self.template_min_interval = template_min_interval
+        self.last_template_added: Dict[str, float] = {}
         
-        # 얼굴 데이터베이스 컬렉션 생성/가져오기
-        self.collection = self.client.get_or_create_collection(
-            name='face_embeddings',
-            metadata={"hnsw:space": "cosine"}  # 코사인 유사도 사용
-        )
+        # ChromaDB 클라이언트는 처음 접근할 때 생성 (스냅샷으로 시작하면 검색에는 필요 없음)
+        self.client = None
+        self._collection = None
+        self.collection_lock = threading.Lock()
         
-        self.db_path = db_path
-        print(f"얼굴 데이터베이스 초기화 완료: {db_path}")
+        # ChromaDB와 메모리 갤러리를 함께 바꾸는 작업(재구성/추가/삭제/스냅샷/동기화)을 직렬화
+        # (백그라운드 스냅샷 검증의 재구성이 그 사이 추가된 템플릿을 지우지 않도록 함)
+        self.write_lock = threading.RLock()
+        
+        # 검색용 메모리 갤러리 (ChromaDB는 영구 저장소로만 사용)
+        self.gallery = TemplateGallery(max_templates=max_templates, shortlist=shortlist,
+                                       search_index=search_index, storage=storage)
+        self.loaded_snapshot_version = 0
+        
+        if load_snapshot_on_start and self._load_local_snapshot():
+            # 스냅샷 이후 ChromaDB에만 반영된 변경이 있는지 백그라운드에서 확인
+            threading.Thread(target=self._reconcile_with_store, daemon=True).start()
+            source = f"스냅샷 v{self.loaded_snapshot_version}"
+        else:
+            self.rebuild_index()
+            source = "ChromaDB"
+        
+        print(f"얼굴 데이터베이스 초기화 완료: {db_path} ({source}, "
+              f"사용자 {len(self.gallery)}명, 템플릿 {len(self.gallery.templates)}개)")
+    
+    @property
+    def collection(self):
+        """ChromaDB 컬렉션 (항목 하나 = 템플릿 하나, metadata의 user_id로 사용자 구분)"""
+        if self._collection is None:
+            with self.collection_lock:
+                if self._collection is None:
+                    # ChromaDB 클라이언트 초기화
+                    self.client = chromadb.PersistentClient(self.db_path)
+                    
+                    # 얼굴 데이터베이스 컬렉션 생성/가져오기
+                    self._collection = self.client.get_or_create_collection(
+                        name=COLLECTION_NAME,
+                        metadata={"hnsw:space": "cosine"}  # 코사인 유사도 사용
+                    )
+        return self._collection
+    
+    def rebuild_index(self):
+        """ChromaDB의 모든 템플릿으로 메모리 갤러리를 다시 만듭니다."""
+        with self.write_lock:
+            results = self.collection.get(include=["embeddings", "metadatas"])
+            embeddings = results.get("embeddings")
+            if embeddings is None or len(embeddings) == 0:
+                self.gallery.clear()
+                return
+            
+            # 이전 형식(ID == 사용자 ID, 사용자당 1개)도 metadata의 user_id로 그대로 템플릿 처리
+            user_ids = [
+                (metadata or {}).get("user_id", template_id)
+                for template_id, metadata in zip(results["ids"], results["metadatas"])
+            ]
+            self.gallery.load(results["ids"], user_ids, embeddings)
+    
+    def _load_local_snapshot(self) -> bool:
+        """로컬 스냅샷이 있으면 mmap으로 갤러리를 채웁니다."""
+        if not self.snapshot_dir:
+            return False
+        try:
+            snapshot = gallery_snapshot.read_snapshot(self.snapshot_dir, mmap=True)
+        except Exception as e:
+            print(f"스냅샷 불러오기 오류: {e}")
+            return False
+        if snapshot is None:
+            return False
+        
+        self.gallery.load_arrays(snapshot.template_ids, snapshot.user_ids, snapshot.templates,
+                                 snapshot.centroid_ids, snapshot.centroids,
+                                 snapshot.template_scales, snapshot.centroid_scales)
+        self.loaded_snapshot_version = snapshot.version
+        return True
+    
+    def _reconcile_with_store(self):
+        """ChromaDB의 템플릿 ID가 스냅샷과 다르면 ChromaDB 기준으로 갤러리를 다시 만듭니다."""
+        with self.write_lock:
+            try:
+                stored_ids = set(self.collection.get(include=[])["ids"])
+                if stored_ids != set(self.gallery.get_template_ids_all()):
+                    print("스냅샷이 ChromaDB와 달라 갤러리를 다시 만듭니다.")
+                    self.rebuild_index()
+            except Exception as e:
+                print(f"스냅샷 검증 오류: {e}")
     
     def add_face(self, user_id: str, embedding: np.ndarray) -> bool:
         """
-        새로운 얼굴 임베딩을 데이터베이스에 추가합니다.
+        새로운 얼굴 임베딩을 사용자 템플릿으로 추가합니다.
         
         Args:
             user_id (str): 사용자 ID
@@ -35,37 +139,32 @@ class FaceDatabaseService:
         Returns:
             bool: 성공 시 True
         """
-        try:
-            # 현재 시간 추가
-            current_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return self.add_templates(user_id, [embedding])
+    
+    def add_templates(self, user_id: str, embeddings: List[np.ndarray], source: str = "enrollment") -> bool:
+        """
+        얼굴 임베딩들을 사용자 템플릿으로 추가합니다. 최대 개수를 넘으면 가장 중복된 템플릿을 제거합니다.
+        
+        Args:
+            user_id (str): 사용자 ID
+            embeddings (List[np.ndarray]): 템플릿으로 추가할 임베딩 목록
+            source (str): "enrollment" (등록) 또는 "recognition" (고신뢰 인식 결과)
             
-            # 기존 사용자가 있다면 업데이트, 없다면 추가
-            existing_user = self.get_user_embedding(user_id)
+        Returns:
+            bool: 성공 시 True
+        """
+        if not embeddings:
+            return False
+        
+        try:
+            is_new_user = not self.gallery.get_template_ids(user_id)
+            evicted = self.add_templates_bulk([(user_id, embedding) for embedding in embeddings], source=source)
             
-            if existing_user is not None:
-                # 기존 사용자 업데이트
-                self.collection.update(
-                    ids=[user_id],
-                    embeddings=[embedding.tolist()],
-                    metadatas=[{
-                        "user_id": user_id,
-                        "created_at": current_time,
-                        "updated_at": current_time
-                    }]
-                )
-                print(f"사용자 {user_id} 얼굴 정보 업데이트됨")
+            if is_new_user:
+                print(f"새 사용자 {user_id} 얼굴 정보 추가됨 (템플릿 {len(embeddings)}개)")
             else:
-                # 새 사용자 추가
-                self.collection.add(
-                    ids=[user_id],
-                    embeddings=[embedding.tolist()],
-                    metadatas=[{
-                        "user_id": user_id,
-                        "created_at": current_time,
-                        "updated_at": current_time
-                    }]
-                )
-                print(f"새 사용자 {user_id} 얼굴 정보 추가됨")
+                print(f"사용자 {user_id} 템플릿 {len(embeddings)}개 추가됨 "
+                      f"(보유 {len(self.gallery.get_template_ids(user_id))}개, 제거 {evicted}개)")
             
             return True
             
@@ -73,49 +172,118 @@ class FaceDatabaseService:
             print(f"얼굴 추가 오류: {e}")
             return False
     
-    def search_face(self, embedding: np.ndarray, top_k: int = 1) -> Optional[Tuple[str, float]]:
+    def add_templates_bulk(self, entries: List[Tuple[str, np.ndarray]], source: str = "bulk",
+                           chunk_size: int = 1000) -> int:
         """
-        주어진 임베딩과 가장 유사한 얼굴을 검색합니다.
+        여러 사용자의 템플릿을 큰 배치로 한 번에 저장합니다 (대량 등록용, 오류는 호출 측에서 처리).
         
         Args:
-            embedding (np.ndarray): 검색할 얼굴 임베딩
-            top_k (int): 반환할 결과 개수
+            entries (List[Tuple[str, np.ndarray]]): (사용자 ID, 임베딩) 목록
+            source (str): 템플릿 출처 (metadata에 기록)
+            chunk_size (int): ChromaDB add 한 번에 넣을 최대 항목 수
             
         Returns:
-            Optional[Tuple[str, float]]: (사용자_ID, 유사도) 또는 None
+            int: 최대 템플릿 수를 넘어 제거된 템플릿 수
         """
-        try:
-            # 등록된 얼굴이 없으면 None 반환
-            if self.collection.count() == 0:
-                return None
-            
-            # 유사한 얼굴 검색
-            results = self.collection.query(
-                query_embeddings=[embedding.tolist()],
-                n_results=top_k,
-                include=["distances", "metadatas"]
-            )
+        with self.write_lock:
+            if not entries:
+                return 0
             
-            if not results["distances"] or not results["distances"][0]:
-                return None
+            current_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            template_ids = [f"{user_id}#{uuid.uuid4().hex[:12]}" for user_id, _ in entries]
+            
+            for start in range(0, len(entries), chunk_size):
+                chunk = entries[start:start + chunk_size]
+                self.collection.add(
+                    ids=template_ids[start:start + chunk_size],
+                    embeddings=np.stack([np.asarray(embedding, dtype=np.float32).reshape(-1) for _, embedding in chunk]),
+                    metadatas=[{
+                        "user_id": user_id,
+                        "source": source,
+                        "created_at": current_time,
+                        "updated_at": current_time
+                    } for user_id, _ in chunk]
+                )
             
-            # 거리를 유사도로 변환 (코사인 거리 -> 코사인 유사도)
-            distance = results["distances"][0][0]
-            similarity = 1.0 - distance  # 코사인 거리를 유사도로 변환
+            # 영구 저장에 성공한 뒤 메모리 갤러리 갱신, 밀려난 템플릿은 ChromaDB에서도 제거
+            evicted = []
+            for template_id, (user_id, embedding) in zip(template_ids, entries):
+                evicted += self.gallery.add_template(user_id, template_id, embedding)
+            for start in range(0, len(evicted), chunk_size):
+                self.collection.delete(ids=evicted[start:start + chunk_size])
             
-            user_id = results["metadatas"][0][0]["user_id"]
+            return len(evicted)
+    
+    def maybe_add_template(self, user_id: str, embedding: np.ndarray, similarity: float) -> bool:
+        """
+        고신뢰 인식 결과를 사용자 템플릿으로 추가합니다.
+        유사도가 기준 이상이고, 기존 템플릿과 충분히 다르며, 최근에 추가하지 않은 경우에만 추가합니다.
+        
+        Args:
+            user_id (str): 인식된 사용자 ID
+            embedding (np.ndarray): 인식에 사용된 임베딩
+            similarity (float): 인식 유사도
             
-            print(f"얼굴 검색 결과: {user_id} (유사도: {similarity:.3f})")
+        Returns:
+            bool: 템플릿을 추가했으면 True
+        """
+        if similarity < self.template_add_similarity:
+            return False
+        
+        now = time.time()
+        if now - self.last_template_added.get(user_id, 0.0) < self.template_min_interval:
+            return False
+        
+        closest = self.gallery.max_template_similarity(user_id, embedding)
+        if closest is None or closest >= self.template_duplicate_similarity:
+            return False
+        
+        self.last_template_added[user_id] = now
+        return self.add_templates(user_id, [embedding], source="recognition")
+    
+    def search_faces(self, embedding: np.ndarray, top_k: int = 3) -> List[Tuple[str, float]]:
+        """
+        주어진 임베딩과 가장 유사한 사용자 top-k를 검색합니다 (트랙별 신원 투표용).
+        
+        Args:
+            embedding (np.ndarray): 검색할 얼굴 임베딩
+            top_k (int): 반환할 사용자 수
             
-            return user_id, similarity
+        Returns:
+            List[Tuple[str, float]]: [(사용자_ID, 유사도), ...] (유사도 내림차순, 등록된 얼굴이 없으면 빈 목록)
+        """
+        try:
+            # 중심 임베딩으로 후보를 고르고 템플릿 최대 유사도로 재정렬
+            return self.gallery.search(embedding, top_k)
             
         except Exception as e:
             print(f"얼굴 검색 오류: {e}")
+            return []
+    
+    def search_face(self, embedding: np.ndarray, top_k: int = 1) -> Optional[Tuple[str, float]]:
+        """
+        주어진 임베딩과 가장 유사한 얼굴을 검색합니다.
+        
+        Args:
+            embedding (np.ndarray): 검색할 얼굴 임베딩
+            top_k (int): 검색할 후보 개수 (가장 유사한 1명만 반환)
+            
+        Returns:
+            Optional[Tuple[str, float]]: (사용자_ID, 유사도) 또는 None
+        """
+        results = self.search_faces(embedding, top_k)
+        if not results:
             return None
+        
+        user_id, similarity = results[0]
+        
+        print(f"얼굴 검색 결과: {user_id} (유사도: {similarity:.3f})")
+        
+        return user_id, similarity
     
     def get_user_embedding(self, user_id: str) -> Optional[np.ndarray]:
         """
-        특정 사용자의 얼굴 임베딩을 가져옵니다.
+        특정 사용자의 대표(중심) 얼굴 임베딩을 가져옵니다.
         
         Args:
             user_id (str): 사용자 ID
@@ -123,21 +291,7 @@ class FaceDatabaseService:
         Returns:
             Optional[np.ndarray]: 얼굴 임베딩 또는 None
         """
-        try:
-            results = self.collection.get(
-                ids=[user_id],
-                include=["embeddings"]
-            )
-            
-            if not results["embeddings"]:
-                return None
-            
-            embedding = np.array(results["embeddings"][0])
-            return embedding
-            
-        except Exception as e:
-            print(f"사용자 임베딩 조회 오류: {e}")
-            return None
+        return self.gallery.get_centroid(user_id)
     
     def delete_user(self, user_id: str) -> bool:
         """
@@ -149,18 +303,246 @@ class FaceDatabaseService:
         Returns:
             bool: 성공 시 True
         """
-        try:
-            self.collection.delete(ids=[user_id])
-            print(f"사용자 {user_id} 얼굴 정보 삭제됨")
-            return True
+        with self.write_lock:
+            try:
+                self.collection.delete(where={"user_id": user_id})
+                self.gallery.remove_user(user_id)
+                self.last_template_added.pop(user_id, None)
+                print(f"사용자 {user_id} 얼굴 정보 삭제됨")
+                return True
+                
+            except Exception as e:
+                print(f"사용자 삭제 오류: {e}")
+                return False
+    
+    def export_snapshot(self, directory: Optional[str] = None) -> Dict:
+        """
+        현재 갤러리를 새 버전의 스냅샷(템플릿/중심 .npy + manifest)으로 내보냅니다.
+        
+        Args:
+            directory (Optional[str]): 스냅샷 폴더 (기본값: 설정된 스냅샷 폴더)
             
-        except Exception as e:
-            print(f"사용자 삭제 오류: {e}")
-            return False
+        Returns:
+            Dict: 버전과 템플릿/사용자 수
+        """
+        with self.write_lock:
+            directory = directory or self.snapshot_dir
+            if not directory:
+                raise ValueError("스냅샷 폴더가 설정되지 않았습니다.")
+            
+            exported = self.gallery.export_stored()
+            template_ids, user_ids, centroid_ids = exported["template_ids"], exported["user_ids"], exported["centroid_ids"]
+            metadatas, templates, centroids = self._full_precision_arrays(template_ids, user_ids, centroid_ids)
+            
+            # 갤러리가 float16/int8이어도 스냅샷은 ChromaDB의 float32 원본으로 기록
+            # (스냅샷과 delta를 받은 복제 노드의 영구 저장소가 정밀도를 잃지 않도록 함)
+            version = gallery_snapshot.write_snapshot(
+                directory, template_ids, metadatas, templates, centroid_ids, centroids, storage="float32"
+            )
+            print(f"갤러리 스냅샷 v{version} 내보내기 완료: {directory} (템플릿 {len(template_ids)}개)")
+            return {"directory": directory, "version": version, "templates": len(template_ids), "users": len(centroid_ids)}
+    
+    def _full_precision_arrays(self, template_ids: List[str], user_ids: List[str],
+                               centroid_ids: List[str]) -> Tuple[List[Dict], np.ndarray, np.ndarray]:
+        """
+        ChromaDB의 원본 임베딩으로 스냅샷용 float32 템플릿/중심 행렬을 만듭니다 (write_lock 보유 상태에서 호출).
+        
+        Returns:
+            Tuple: (템플릿 metadata 목록, 정규화된 템플릿 행렬, 정규화된 중심 행렬)
+        """
+        dim = self.gallery.templates.dim
+        if not template_ids:
+            return [], np.zeros((0, dim), dtype=np.float32), np.zeros((0, dim), dtype=np.float32)
+        
+        stored = self.collection.get(ids=template_ids, include=["embeddings", "metadatas"])
+        rows = {template_id: row for row, template_id in enumerate(stored["ids"])}
+        templates = np.empty((len(template_ids), dim), dtype=np.float32)
+        missing = []
+        for index, template_id in enumerate(template_ids):
+            row = rows.get(template_id)
+            if row is None:
+                missing.append(index)
+            else:
+                templates[index] = np.asarray(stored["embeddings"][row], dtype=np.float32)
+        if missing:
+            # ChromaDB와 갤러리가 아직 맞춰지지 않은 템플릿만 갤러리 값으로 대신함
+            print(f"⚠️ ChromaDB에 없는 템플릿 {len(missing)}개는 갤러리 값으로 내보냅니다.")
+            templates[missing] = self.gallery.templates.get_embeddings([template_ids[i] for i in missing])
+        templates /= np.maximum(np.linalg.norm(templates, axis=1, keepdims=True), 1e-12)
+        
+        metadatas = [
+            {**((stored["metadatas"][rows[template_id]] if template_id in rows else None) or {}), "user_id": user_id}
+            for template_id, user_id in zip(template_ids, user_ids)
+        ]
+        
+        # 중심 = 사용자 템플릿의 정규화 평균 (TemplateGallery와 같은 방식)
+        user_rows: Dict[str, List[int]] = {}
+        for index, user_id in enumerate(user_ids):
+            user_rows.setdefault(user_id, []).append(index)
+        centroids = np.stack([templates[user_rows[user_id]].mean(axis=0) for user_id in centroid_ids]) \
+            if centroid_ids else np.zeros((0, dim), dtype=np.float32)
+        centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        return metadatas, templates, centroids.astype(np.float32, copy=False)
+    
+    def import_snapshot(self, directory: str, version: Optional[int] = None) -> Dict:
+        """
+        스냅샷으로 갤러리와 ChromaDB를 교체합니다.
+        
+        Args:
+            directory (str): 가져올 스냅샷 폴더
+            version (Optional[int]): 버전 (기본값: 최신)
+            
+        Returns:
+            Dict: 가져온 버전과 템플릿/사용자 수
+        """
+        with self.write_lock:
+            snapshot = gallery_snapshot.read_snapshot(directory, version, mmap=True)
+            if snapshot is None:
+                raise ValueError(f"스냅샷을 찾을 수 없습니다: {directory}")
+            
+            self._replace_store(snapshot.template_ids, snapshot.template_metadatas,
+                                decode_rows(snapshot.templates, snapshot.template_scales))
+            self.gallery.load_arrays(snapshot.template_ids, snapshot.user_ids, snapshot.templates,
+                                     snapshot.centroid_ids, snapshot.centroids,
+                                     snapshot.template_scales, snapshot.centroid_scales)
+            self.last_template_added.clear()
+            
+            # 다음 시작 때 바로 쓸 수 있도록 로컬 스냅샷으로도 저장
+            if self.snapshot_dir and os.path.abspath(directory) != os.path.abspath(self.snapshot_dir):
+                self.export_snapshot()
+            
+            print(f"갤러리 스냅샷 v{snapshot.version} 가져오기 완료 (템플릿 {len(snapshot.template_ids)}개)")
+            return {"directory": directory, "version": snapshot.version,
+                    "templates": len(snapshot.template_ids), "users": len(snapshot.centroid_ids)}
+    
+    def _replace_store(self, template_ids: List[str], metadatas: List[Dict], templates: np.ndarray,
+                       chunk_size: int = 1000):
+        """ChromaDB 내용을 주어진 템플릿으로 교체합니다."""
+        all_ids = self.collection.get(include=[])["ids"]
+        for start in range(0, len(all_ids), chunk_size):
+            self.collection.delete(ids=all_ids[start:start + chunk_size])
+        for start in range(0, len(template_ids), chunk_size):
+            self.collection.add(
+                ids=list(template_ids[start:start + chunk_size]),
+                embeddings=np.asarray(templates[start:start + chunk_size], dtype=np.float32),
+                metadatas=list(metadatas[start:start + chunk_size])
+            )
+    
+    def apply_delta(self, delta: Dict) -> Dict:
+        """
+        마스터 스냅샷의 변경분을 적용합니다 (삭제 먼저, 그다음 추가).
+        
+        Args:
+            delta (Dict): gallery_snapshot.compute_delta 결과
+            
+        Returns:
+            Dict: 적용된 추가/삭제 수
+        """
+        with self.write_lock:
+            added = delta.get("added", [])
+            removed = list(delta.get("removed", []))
+            
+            if delta.get("full"):
+                # 전체 동기화: 마스터에 없는 로컬 템플릿은 모두 제거
+                incoming = {item["id"] for item in added}
+                removed = [template_id for template_id in self.gallery.get_template_ids_all() if template_id not in incoming]
+            
+            if removed:
+                self.collection.delete(ids=removed)
+                for template_id in removed:
+                    self.gallery.remove_template(template_id)
+            
+            if added:
+                ids = [item["id"] for item in added]
+                self.collection.upsert(
+                    ids=ids,
+                    embeddings=[item["embedding"] for item in added],
+                    metadatas=[item["metadata"] for item in added]
+                )
+                evicted = []
+                for item in added:
+                    evicted += self.gallery.add_template(item["metadata"]["user_id"], item["id"],
+                                                         np.asarray(item["embedding"], dtype=np.float32))
+                if evicted:
+                    self.collection.delete(ids=evicted)
+            
+            return {"added": len(added), "removed": len(removed)}
+    
+    def pull_from_master(self, master_url: str) -> Dict:
+        """
+        마스터 노드에서 마지막 동기화 이후의 변경분만 받아 적용하고, 로컬 스냅샷을 갱신합니다.
+        
+        Args:
+            master_url (str): 마스터 서버 주소
+            
+        Returns:
+            Dict: 마스터 버전과 적용된 추가/삭제 수
+        """
+        state = self._read_sync_state()
+        since_version = state.get("master_version", 0) if state.get("master_url") == master_url else 0
+        
+        delta = gallery_snapshot.fetch_delta(master_url, since_version)
+        result = self.apply_delta(delta)
+        
+        self._write_sync_state({"master_url": master_url, "master_version": delta["version"],
+                                "synced_at": time.strftime('%Y-%m-%d %H:%M:%S')})
+        if self.snapshot_dir and (result["added"] or result["removed"]):
+            self.export_snapshot()
+        
+        print(f"마스터 v{delta['version']} 동기화: 추가 {result['added']}개, 삭제 {result['removed']}개")
+        return {"master_version": delta["version"], "since_version": since_version, "full": delta.get("full", False), **result}
+    
+    def _sync_state_path(self) -> Optional[str]:
+        return os.path.join(self.snapshot_dir, "sync_state.json") if self.snapshot_dir else None
+    
+    def _read_sync_state(self) -> Dict:
+        path = self._sync_state_path()
+        if path is None or not os.path.exists(path):
+            return {}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    
+    def _write_sync_state(self, state: Dict):
+        path = self._sync_state_path()
+        if path is None:
+            return
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+    
+    def get_snapshot_info(self) -> Dict:
+        """
+        스냅샷 상태를 반환합니다.
+        
+        Returns:
+            Dict: 스냅샷 폴더, 최신 버전, 시작 시 불러온 버전, 마스터 동기화 상태
+        """
+        return {
+            "directory": self.snapshot_dir,
+            "latest_version": gallery_snapshot.latest_version(self.snapshot_dir) if self.snapshot_dir else 0,
+            "loaded_version": self.loaded_snapshot_version,
+            "sync": self._read_sync_state()
+        }
+    
+    @staticmethod
+    def _summarize_users(metadatas: List[Dict]) -> Dict[str, Dict]:
+        """템플릿 metadata를 사용자별로 묶습니다 (가장 이른 생성 시각, 가장 늦은 갱신 시각)."""
+        users: Dict[str, Dict] = {}
+        for metadata in metadatas:
+            user = users.setdefault(metadata["user_id"], {
+                "user_id": metadata["user_id"],
+                "created_at": metadata.get("created_at", "Unknown"),
+                "updated_at": metadata.get("updated_at", "Unknown"),
+                "templates": 0
+            })
+            user["created_at"] = min(user["created_at"], metadata.get("created_at", "Unknown"))
+            user["updated_at"] = max(user["updated_at"], metadata.get("updated_at", "Unknown"))
+            user["templates"] += 1
+        return users
     
     def get_all_users(self) -> List[Dict]:
         """
-        등록된 모든 사용자 정보를 가져옵니다.
+        등록된 모든 사용자 정보를 가져옵니다 (전체 metadata를 읽으므로 사용자가 많으면 list_users 사용).
         
         Returns:
             List[Dict]: 사용자 정보 리스트
@@ -173,37 +555,82 @@ class FaceDatabaseService:
             if not results["metadatas"]:
                 return []
             
-            users = []
-            for metadata in results["metadatas"]:
-                users.append({
-                    "user_id": metadata["user_id"],
-                    "created_at": metadata.get("created_at", "Unknown"),
-                    "updated_at": metadata.get("updated_at", "Unknown")
-                })
-            
-            return users
+            return list(self._summarize_users(results["metadatas"]).values())
             
         except Exception as e:
             print(f"사용자 목록 조회 오류: {e}")
             return []
     
+    def list_users(self, limit: int = 50, cursor: Optional[str] = None, prefix: str = "") -> Dict:
+        """
+        사용자 목록을 ID 순으로 한 페이지씩 가져옵니다.
+        정렬된 사용자 목록에서 페이지를 고른 뒤 그 사용자들의 metadata만 ChromaDB에서 읽습니다.
+        
+        Args:
+            limit (int): 페이지 크기
+            cursor (Optional[str]): 이전 응답의 next_cursor
+            prefix (str): 사용자 ID 접두사 검색
+            
+        Returns:
+            Dict: users, next_cursor, matched (접두사에 해당하는 사용자 수), total_users
+        """
+        user_ids, next_cursor = self.gallery.users.page(limit, cursor, prefix)
+        
+        summaries: Dict[str, Dict] = {}
+        if user_ids:
+            results = self.collection.get(where={"user_id": {"$in": user_ids}}, include=["metadatas"])
+            summaries = self._summarize_users(results["metadatas"] or [])
+        
+        users = [
+            summaries.get(user_id) or {"user_id": user_id, "created_at": "Unknown", "updated_at": "Unknown",
+                                       "templates": len(self.gallery.get_template_ids(user_id))}
+            for user_id in user_ids
+        ]
+        return {
+            "users": users,
+            "next_cursor": next_cursor,
+            "matched": self.gallery.users.count(prefix),
+            "total_users": len(self.gallery.users)
+        }
+    
+    def get_memory_info(self) -> Dict:
+        """
+        메모리 갤러리의 임베딩 저장 형식과 메모리 사용량을 반환합니다.
+        
+        Returns:
+            Dict: 저장 형식, 템플릿/중심 행렬 크기, float32 대비 비율
+        """
+        info = self.gallery.get_info()
+        templates, centroids = info["template_index"], info["centroid_index"]
+        float32_bytes = templates["float32_bytes"] + centroids["float32_bytes"]
+        return {
+            "storage": info["storage"],
+            "templates": templates["size"],
+            "users": centroids["size"],
+            "bytes_per_vector": templates["bytes_per_vector"],
+            "memory_bytes": info["memory_bytes"],
+            "float32_bytes": float32_bytes,
+            "compression_ratio": round(float32_bytes / info["memory_bytes"], 2) if info["memory_bytes"] else None,
+            "mmap": templates["mmap"]
+        }
+    
     def get_database_info(self) -> Dict:
         """
-        데이터베이스 정보를 반환합니다.
+        데이터베이스 요약 정보를 반환합니다.
+        사용자/템플릿 수는 추가/삭제 시 함께 갱신되는 메모리 갤러리에서 읽으므로 ChromaDB를 조회하지 않습니다.
         
         Returns:
             Dict: 데이터베이스 정보
         """
         try:
-            user_count = self.collection.count()
-            users = self.get_all_users()
-            
             return {
                 "database_path": self.db_path,
-                "collection_name": self.collection.name,
-                "total_users": user_count,
-                "users": users,
-                "similarity_metric": "cosine"
+                "collection_name": COLLECTION_NAME,
+                "total_users": len(self.gallery.users),
+                "total_templates": len(self.gallery.templates),
+                "similarity_metric": "cosine",
+                "snapshot_version": self.loaded_snapshot_version,
+                "gallery": self.gallery.get_info()
             }
             
         except Exception as e:
@@ -220,18 +647,35 @@ class FaceDatabaseService:
         Returns:
             bool: 성공 시 True
         """
-        try:
-            # 모든 데이터 삭제
-            all_ids = self.collection.get()["ids"]
-            if all_ids:
-                self.collection.delete(ids=all_ids)
-            
-            print("얼굴 데이터베이스가 초기화되었습니다.")
-            return True
-            
-        except Exception as e:
-            print(f"데이터베이스 초기화 오류: {e}")
-            return False
+        with self.write_lock:
+            try:
+                # 모든 데이터 삭제
+                all_ids = self.collection.get()["ids"]
+                if all_ids:
+                    self.collection.delete(ids=all_ids)
+                self.gallery.clear()
+                self.last_template_added.clear()
+                
+                print("얼굴 데이터베이스가 초기화되었습니다.")
+                return True
+                
+            except Exception as e:
+                print(f"데이터베이스 초기화 오류: {e}")
+                return False
 
-# 전역 인스턴스
-face_database_service = FaceDatabaseService()
\ No newline at end of file
+# 전역 인스턴스 (첫 사용 또는 시작 시 워밍업 때 생성)
+face_database_service = LazyService(
+    "face_database",
+    lambda: FaceDatabaseService(
+        max_templates=config.FACE_MAX_TEMPLATES,
+        shortlist=config.FACE_SEARCH_SHORTLIST,
+        template_add_similarity=config.FACE_TEMPLATE_ADD_SIMILARITY,
+        template_duplicate_similarity=config.FACE_TEMPLATE_DUPLICATE_SIMILARITY,
+        template_min_interval=config.FACE_TEMPLATE_MIN_INTERVAL,
+        snapshot_dir=config.GALLERY_SNAPSHOT_DIR,
+        load_snapshot_on_start=config.GALLERY_LOAD_SNAPSHOT_ON_START,
+        search_index=config.FACE_SEARCH_INDEX,
+        storage=config.FACE_EMBEDDING_STORAGE
+    ),
+    warmup=lambda service: service.gallery.search(np.zeros(service.gallery.dim, dtype=np.float32))
+)
\ No newline at end of file
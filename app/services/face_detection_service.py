@@ -1,15 +1,32 @@
 import cv2
 import mediapipe as mp
 import numpy as np
-from typing import List, Tuple
+import threading
+from typing import List, Tuple, Optional, Dict
+from ..config import config
+from .face_tracker import FaceTracker, FaceTrack, FaceDetection
+from .lazy_service import LazyService
+
+class CameraTracking:
+    """카메라별 트래커와 키프레임 카운터 (카메라마다 트랙을 따로 유지)"""
+    
+    def __init__(self, detection_interval: int):
+        self.tracker = FaceTracker()
+        self.frames_since_keyframe = detection_interval
 
 class FaceDetectionService:
-    def __init__(self, detection_confidence=0.5):
+    def __init__(self, detection_confidence=0.5, detection_max_side: Optional[int] = None,
+                 tracking_enabled: bool = False, detection_interval: int = 5,
+                 track_min_confidence: float = 0.5):
         """
         얼굴 탐지 서비스 초기화 (항상 활성화)
         
         Args:
             detection_confidence (float): 얼굴 탐지 신뢰도 임계값 (0.0-1.0)
+            detection_max_side (Optional[int]): 탐지 입력의 최대 변 길이 (None/0이면 원본 해상도)
+            tracking_enabled (bool): 키프레임 탐지 + 트래커 전파 모드 사용 여부
+            detection_interval (int): 트래킹 모드에서 키프레임 간격 (프레임 수)
+            track_min_confidence (float): 이보다 낮은 트랙 신뢰도에서는 즉시 재탐지
         """
         # Mediapipe Face Detection 초기화
         self.mp_face_detection = mp.solutions.face_detection
@@ -20,7 +37,59 @@ class FaceDetectionService:
         
         # 그리기용 유틸리티
         self.mp_drawing = mp.solutions.drawing_utils
+        
+        # RGB 변환/축소용 재사용 버퍼 (프레임마다 새로 할당하지 않음)
+        self.rgb_buffer = None
+        self.resize_buffer = None
+        
+        # 축소 해상도 탐지 설정 (근거리 모델은 작은 입력에서도 충분히 동작)
+        self.detection_max_side = None
+        self.set_detection_max_side(detection_max_side)
+        
+        # MediaPipe 그래프와 변환 버퍼는 스레드 안전하지 않으므로 카메라 캡처 스레드 간 탐지를 직렬화
+        self.detection_lock = threading.Lock()
+        
+        # 키프레임 탐지 + 트래커 (트래킹을 끄면 매 프레임 탐지하되 트랙 ID는 유지)
+        self.tracking_enabled = tracking_enabled
+        self.detection_interval = max(1, detection_interval)
+        self.track_min_confidence = track_min_confidence
+        self.cameras: Dict[int, CameraTracking] = {}
+        self.keyframe_count = 0
         print("얼굴 탐지 서비스가 활성화되었습니다.")
+    
+    def set_detection_max_side(self, max_side: Optional[int]):
+        """
+        탐지 입력 해상도를 설정합니다. 바운딩 박스는 항상 원본 해상도 좌표로 반환됩니다.
+        
+        Args:
+            max_side (Optional[int]): 탐지 입력의 최대 변 길이 (None/0이면 원본 해상도)
+        """
+        self.detection_max_side = max_side if max_side and max_side > 0 else None
+    
+    def _prepare_detection_input(self, image: np.ndarray) -> np.ndarray:
+        """
+        탐지용 RGB 입력을 만듭니다. 필요하면 먼저 축소한 뒤 색상 변환합니다.
+        
+        Args:
+            image (np.ndarray): 입력 이미지 (BGR 형식)
+            
+        Returns:
+            np.ndarray: 탐지 입력 (RGB 형식, 재사용 버퍼)
+        """
+        h, w = image.shape[:2]
+        source = image
+        
+        if self.detection_max_side is not None and max(h, w) > self.detection_max_side:
+            scale = self.detection_max_side / float(max(h, w))
+            small_shape = (max(1, int(round(h * scale))), max(1, int(round(w * scale))), image.shape[2])
+            if self.resize_buffer is None or self.resize_buffer.shape != small_shape:
+                self.resize_buffer = np.empty(small_shape, dtype=image.dtype)
+            source = cv2.resize(image, (small_shape[1], small_shape[0]),
+                                dst=self.resize_buffer, interpolation=cv2.INTER_AREA)
+        
+        if self.rgb_buffer is None or self.rgb_buffer.shape != source.shape:
+            self.rgb_buffer = np.empty_like(source)
+        return cv2.cvtColor(source, cv2.COLOR_BGR2RGB, dst=self.rgb_buffer)
         
     def detect_faces(self, image: np.ndarray) -> List[Tuple[int, int, int, int]]:
         """
@@ -32,18 +101,35 @@ class FaceDetectionService:
         Returns:
             List[Tuple[int, int, int, int]]: 바운딩 박스 좌표 리스트 [(x1, y1, x2, y2), ...]
         """
-        # BGR을 RGB로 변환 (Mediapipe는 RGB를 사용)
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        return [detection.bbox for detection in self.detect_faces_detailed(image)]
+    
+    def detect_faces_detailed(self, image: np.ndarray) -> List[FaceDetection]:
+        """
+        이미지에서 얼굴을 탐지하고 바운딩 박스, 신뢰도, 키포인트를 반환합니다.
+        
+        Args:
+            image (np.ndarray): 입력 이미지 (BGR 형식)
+            
+        Returns:
+            List[FaceDetection]: 탐지 결과 리스트 (키포인트: 오른눈, 왼눈, 코끝, 입, 오른귀, 왼귀)
+        """
+        with self.detection_lock:
+            return self._detect_faces_detailed(image)
+    
+    def _detect_faces_detailed(self, image: np.ndarray) -> List[FaceDetection]:
+        """detect_faces_detailed의 본체 (detection_lock 보유 상태에서 호출)."""
+        # BGR을 RGB로 변환 (Mediapipe는 RGB를 사용, 설정 시 축소 해상도로 탐지)
+        image_rgb = self._prepare_detection_input(image)
         
         # 얼굴 탐지 수행
         results = self.face_detection.process(image_rgb)
         
-        bboxes = []
+        detections = []
         if results.detections:
             h, w, _ = image.shape
             
             for detection in results.detections:
-                # 상대 좌표를 절대 좌표로 변환
+                # 상대 좌표를 원본 해상도의 절대 좌표로 변환 (축소 탐지 시에도 동일)
                 bbox = detection.location_data.relative_bounding_box
                 x1 = int(bbox.xmin * w)
                 y1 = int(bbox.ymin * h)
@@ -56,12 +142,104 @@ class FaceDetectionService:
                 x2 = min(w, x2)
                 y2 = min(h, y2)
                 
-                bboxes.append((x1, y1, x2, y2))
+                keypoints = [
+                    (keypoint.x * w, keypoint.y * h)
+                    for keypoint in detection.location_data.relative_keypoints
+                ]
+                score = detection.score[0] if detection.score else 1.0
                 
-        return bboxes
+                detections.append(FaceDetection((x1, y1, x2, y2), float(score), keypoints))
+                
+        return detections
+    
+    def _get_camera_tracking(self, camera_id: int) -> CameraTracking:
+        tracking = self.cameras.get(camera_id)
+        if tracking is None:
+            tracking = self.cameras[camera_id] = CameraTracking(self.detection_interval)
+        return tracking
+    
+    @property
+    def tracker(self) -> FaceTracker:
+        """기본 카메라(0번)의 트래커"""
+        return self._get_camera_tracking(0).tracker
+    
+    def detect_and_track(self, image: np.ndarray, camera_id: int = 0) -> List[FaceTrack]:
+        """
+        키프레임에서만 탐지를 수행하고, 그 사이 프레임은 트래커로 박스를 전파합니다.
+        
+        탐지 주기(detection_interval)마다, 또는 트랙 신뢰도가 임계값 아래로 떨어지면
+        MediaPipe 탐지를 다시 수행합니다. 각 얼굴에는 안정적인 트랙 ID가 부여됩니다.
+        카메라마다 별도의 트래커를 사용하며, 트랙 ID는 모든 카메라에서 겹치지 않습니다.
+        
+        Args:
+            image (np.ndarray): 입력 이미지 (BGR 형식)
+            camera_id (int): 프레임을 보낸 카메라 ID
+            
+        Returns:
+            List[FaceTrack]: 현재 프레임의 얼굴 트랙 리스트
+        """
+        h, w = image.shape[:2]
+        tracking = self._get_camera_tracking(camera_id)
+        tracking.frames_since_keyframe += 1
+        
+        # 등속도 모델로 모든 트랙을 한 프레임 전진
+        tracking.tracker.predict(w, h)
+        
+        is_keyframe = (
+            not self.tracking_enabled or
+            tracking.frames_since_keyframe >= self.detection_interval or
+            tracking.tracker.min_confidence() < self.track_min_confidence
+        )
+        
+        if is_keyframe:
+            tracking.tracker.update(self.detect_faces_detailed(image))
+            tracking.frames_since_keyframe = 0
+            self.keyframe_count += 1
+        
+        return tracking.tracker.tracks
+    
+    def release_camera(self, camera_id: int):
+        """중지된 카메라의 트랙을 정리합니다."""
+        self.cameras.pop(camera_id, None)
+    
+    def set_tracking(self, enabled: bool, detection_interval: Optional[int] = None):
+        """
+        트래킹 모드를 설정합니다.
+        
+        Args:
+            enabled (bool): True면 키프레임 사이를 트래커로 전파
+            detection_interval (Optional[int]): 키프레임 간격 (프레임 수)
+        """
+        self.tracking_enabled = enabled
+        if detection_interval is not None:
+            self.detection_interval = max(1, detection_interval)
+        # 다음 프레임에서 즉시 탐지
+        for tracking in list(self.cameras.values()):
+            tracking.frames_since_keyframe = self.detection_interval
+    
+    def get_tracking_info(self) -> dict:
+        """트래킹 설정과 현재 트랙 상태를 반환합니다."""
+        return {
+            "tracking_enabled": self.tracking_enabled,
+            "detection_interval": self.detection_interval,
+            "track_min_confidence": self.track_min_confidence,
+            "keyframe_count": self.keyframe_count,
+            "active_tracks": [
+                {
+                    "camera_id": camera_id,
+                    "track_id": track.track_id,
+                    "bbox": list(track.int_bbox()),
+                    "confidence": round(track.confidence, 3),
+                    "frames_since_detection": track.frames_since_detection
+                }
+                for camera_id, tracking in list(self.cameras.items())
+                for track in tracking.tracker.tracks
+            ]
+        }
     
     def draw_face_boxes(self, image: np.ndarray, bboxes: List[Tuple[int, int, int, int]], 
-                       color: Tuple[int, int, int] = (0, 0, 255), thickness: int = 2) -> np.ndarray:
+                       color: Tuple[int, int, int] = (0, 0, 255), thickness: int = 2,
+                       inplace: bool = False) -> np.ndarray:
         """
         이미지에 얼굴 바운딩 박스를 그립니다.
         
@@ -70,11 +248,12 @@ class FaceDetectionService:
             bboxes (List[Tuple]): 바운딩 박스 좌표 리스트
             color (Tuple[int, int, int]): 바운딩 박스 색상 (BGR)
             thickness (int): 선 두께
+            inplace (bool): True면 복사 없이 입력 이미지에 직접 그림
             
         Returns:
             np.ndarray: 바운딩 박스가 그려진 이미지
         """
-        annotated_image = image.copy()
+        annotated_image = image if inplace else image.copy()
         
         for bbox in bboxes:
             x1, y1, x2, y2 = bbox
@@ -128,5 +307,18 @@ class FaceDetectionService:
             except Exception as e:
                 print(f"Face detection cleanup error: {e}")
 
-# 전역 인스턴스 (싱글톤 패턴)
-face_detection_service = FaceDetectionService()
\ No newline at end of file
+def _warm_up_detection(service: FaceDetectionService):
+    """빈 프레임으로 MediaPipe 탐지를 한 번 실행해 그래프를 초기화합니다."""
+    service.detect_faces_detailed(np.zeros((480, 640, 3), dtype=np.uint8))
+
+# 전역 인스턴스 (싱글톤 패턴, 첫 사용 또는 시작 시 워밍업 때 생성)
+face_detection_service = LazyService(
+    "face_detection",
+    lambda: FaceDetectionService(
+        detection_max_side=config.FACE_DETECTION_MAX_SIDE,
+        tracking_enabled=config.FACE_TRACKING_ENABLED,
+        detection_interval=config.FACE_DETECTION_INTERVAL,
+        track_min_confidence=config.FACE_TRACK_MIN_CONFIDENCE
+    ),
+    warmup=_warm_up_detection
+)
\ No newline at end of file
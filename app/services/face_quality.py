@@ -0,0 +1,157 @@
+import cv2
+import numpy as np
+from dataclasses import dataclass, asdict
+from typing import List, Tuple, Optional, Dict, Any
+from ..config import config
+
+# 선명도/밝기 계산용 정규화 크기 (얼굴 크기와 무관하게 같은 비용)
+QUALITY_PATCH_SIZE = 64
+
+@dataclass
+class FaceQuality:
+    """얼굴 크롭의 품질 평가 결과 (각 항목 0.0-1.0, 높을수록 좋음)"""
+    score: float
+    sharpness: float
+    size: float
+    pose: float
+    brightness: float
+    yaw: Optional[float] = None  # 눈 사이 거리 대비 코의 좌우 치우침 (0이면 정면)
+    pitch: Optional[float] = None  # 눈-입 거리 대비 코의 상하 치우침 (0이면 정면)
+    passed: bool = True
+    reason: Optional[str] = None  # 통과하지 못한 이유
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: (round(value, 3) if isinstance(value, float) else value)
+                for key, value in asdict(self).items()}
+
+class FaceQualityScorer:
+    """
+    얼굴 크롭 품질 평가기
+
+    라플라시안 분산(선명도), 바운딩 박스 크기, MediaPipe 키포인트 기반 yaw/pitch,
+    평균 밝기를 조합해 점수를 매기고, 기준 미달 크롭이 임베딩 단계로 가지 않도록 거릅니다.
+    """
+
+    def __init__(self, min_score: float = 0.45, min_face_size: int = 40, target_face_size: int = 112,
+                 sharpness_reference: float = 150.0, max_yaw: float = 0.35, max_pitch: float = 0.25):
+        """
+        품질 평가기 초기화
+
+        Args:
+            min_score (float): 통과 기준 종합 점수
+            min_face_size (int): 통과 기준 최소 얼굴 변 길이 (px)
+            target_face_size (int): 크기 점수가 1.0이 되는 얼굴 변 길이 (px)
+            sharpness_reference (float): 선명도 점수가 1.0이 되는 라플라시안 분산
+            max_yaw (float): 포즈 점수가 0이 되는 yaw 비율
+            max_pitch (float): 포즈 점수가 0이 되는 pitch 비율
+        """
+        self.min_score = min_score
+        self.min_face_size = min_face_size
+        self.target_face_size = target_face_size
+        self.sharpness_reference = sharpness_reference
+        self.max_yaw = max_yaw
+        self.max_pitch = max_pitch
+
+        # 통계
+        self.evaluated = 0
+        self.rejected = 0
+        self.last_quality: Optional[FaceQuality] = None
+
+    def estimate_pose(self, keypoints: List[Tuple[float, float]]) -> Tuple[Optional[float], Optional[float]]:
+        """
+        MediaPipe 키포인트(오른눈, 왼눈, 코끝, 입, ...)로 yaw/pitch 비율을 추정합니다.
+
+        Returns:
+            Tuple[Optional[float], Optional[float]]: (yaw, pitch) 또는 키포인트가 부족하면 (None, None)
+        """
+        if len(keypoints) < 4:
+            return None, None
+
+        right_eye, left_eye, nose, mouth = (np.asarray(p, dtype=np.float32) for p in keypoints[:4])
+        eye_center = (right_eye + left_eye) / 2
+        eye_distance = float(np.linalg.norm(left_eye - right_eye))
+        eye_mouth_distance = float(mouth[1] - eye_center[1])
+        if eye_distance < 1e-3 or eye_mouth_distance < 1e-3:
+            return None, None
+
+        # 정면에서는 코가 두 눈의 중앙, 눈-입 사이의 약 45% 높이에 위치
+        yaw = float((nose[0] - eye_center[0]) / eye_distance)
+        pitch = float((nose[1] - eye_center[1]) / eye_mouth_distance - 0.45)
+        return yaw, pitch
+
+    def score(self, frame: np.ndarray, bbox: Tuple[int, int, int, int],
+              keypoints: Optional[List[Tuple[float, float]]] = None) -> FaceQuality:
+        """
+        프레임 안의 얼굴 품질을 평가합니다.
+
+        Args:
+            frame (np.ndarray): 입력 프레임 (BGR)
+            bbox (Tuple): 얼굴 바운딩 박스 (x1, y1, x2, y2)
+            keypoints (Optional[List]): 프레임 기준 MediaPipe 키포인트
+
+        Returns:
+            FaceQuality: 항목별 점수와 통과 여부
+        """
+        h, w = frame.shape[:2]
+        x1, y1, x2, y2 = max(0, int(bbox[0])), max(0, int(bbox[1])), min(w, int(bbox[2])), min(h, int(bbox[3]))
+        face_side = min(x2 - x1, y2 - y1)
+        if face_side <= 1:
+            self.evaluated += 1
+            self.rejected += 1
+            return FaceQuality(0.0, 0.0, 0.0, 0.0, 0.0, passed=False, reason="empty")
+
+        # 고정 크기 그레이 패치에서 선명도/밝기 계산
+        gray = cv2.cvtColor(frame[y1:y2, x1:x2], cv2.COLOR_BGR2GRAY)
+        patch = cv2.resize(gray, (QUALITY_PATCH_SIZE, QUALITY_PATCH_SIZE), interpolation=cv2.INTER_AREA)
+        sharpness = min(1.0, cv2.Laplacian(patch, cv2.CV_32F).var() / self.sharpness_reference)
+        brightness = max(0.0, 1.0 - abs(float(patch.mean()) - 128.0) / 128.0)
+        size = min(1.0, face_side / self.target_face_size)
+
+        yaw, pitch = self.estimate_pose(keypoints or [])
+        if yaw is None:
+            pose = 0.5  # 키포인트가 없으면 중립 값
+        else:
+            pose = max(0.0, 1.0 - abs(yaw) / self.max_yaw) * max(0.0, 1.0 - abs(pitch) / self.max_pitch)
+
+        score = 0.35 * sharpness + 0.25 * size + 0.25 * pose + 0.15 * brightness
+
+        reason = None
+        if face_side < self.min_face_size:
+            reason = "too_small"
+        elif score < self.min_score:
+            reason = "low_score"
+
+        quality = FaceQuality(float(score), float(sharpness), float(size), float(pose), float(brightness),
+                              yaw, pitch, passed=reason is None, reason=reason)
+
+        self.evaluated += 1
+        if not quality.passed:
+            self.rejected += 1
+        self.last_quality = quality
+        return quality
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        품질 평가 설정과 통계를 반환합니다.
+
+        Returns:
+            Dict: 기준값, 평가/탈락 수, 마지막 평가 결과
+        """
+        return {
+            "evaluated": self.evaluated,
+            "rejected": self.rejected,
+            "rejection_rate": round(self.rejected / self.evaluated, 3) if self.evaluated else None,
+            "last_quality": self.last_quality.to_dict() if self.last_quality is not None else None,
+            "min_score": self.min_score,
+            "min_face_size": self.min_face_size,
+            "target_face_size": self.target_face_size,
+            "sharpness_reference": self.sharpness_reference,
+            "max_yaw": self.max_yaw,
+            "max_pitch": self.max_pitch
+        }
+
+# 전역 인스턴스
+face_quality_scorer = FaceQualityScorer(
+    min_score=config.FACE_QUALITY_MIN_SCORE,
+    min_face_size=config.FACE_QUALITY_MIN_SIZE
+)
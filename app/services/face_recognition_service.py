@@ -5,80 +5,235 @@ from PIL import Image
 from facenet_pytorch import MTCNN, InceptionResnetV1
 from typing import Optional, Tuple, List
 import time
+from ..config import config
+from .lazy_service import LazyService
+from .inference_backends import EagerBackend, create_backend, load_fixture_faces, verify_backend_accuracy
+from .face_alignment import FACENET_INPUT_SIZE, align_face_array
 
 class FaceRecognitionService:
-    def __init__(self, similarity_threshold=0.6):
+    def __init__(self, similarity_threshold=0.6, alignment_mode: str = "landmarks", mtcnn_fallback: bool = True,
+                 inference_backend: str = "eager"):
         """
         얼굴 인식 서비스 초기화
         
         Args:
             similarity_threshold (float): 얼굴 유사도 임계값 (0.0-1.0)
+            alignment_mode (str): "landmarks" (MediaPipe 키포인트로 정렬) 또는 "mtcnn" (MTCNN 재탐지)
+            mtcnn_fallback (bool): 키포인트가 없을 때 MTCNN으로 정렬할지 여부
+            inference_backend (str): "eager", "torchscript", "int8", "onnx"
         """
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         
-        # MTCNN for face detection and alignment
-        self.mtcnn = MTCNN(
-            keep_all=True,
-            device=self.device,
-            min_face_size=40,
-            thresholds=[0.6, 0.7, 0.7]
-        )
+        self.alignment_mode = alignment_mode
+        self.mtcnn_fallback = mtcnn_fallback
+        
+        # MTCNN for face detection and alignment (키포인트 정렬만 쓰는 경우 생성하지 않음)
+        self.mtcnn = None
+        if alignment_mode == "mtcnn" or mtcnn_fallback:
+            self.mtcnn = MTCNN(
+                keep_all=True,
+                device=self.device,
+                min_face_size=40,
+                thresholds=[0.6, 0.7, 0.7]
+            )
         
         # InceptionResnetV1 for face recognition
         self.resnet = InceptionResnetV1(
             pretrained='casia-webface'
         ).eval().to(self.device)
         
+        # 추론 백엔드 (기본 eager fp32, 그 외 백엔드는 정확도 검증 통과 시에만 사용)
+        self.reference_backend = EagerBackend(self.resnet, self.device)
+        self.backend = self.reference_backend
+        self.backend_accuracy = None
+        if inference_backend != "eager":
+            self.set_inference_backend(inference_backend)
+        
         self.similarity_threshold = similarity_threshold
-        print(f"얼굴 인식 서비스 초기화 완료 (임계값: {similarity_threshold})")
+        print(f"얼굴 인식 서비스 초기화 완료 (임계값: {similarity_threshold}, 정렬: {alignment_mode})")
     
-    def extract_face_embedding(self, image: np.ndarray, bbox: Tuple[int, int, int, int]) -> Optional[np.ndarray]:
+    def set_inference_backend(self, name: str, fixtures_path: Optional[str] = None,
+                              min_cosine: Optional[float] = None) -> dict:
         """
-        주어진 바운딩 박스에서 얼굴을 크롭하고 임베딩을 추출합니다.
+        추론 백엔드를 변경합니다. fp32 기준 모델과의 코사인 유사도가 기준 미만이면 변경하지 않습니다.
         
         Args:
-            image (np.ndarray): 입력 이미지 (BGR)
-            bbox (Tuple): 바운딩 박스 좌표 (x1, y1, x2, y2)
+            name (str): "eager", "torchscript", "int8", "onnx"
+            fixtures_path (Optional[str]): 정확도 검증용 정렬된 얼굴 이미지 폴더 (기본값: 설정값, 없으면 변경 거부)
+            min_cosine (Optional[float]): 통과 기준 최소 코사인 유사도 (기본값: 설정값)
             
         Returns:
-            Optional[np.ndarray]: 얼굴 임베딩 벡터 (512차원) 또는 None
+            dict: 정확도 검증 결과 (eager는 검증 생략)
         """
+        if name == "eager":
+            self.backend = self.reference_backend
+            self.backend_accuracy = None
+            return {"backend": "eager", "passed": True}
+        
         try:
-            x1, y1, x2, y2 = bbox
-            
-            # 바운딩 박스 유효성 검사
-            if x2 <= x1 or y2 <= y1:
-                return None
-            
-            # 얼굴 영역 크롭
-            face_crop = image[y1:y2, x1:x2]
-            
-            if face_crop.size == 0:
-                return None
+            fixtures = load_fixture_faces(fixtures_path or config.FACE_BACKEND_FIXTURES, config.FACE_BACKEND_MIN_FIXTURES)
+            backend = create_backend(name, self.resnet, self.device)
+            report = verify_backend_accuracy(
+                backend, self.reference_backend, fixtures,
+                min_cosine if min_cosine is not None else config.FACE_BACKEND_MIN_COSINE
+            )
+        except Exception as e:
+            print(f"추론 백엔드 '{name}' 생성 오류: {e}")
+            return {"backend": name, "passed": False, "error": str(e)}
+        
+        if report["passed"]:
+            self.backend = backend
+            self.backend_accuracy = report
+            print(f"추론 백엔드 변경: {name} (최소 코사인 {report['min_cosine']:.4f})")
+        else:
+            print(f"추론 백엔드 '{name}' 정확도 미달 (최소 코사인 {report['min_cosine']:.4f}) - 기존 백엔드 유지")
+        
+        return report
+    
+    def align_face(self, image: np.ndarray, keypoints: List[Tuple[float, float]]) -> Optional[torch.Tensor]:
+        """
+        MediaPipe 키포인트로 얼굴을 FaceNet 입력(160x160)에 맞게 정렬합니다.
+        
+        Args:
+            image (np.ndarray): 입력 이미지 (BGR)
+            keypoints (List[Tuple]): MediaPipe 키포인트 (오른눈, 왼눈, 코끝, 입, ...) - image 기준 좌표
             
-            # BGR을 RGB로 변환
-            face_rgb = cv2.cvtColor(face_crop, cv2.COLOR_BGR2RGB)
-            face_pil = Image.fromarray(face_rgb)
+        Returns:
+            Optional[torch.Tensor]: 정규화된 얼굴 텐서 (3, 160, 160) 또는 None
+        """
+        aligned = align_face_array(image, keypoints)
+        return None if aligned is None else torch.from_numpy(aligned)
+    
+    def _mtcnn_face_tensor(self, image: np.ndarray, bbox: Tuple[int, int, int, int]) -> Optional[torch.Tensor]:
+        """
+        바운딩 박스를 크롭한 뒤 MTCNN으로 다시 탐지하여 정렬된 얼굴 텐서를 만듭니다.
+        
+        Returns:
+            Optional[torch.Tensor]: 정규화된 얼굴 텐서 (3, 160, 160) 또는 None
+        """
+        if self.mtcnn is None:
+            return None
+        
+        x1, y1, x2, y2 = bbox
+        
+        # 바운딩 박스 유효성 검사
+        if x2 <= x1 or y2 <= y1:
+            return None
+        
+        # 얼굴 영역 크롭
+        face_crop = image[y1:y2, x1:x2]
+        
+        if face_crop.size == 0:
+            return None
+        
+        # BGR을 RGB로 변환
+        face_rgb = cv2.cvtColor(face_crop, cv2.COLOR_BGR2RGB)
+        face_pil = Image.fromarray(face_rgb)
+        
+        # MTCNN으로 얼굴 정렬 및 전처리
+        face_tensor = self.mtcnn(face_pil)
+        
+        if face_tensor is None:
+            return None
+        
+        # keep_all=True이면 (N, 3, 160, 160)이 반환되므로 가장 큰 얼굴만 사용
+        if face_tensor.dim() == 4:
+            face_tensor = face_tensor[0]
+        
+        return face_tensor
+    
+    def get_face_tensor(self, image: np.ndarray, bbox: Tuple[int, int, int, int],
+                        keypoints: Optional[List[Tuple[float, float]]] = None) -> Optional[torch.Tensor]:
+        """
+        설정된 정렬 방식으로 FaceNet 입력 텐서를 만듭니다.
+        
+        Args:
+            image (np.ndarray): 입력 이미지 (BGR)
+            bbox (Tuple): 바운딩 박스 좌표 (x1, y1, x2, y2)
+            keypoints (Optional[List]): MediaPipe 키포인트 (image 기준 좌표)
             
-            # MTCNN으로 얼굴 정렬 및 전처리
-            face_tensor = self.mtcnn(face_pil)
+        Returns:
+            Optional[torch.Tensor]: 정규화된 얼굴 텐서 (3, 160, 160) 또는 None
+        """
+        if self.alignment_mode == "landmarks":
+            face_tensor = self.align_face(image, keypoints)
+            if face_tensor is not None or not self.mtcnn_fallback:
+                return face_tensor
+        
+        return self._mtcnn_face_tensor(image, bbox)
+    
+    def extract_face_embedding(self, image: np.ndarray, bbox: Tuple[int, int, int, int],
+                               keypoints: Optional[List[Tuple[float, float]]] = None) -> Optional[np.ndarray]:
+        """
+        주어진 바운딩 박스에서 얼굴을 정렬하고 임베딩을 추출합니다.
+        
+        Args:
+            image (np.ndarray): 입력 이미지 (BGR)
+            bbox (Tuple): 바운딩 박스 좌표 (x1, y1, x2, y2)
+            keypoints (Optional[List]): MediaPipe 키포인트 (있으면 MTCNN 없이 정렬)
             
-            if face_tensor is None:
-                return None
+        Returns:
+            Optional[np.ndarray]: 얼굴 임베딩 벡터 (512차원) 또는 None
+        """
+        return self.extract_face_embeddings_batch(image, [bbox], [keypoints])[0]
+    
+    def extract_face_embeddings_batch(self, image: np.ndarray, bboxes: List[Tuple[int, int, int, int]],
+                                      keypoints_list: Optional[List[Optional[List[Tuple[float, float]]]]] = None
+                                      ) -> List[Optional[np.ndarray]]:
+        """
+        한 프레임의 여러 얼굴 임베딩을 한 번의 InceptionResnetV1 forward로 추출합니다.
+        
+        Args:
+            image (np.ndarray): 입력 이미지 (BGR)
+            bboxes (List[Tuple]): 바운딩 박스 좌표 리스트
+            keypoints_list (Optional[List]): 바운딩 박스별 MediaPipe 키포인트 (없으면 None)
             
-            # GPU/CPU로 이동
-            face_tensor = face_tensor.to(self.device)
+        Returns:
+            List[Optional[np.ndarray]]: 입력 박스 순서와 같은 임베딩 리스트 (정렬 실패한 얼굴은 None)
+        """
+        if keypoints_list is None:
+            keypoints_list = [None] * len(bboxes)
+        
+        face_tensors = []
+        for bbox, keypoints in zip(bboxes, keypoints_list):
+            try:
+                face_tensors.append(self.get_face_tensor(image, bbox, keypoints))
+            except Exception as e:
+                # 한 얼굴의 정렬 실패가 배치 전체를 실패시키지 않도록 함
+                print(f"얼굴 정렬 오류: {e}")
+                face_tensors.append(None)
+        
+        return self.embed_face_tensors(face_tensors)
+    
+    def embed_face_tensors(self, face_tensors: List[Optional[torch.Tensor]]) -> List[Optional[np.ndarray]]:
+        """
+        정렬된 얼굴 텐서들을 쌓아 한 번의 forward로 임베딩을 계산합니다.
+        
+        Args:
+            face_tensors (List[Optional[torch.Tensor]]): (3, 160, 160) 얼굴 텐서 리스트 (None은 건너뜀)
             
-            # 임베딩 추출
-            with torch.no_grad():
-                embedding = self.resnet(face_tensor.unsqueeze(0))
-                embedding = embedding.cpu().numpy().flatten()
+        Returns:
+            List[Optional[np.ndarray]]: 입력 순서와 같은 임베딩 리스트
+        """
+        embeddings: List[Optional[np.ndarray]] = [None] * len(face_tensors)
+        valid_indices = [i for i, tensor in enumerate(face_tensors) if tensor is not None]
+        
+        if not valid_indices:
+            return embeddings
+        
+        try:
+            batch = torch.stack([face_tensors[i] for i in valid_indices])
             
-            return embedding
+            # 임베딩 추출 (선택된 추론 백엔드)
+            outputs = self.backend(batch)
             
+            for row, index in enumerate(valid_indices):
+                embeddings[index] = outputs[row]
+                
         except Exception as e:
             print(f"얼굴 임베딩 추출 오류: {e}")
-            return None
+        
+        return embeddings
     
     def compare_embeddings(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         """
@@ -162,8 +317,27 @@ class FaceRecognitionService:
             "embedding_size": 512,
             "similarity_threshold": self.similarity_threshold,
             "device": str(self.device),
-            "model": "InceptionResnetV1 (casia-webface)"
+            "model": "InceptionResnetV1 (casia-webface)",
+            "alignment_mode": self.alignment_mode,
+            "mtcnn_fallback": self.mtcnn_fallback,
+            "inference_backend": self.backend.get_info(),
+            "backend_accuracy": self.backend_accuracy
         }
 
-# 전역 인스턴스
-face_recognition_service = FaceRecognitionService(similarity_threshold=0.6)
\ No newline at end of file
+def _warm_up_recognition(service: FaceRecognitionService):
+    """더미 입력으로 FaceNet(및 MTCNN) 추론을 한 번 실행해 커널을 준비합니다."""
+    service.embed_face_tensors([torch.zeros(3, FACENET_INPUT_SIZE, FACENET_INPUT_SIZE)])
+    if service.mtcnn is not None:
+        service.mtcnn(Image.fromarray(np.zeros((FACENET_INPUT_SIZE, FACENET_INPUT_SIZE, 3), dtype=np.uint8)))
+
+# 전역 인스턴스 (첫 사용 또는 시작 시 워밍업 때 생성)
+face_recognition_service = LazyService(
+    "face_recognition",
+    lambda: FaceRecognitionService(
+        similarity_threshold=0.6,
+        alignment_mode=config.FACE_ALIGNMENT_MODE,
+        mtcnn_fallback=config.FACE_MTCNN_FALLBACK,
+        inference_backend=config.FACE_INFERENCE_BACKEND
+    ),
+    warmup=_warm_up_recognition
+)
\ No newline at end of file
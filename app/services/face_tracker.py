@@ -0,0 +1,193 @@
+import itertools
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from typing import List, Tuple, Optional
+
+# 모든 트래커가 공유하는 트랙 ID 발급기 (카메라가 여러 대여도 프로세스 안에서 트랙 ID가 겹치지 않음)
+_track_ids = itertools.count(1)
+
+@dataclass
+class FaceDetection:
+    """단일 프레임의 얼굴 탐지 결과"""
+    bbox: Tuple[int, int, int, int]
+    score: float = 1.0
+    keypoints: List[Tuple[float, float]] = field(default_factory=list)  # MediaPipe 6개 키포인트 (절대 좌표)
+
+@dataclass
+class FaceTrack:
+    """프레임 간에 유지되는 얼굴 트랙"""
+    track_id: int
+    bbox: np.ndarray  # (x1, y1, x2, y2) float
+    velocity: np.ndarray  # 프레임당 bbox 변화량
+    score: float
+    keypoints: List[Tuple[float, float]] = field(default_factory=list)
+    confidence: float = 1.0  # 마지막 탐지 이후 예측 횟수에 따라 감소
+    hits: int = 1  # 탐지와 매칭된 횟수
+    frames_since_detection: int = 0
+    last_detected_bbox: Optional[np.ndarray] = None
+    first_seen: float = field(default_factory=time.time)
+    last_seen: float = field(default_factory=time.time)
+
+    def int_bbox(self, width: Optional[int] = None, height: Optional[int] = None) -> Tuple[int, int, int, int]:
+        """정수 좌표 바운딩 박스를 반환합니다 (프레임 크기가 주어지면 클리핑)."""
+        x1, y1, x2, y2 = (int(round(v)) for v in self.bbox)
+        if width is not None and height is not None:
+            x1, y1 = max(0, x1), max(0, y1)
+            x2, y2 = min(width, x2), min(height, y2)
+        return x1, y1, x2, y2
+
+def _iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """두 박스 집합 간 IoU 행렬을 계산합니다."""
+    ix1 = np.maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+    iy1 = np.maximum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+    ix2 = np.minimum(boxes_a[:, None, 2], boxes_b[None, :, 2])
+    iy2 = np.minimum(boxes_a[:, None, 3], boxes_b[None, :, 3])
+    inter = np.clip(ix2 - ix1, 0, None) * np.clip(iy2 - iy1, 0, None)
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-6), 0.0)
+
+class FaceTracker:
+    """IoU 매칭 + 등속도 모델 기반의 경량 얼굴 트래커"""
+
+    def __init__(self, iou_threshold: float = 0.3, max_missed: int = 2,
+                 confidence_decay: float = 0.9, velocity_smoothing: float = 0.5):
+        """
+        트래커 초기화
+
+        Args:
+            iou_threshold (float): 트랙-탐지 매칭 최소 IoU
+            max_missed (int): 탐지와 매칭되지 않아도 트랙을 유지할 최대 키프레임 수
+            confidence_decay (float): 예측 프레임마다 곱해지는 신뢰도 감쇠율
+            velocity_smoothing (float): 속도 갱신 시 새 측정값의 가중치 (0.0-1.0)
+        """
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.confidence_decay = confidence_decay
+        self.velocity_smoothing = velocity_smoothing
+        self.tracks: List[FaceTrack] = []
+        self.missed_counts = {}
+
+    def predict(self, width: Optional[int] = None, height: Optional[int] = None) -> List[FaceTrack]:
+        """
+        탐지 없이 등속도 모델로 트랙 위치를 한 프레임 전진시킵니다.
+
+        Args:
+            width (Optional[int]): 프레임 너비 (화면 밖으로 나간 트랙의 신뢰도 감소용)
+            height (Optional[int]): 프레임 높이
+
+        Returns:
+            List[FaceTrack]: 갱신된 트랙 리스트
+        """
+        for track in self.tracks:
+            track.bbox = track.bbox + track.velocity
+            dx = (track.velocity[0] + track.velocity[2]) / 2
+            dy = (track.velocity[1] + track.velocity[3]) / 2
+            track.keypoints = [(x + dx, y + dy) for x, y in track.keypoints]
+            track.frames_since_detection += 1
+            track.confidence *= self.confidence_decay
+
+            # 예측 박스가 화면 밖으로 벗어나면 재탐지를 유도
+            if width is not None and height is not None:
+                x1, y1, x2, y2 = track.bbox
+                if x2 <= 0 or y2 <= 0 or x1 >= width or y1 >= height:
+                    track.confidence = 0.0
+
+        return self.tracks
+
+    def update(self, detections: List[FaceDetection]) -> List[FaceTrack]:
+        """
+        키프레임의 탐지 결과로 트랙을 갱신합니다 (IoU 탐욕 매칭).
+
+        Args:
+            detections (List[FaceDetection]): 현재 프레임의 탐지 결과
+
+        Returns:
+            List[FaceTrack]: 갱신된 트랙 리스트
+        """
+        now = time.time()
+        matched_tracks, matched_detections = set(), set()
+
+        if self.tracks and detections:
+            track_boxes = np.array([track.bbox for track in self.tracks], dtype=np.float32)
+            det_boxes = np.array([det.bbox for det in detections], dtype=np.float32)
+            ious = _iou_matrix(track_boxes, det_boxes)
+
+            # IoU가 높은 쌍부터 탐욕적으로 매칭
+            for flat_index in np.argsort(-ious, axis=None):
+                t, d = np.unravel_index(flat_index, ious.shape)
+                if ious[t, d] < self.iou_threshold:
+                    break
+                if t in matched_tracks or d in matched_detections:
+                    continue
+                self._apply_detection(self.tracks[t], detections[d], now)
+                matched_tracks.add(t)
+                matched_detections.add(d)
+
+        # 매칭되지 않은 트랙은 일정 횟수 이상 놓치면 제거
+        survivors = []
+        for index, track in enumerate(self.tracks):
+            if index in matched_tracks:
+                self.missed_counts[track.track_id] = 0
+                survivors.append(track)
+                continue
+
+            missed = self.missed_counts.get(track.track_id, 0) + 1
+            if missed <= self.max_missed and track.confidence > 0:
+                self.missed_counts[track.track_id] = missed
+                survivors.append(track)
+            else:
+                self.missed_counts.pop(track.track_id, None)
+
+        # 새 얼굴은 새 트랙 생성
+        for index, detection in enumerate(detections):
+            if index in matched_detections:
+                continue
+            bbox = np.array(detection.bbox, dtype=np.float32)
+            track = FaceTrack(
+                track_id=next(_track_ids),
+                bbox=bbox,
+                velocity=np.zeros(4, dtype=np.float32),
+                score=detection.score,
+                keypoints=list(detection.keypoints),
+                confidence=detection.score,
+                last_detected_bbox=bbox.copy(),
+                first_seen=now,
+                last_seen=now
+            )
+            self.missed_counts[track.track_id] = 0
+            survivors.append(track)
+
+        self.tracks = survivors
+        return self.tracks
+
+    def _apply_detection(self, track: FaceTrack, detection: FaceDetection, now: float):
+        """매칭된 탐지 결과로 트랙 위치, 속도, 신뢰도를 갱신합니다."""
+        measured = np.array(detection.bbox, dtype=np.float32)
+
+        if track.last_detected_bbox is not None and track.frames_since_detection > 0:
+            observed_velocity = (measured - track.last_detected_bbox) / track.frames_since_detection
+            alpha = self.velocity_smoothing
+            track.velocity = alpha * observed_velocity + (1 - alpha) * track.velocity
+
+        track.bbox = measured
+        track.last_detected_bbox = measured.copy()
+        track.keypoints = list(detection.keypoints)
+        track.score = detection.score
+        track.confidence = detection.score
+        track.hits += 1
+        track.frames_since_detection = 0
+        track.last_seen = now
+
+    def min_confidence(self) -> float:
+        """현재 트랙 중 가장 낮은 신뢰도를 반환합니다 (트랙이 없으면 1.0)."""
+        if not self.tracks:
+            return 1.0
+        return min(track.confidence for track in self.tracks)
+
+    def reset(self):
+        """모든 트랙을 삭제합니다 (트랙 ID는 계속 증가)."""
+        self.tracks = []
+        self.missed_counts = {}
@@ -0,0 +1,214 @@
+import asyncio
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Tuple, List, Dict, Any
+
+@dataclass(frozen=True)
+class DetectionSnapshot:
+    """파이프라인이 프레임마다 게시하는 얼굴 탐지 결과"""
+    frame_id: int
+    timestamp: float
+    bboxes: Tuple[Tuple[int, int, int, int], ...] = field(default_factory=tuple)
+    track_ids: Tuple[Optional[int], ...] = field(default_factory=tuple)
+    user_ids: Tuple[Optional[str], ...] = field(default_factory=tuple)
+    width: int = 0
+    height: int = 0
+
+    @property
+    def face_count(self) -> int:
+        return len(self.bboxes)
+
+    def age_ms(self) -> float:
+        """스냅샷이 게시된 후 경과 시간 (밀리초)"""
+        return (time.time() - self.timestamp) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        faces = []
+        for i, bbox in enumerate(self.bboxes):
+            faces.append({
+                "bbox": list(bbox),
+                "track_id": self.track_ids[i] if i < len(self.track_ids) else None,
+                "user_id": self.user_ids[i] if i < len(self.user_ids) else None
+            })
+
+        return {
+            "frame_id": self.frame_id,
+            "timestamp": self.timestamp,
+            "age_ms": round(self.age_ms(), 1),
+            "width": self.width,
+            "height": self.height,
+            "face_count": self.face_count,
+            "bboxes": [list(bbox) for bbox in self.bboxes],
+            "faces": faces
+        }
+
+class StreamSubscriber:
+    """스트림 클라이언트별 최신 프레임 큐 (가득 차면 가장 오래된 프레임을 버림)"""
+
+    def __init__(self, client_id: int, loop: asyncio.AbstractEventLoop, maxsize: int = 2, client: str = "unknown",
+                 channel: str = "frames"):
+        self.client_id = client_id
+        self.client = client
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.delivered_frames = 0
+        self.dropped_frames = 0
+        self.connected_at = time.time()
+        self.channel = channel
+
+    def push(self, item: Optional[Any]):
+        """
+        이벤트 루프 스레드에서 프레임을 큐에 넣습니다. 느린 클라이언트는 지연을 쌓지 않고 프레임을 건너뜁니다.
+
+        Args:
+            item (Optional[Any]): (프레임 ID, 프레임 데이터) 또는 DetectionSnapshot, 종료 신호는 None
+        """
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped_frames += 1
+        self.queue.put_nowait(item)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """클라이언트별 전송/드롭 통계를 반환합니다."""
+        return {
+            "client_id": self.client_id,
+            "client": self.client,
+            "channel": self.channel,
+            "delivered_frames": self.delivered_frames,
+            "dropped_frames": self.dropped_frames,
+            "queued_frames": self.queue.qsize(),
+            "connected_seconds": time.time() - self.connected_at
+        }
+
+class FrameBroadcaster:
+    """캡처 스레드가 인코딩한 최신 프레임을 모든 스트림 구독자에게 공유하는 슬롯"""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.frame_bytes: Optional[bytes] = None
+        self.frame_id = 0
+        self.timestamp = 0.0
+        self.closed = False
+        self.detections: Optional[DetectionSnapshot] = None
+        self.subscribers: Dict[int, StreamSubscriber] = {}
+        self.detection_subscribers: Dict[int, StreamSubscriber] = {}
+        self._client_ids = itertools.count(1)
+
+    def publish(self, frame_bytes: bytes, bboxes: Optional[List[Tuple[int, int, int, int]]] = None,
+                track_ids: Optional[List[Optional[int]]] = None, user_ids: Optional[List[Optional[str]]] = None,
+                frame_size: Tuple[int, int] = (0, 0)) -> int:
+        """
+        새로 인코딩된 프레임과 탐지 결과를 게시하고 대기 중인 구독자들을 깨웁니다.
+
+        Args:
+            frame_bytes (bytes): JPEG 인코딩된 프레임
+            bboxes (Optional[List[Tuple]]): 이 프레임의 얼굴 바운딩 박스 리스트
+            track_ids (Optional[List]): 바운딩 박스별 트랙 ID
+            user_ids (Optional[List]): 바운딩 박스별 인식된 사용자 ID
+            frame_size (Tuple[int, int]): 프레임 (너비, 높이)
+
+        Returns:
+            int: 게시된 프레임 ID
+        """
+        with self.condition:
+            self.frame_id += 1
+            self.frame_bytes = frame_bytes
+            self.timestamp = time.time()
+            self.detections = DetectionSnapshot(
+                frame_id=self.frame_id,
+                timestamp=self.timestamp,
+                bboxes=tuple(tuple(bbox) for bbox in (bboxes or [])),
+                track_ids=tuple(track_ids or ()),
+                user_ids=tuple(user_ids or ()),
+                width=frame_size[0],
+                height=frame_size[1]
+            )
+            self.condition.notify_all()
+            self._dispatch(self.subscribers, (self.frame_id, frame_bytes))
+            self._dispatch(self.detection_subscribers, self.detections)
+            return self.frame_id
+
+    def subscribe(self, loop: asyncio.AbstractEventLoop, maxsize: int = 2, client: str = "unknown",
+                  channel: str = "frames") -> StreamSubscriber:
+        """
+        비동기 스트림 클라이언트를 등록합니다.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): 클라이언트가 실행 중인 이벤트 루프
+            maxsize (int): 클라이언트 큐 크기 (초과 시 오래된 항목 드롭)
+            client (str): 클라이언트 주소 (통계 표시용)
+            channel (str): "frames" (JPEG 프레임) 또는 "detections" (탐지 메타데이터)
+
+        Returns:
+            StreamSubscriber: 등록된 구독자
+        """
+        with self.condition:
+            subscriber = StreamSubscriber(next(self._client_ids), loop, maxsize, client, channel)
+            self._channel(channel)[subscriber.client_id] = subscriber
+            return subscriber
+
+    def unsubscribe(self, subscriber: StreamSubscriber):
+        """스트림 클라이언트 등록을 해제합니다."""
+        with self.condition:
+            self._channel(subscriber.channel).pop(subscriber.client_id, None)
+
+    def _channel(self, channel: str) -> Dict[int, StreamSubscriber]:
+        """채널 이름에 해당하는 구독자 목록을 반환합니다."""
+        return self.detection_subscribers if channel == "detections" else self.subscribers
+
+    def get_subscriber_stats(self) -> List[Dict[str, Any]]:
+        """연결된 모든 스트림 클라이언트의 통계를 반환합니다."""
+        with self.condition:
+            subscribers = list(self.subscribers.values()) + list(self.detection_subscribers.values())
+        return [subscriber.get_stats() for subscriber in subscribers]
+
+    def _dispatch(self, subscribers: Dict[int, StreamSubscriber], item: Optional[Any]):
+        """각 구독자의 이벤트 루프로 항목을 전달합니다 (condition 잠금 상태에서 호출)."""
+        for subscriber in list(subscribers.values()):
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.push, item)
+            except RuntimeError:
+                # 이벤트 루프가 이미 종료된 클라이언트
+                subscribers.pop(subscriber.client_id, None)
+
+    def wait_for_frame(self, last_frame_id: int, timeout: float = 1.0) -> Optional[Tuple[int, bytes]]:
+        """
+        last_frame_id 이후의 새 프레임이 게시될 때까지 대기합니다.
+
+        Args:
+            last_frame_id (int): 구독자가 마지막으로 받은 프레임 ID
+            timeout (float): 최대 대기 시간 (초)
+
+        Returns:
+            Optional[Tuple[int, bytes]]: (프레임 ID, 프레임 데이터) 또는 None (타임아웃/종료)
+        """
+        with self.condition:
+            self.condition.wait_for(
+                lambda: self.closed or (self.frame_bytes is not None and self.frame_id != last_frame_id),
+                timeout=timeout
+            )
+            if self.closed or self.frame_bytes is None or self.frame_id == last_frame_id:
+                return None
+            return self.frame_id, self.frame_bytes
+
+    def get_detection_snapshot(self) -> Optional[DetectionSnapshot]:
+        """가장 최근에 게시된 탐지 결과를 반환합니다 (카메라에 접근하지 않음)."""
+        with self.condition:
+            return self.detections
+
+    def reset(self):
+        """새 스트리밍 세션을 위해 슬롯을 초기화합니다."""
+        with self.condition:
+            self.frame_bytes = None
+            self.detections = None
+            self.closed = False
+
+    def close(self):
+        """슬롯을 닫고 대기 중인 모든 구독자를 해제합니다."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+            self._dispatch(self.subscribers, None)
+            self._dispatch(self.detection_subscribers, None)
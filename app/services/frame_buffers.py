@@ -0,0 +1,49 @@
+import numpy as np
+from typing import Optional, Tuple, List
+
+class FrameBufferRing:
+    """
+    미리 할당한 프레임 버퍼를 순환 재사용하는 링 버퍼
+
+    캡처 루프가 매 프레임 새 배열을 만들지 않도록 고정된 개수의 버퍼를 돌려 씁니다.
+    링 크기만큼의 직전 프레임은 덮어쓰이지 않으므로 다른 단계가 잠시 참조할 수 있습니다.
+    """
+
+    def __init__(self, size: int = 3, dtype=np.uint8):
+        """
+        링 버퍼 초기화
+
+        Args:
+            size (int): 순환할 버퍼 개수
+            dtype: 버퍼 자료형
+        """
+        self.size = size
+        self.dtype = dtype
+        self.buffers: List[np.ndarray] = []
+        self.shape: Optional[Tuple[int, ...]] = None
+        self.index = 0
+
+    def acquire(self, shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        다음 버퍼를 반환합니다. 프레임 크기가 바뀐 경우에만 다시 할당합니다.
+
+        Args:
+            shape (Tuple[int, ...]): 필요한 버퍼 크기 (예: (480, 640, 3))
+
+        Returns:
+            np.ndarray: 재사용 가능한 버퍼
+        """
+        if shape != self.shape:
+            self.buffers = [np.empty(shape, dtype=self.dtype) for _ in range(self.size)]
+            self.shape = shape
+            self.index = 0
+
+        buffer = self.buffers[self.index]
+        self.index = (self.index + 1) % self.size
+        return buffer
+
+    def clear(self):
+        """할당된 버퍼를 해제합니다."""
+        self.buffers = []
+        self.shape = None
+        self.index = 0
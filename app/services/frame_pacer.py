@@ -0,0 +1,110 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Any
+
+class FramePacer:
+    """단조 시계(monotonic clock) 기반 데드라인 방식의 프레임 속도 조절기"""
+
+    def __init__(self, target_fps: float = 30.0, window_size: int = 60,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        프레임 페이서 초기화
+
+        Args:
+            target_fps (float): 목표 FPS
+            window_size (int): 실제 FPS 계산에 사용할 최근 프레임 수
+            clock (Callable): 단조 시계 함수
+            sleep (Callable): 대기 함수
+        """
+        self.clock = clock
+        self.sleep = sleep
+        self.window_size = window_size
+        self.lock = threading.Lock()
+        self.set_target_fps(target_fps)
+
+    def set_target_fps(self, target_fps: float):
+        """
+        목표 FPS를 변경하고 스케줄을 초기화합니다.
+
+        Args:
+            target_fps (float): 목표 FPS (0 이하면 대기 없이 최대 속도로 실행)
+        """
+        with self.lock:
+            self.target_fps = float(target_fps)
+            self.interval = 1.0 / self.target_fps if self.target_fps > 0 else 0.0
+        self.reset()
+
+    def reset(self):
+        """데드라인과 통계를 초기화합니다."""
+        with self.lock:
+            self.next_deadline = None
+            self.frame_times = deque(maxlen=self.window_size)
+            self.frame_count = 0
+            self.skipped_frames = 0
+            self.last_busy_time = 0.0
+
+    def wait(self) -> float:
+        """
+        다음 프레임 데드라인까지 대기합니다.
+
+        처리 시간만큼 대기 시간을 줄이고, 한 프레임 이상 뒤처지면 놓친 슬롯을
+        건너뛰어 지연이 누적되지 않도록 합니다.
+
+        Returns:
+            float: 실제로 대기한 시간 (초)
+        """
+        with self.lock:
+            now = self.clock()
+            self.frame_times.append(now)
+            self.frame_count += 1
+
+            if self.interval <= 0:
+                return 0.0
+
+            if self.next_deadline is None:
+                self.next_deadline = now
+
+            self.last_busy_time = max(0.0, now - self.next_deadline)
+            self.next_deadline += self.interval
+
+            if now > self.next_deadline:
+                # 뒤처진 경우: 놓친 슬롯을 건너뛰고 다음 그리드 시점으로 이동
+                missed = math.floor((now - self.next_deadline) / self.interval) + 1
+                self.skipped_frames += missed
+                self.next_deadline += missed * self.interval
+
+            delay = self.next_deadline - now
+
+        if delay > 0:
+            self.sleep(delay)
+        return delay
+
+    def get_achieved_fps(self) -> float:
+        """최근 프레임들로 계산한 실제 FPS를 반환합니다."""
+        with self.lock:
+            if len(self.frame_times) < 2:
+                return 0.0
+            elapsed = self.frame_times[-1] - self.frame_times[0]
+            if elapsed <= 0:
+                return 0.0
+            return (len(self.frame_times) - 1) / elapsed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        페이싱 통계를 반환합니다.
+
+        Returns:
+            Dict: 목표/실제 FPS 및 건너뛴 프레임 수
+        """
+        achieved_fps = self.get_achieved_fps()
+        with self.lock:
+            return {
+                "target_fps": self.target_fps,
+                "achieved_fps": round(achieved_fps, 2),
+                "frame_count": self.frame_count,
+                "skipped_frames": self.skipped_frames,
+                "last_processing_ms": round(self.last_busy_time * 1000, 2)
+            }
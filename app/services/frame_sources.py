@@ -0,0 +1,458 @@
+import os
+import cv2
+import numpy as np
+from typing import Optional, Tuple, List, Dict, Any
+from .frame_pacer import FramePacer
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+class FrameSource:
+    """
+    프레임 소스 기본 클래스
+
+    cv2.VideoCapture와 같은 인터페이스(isOpened, read, get, set, release)를 제공하여
+    카메라 파이프라인이 웹캠, 동영상, 이미지 폴더, 합성 영상을 구분 없이 사용할 수 있습니다.
+    """
+
+    source_type = "base"
+
+    def __init__(self, width: int = 640, height: int = 480, fps: float = 30.0, realtime: bool = True):
+        """
+        프레임 소스 초기화
+
+        Args:
+            width (int): 출력 프레임 너비
+            height (int): 출력 프레임 높이
+            fps (float): 소스 FPS (실시간 모드에서 프레임 간격)
+            realtime (bool): True면 소스 FPS에 맞춰 프레임 제공, False면 최대 속도로 제공
+        """
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.realtime = realtime
+        self.frame_index = 0
+        self.opened = False
+        self.pacer = FramePacer(target_fps=fps if realtime else 0)
+
+    def open(self) -> bool:
+        """소스를 엽니다."""
+        self.opened = True
+        return True
+
+    def isOpened(self) -> bool:
+        """소스가 열려 있는지 확인합니다."""
+        return self.opened
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        다음 프레임을 읽습니다.
+
+        Args:
+            image (Optional[np.ndarray]): 결과를 기록할 버퍼 (선택)
+
+        Returns:
+            Tuple[bool, Optional[np.ndarray]]: (성공 여부, BGR 프레임)
+        """
+        if not self.opened:
+            return False, None
+
+        if self.realtime:
+            self.pacer.wait()
+
+        frame = self._next_frame(image)
+        if frame is None:
+            return False, None
+
+        self.frame_index += 1
+
+        if image is not None and frame is not image and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame
+
+    def _next_frame(self, image: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        하위 클래스에서 다음 프레임을 생성합니다.
+
+        Args:
+            image (Optional[np.ndarray]): 가능하면 직접 기록할 버퍼 (불필요한 할당 방지)
+        """
+        raise NotImplementedError
+
+    def get(self, prop_id: int) -> float:
+        """cv2.VideoCapture.get 호환 속성 조회"""
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop_id == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.frame_index)
+        return 0.0
+
+    def set(self, prop_id: int, value: float) -> bool:
+        """cv2.VideoCapture.set 호환 속성 설정 (파일/합성 소스는 무시)"""
+        return False
+
+    def release(self):
+        """소스를 해제합니다."""
+        self.opened = False
+
+    def get_info(self) -> Dict[str, Any]:
+        """
+        소스 정보를 반환합니다.
+
+        Returns:
+            Dict: 소스 정보
+        """
+        return {
+            "source_type": self.source_type,
+            "width": self.width,
+            "height": self.height,
+            "fps": self.fps,
+            "realtime": self.realtime,
+            "frame_index": self.frame_index,
+            "is_opened": self.isOpened()
+        }
+
+class CameraFrameSource(FrameSource):
+    """cv2.VideoCapture 기반 웹캠 소스"""
+
+    source_type = "camera"
+
+    def __init__(self, camera_index: int = 0, width: int = 640, height: int = 480, fps: float = 30.0,
+                 buffer_size: Optional[int] = None, fourcc: Optional[str] = None):
+        """
+        웹캠 소스 초기화
+
+        Args:
+            camera_index (int): 카메라 인덱스
+            width (int): 프레임 너비
+            height (int): 프레임 높이
+            fps (float): 카메라 FPS
+            buffer_size (Optional[int]): 드라이버 버퍼 크기 (지연 최소화용)
+            fourcc (Optional[str]): 카메라 코덱 (예: 'MJPG')
+        """
+        # 카메라는 센서가 직접 속도를 맞추므로 별도 페이싱을 하지 않음
+        super().__init__(width, height, fps, realtime=False)
+        self.camera_index = camera_index
+        self.buffer_size = buffer_size
+        self.fourcc = fourcc
+        self.capture = None
+
+    def open(self) -> bool:
+        self.capture = cv2.VideoCapture(self.camera_index)
+        if not self.capture.isOpened():
+            self.capture.release()
+            self.capture = None
+            return False
+
+        # 카메라 설정
+        self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        self.capture.set(cv2.CAP_PROP_FPS, self.fps)
+        if self.buffer_size is not None:
+            self.capture.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
+        if self.fourcc is not None:
+            self.capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
+
+        self.opened = True
+        return True
+
+    def isOpened(self) -> bool:
+        return self.capture is not None and self.capture.isOpened()
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        if self.capture is None:
+            return False, None
+
+        success, frame = self.capture.read(image) if image is not None else self.capture.read()
+        if success:
+            self.frame_index += 1
+        return success, frame
+
+    def get(self, prop_id: int) -> float:
+        if self.capture is None:
+            return 0.0
+        return self.capture.get(prop_id)
+
+    def set(self, prop_id: int, value: float) -> bool:
+        if self.capture is None:
+            return False
+        return self.capture.set(prop_id, value)
+
+    def release(self):
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+        self.opened = False
+
+    def get_info(self) -> Dict[str, Any]:
+        info = super().get_info()
+        info["camera_index"] = self.camera_index
+        return info
+
+class VideoFileFrameSource(FrameSource):
+    """동영상 파일 소스 (끝에 도달하면 처음부터 반복)"""
+
+    source_type = "video"
+
+    def __init__(self, path: str, width: int = 640, height: int = 480, realtime: bool = True, loop: bool = True):
+        """
+        동영상 파일 소스 초기화
+
+        Args:
+            path (str): 동영상 파일 경로
+            width (int): 출력 프레임 너비
+            height (int): 출력 프레임 높이
+            realtime (bool): 파일의 원래 FPS로 재생할지 여부
+            loop (bool): 끝에 도달하면 반복할지 여부
+        """
+        super().__init__(width, height, realtime=realtime)
+        self.path = path
+        self.loop = loop
+        self.capture = None
+
+    def open(self) -> bool:
+        if not os.path.isfile(self.path):
+            print(f"동영상 파일을 찾을 수 없습니다: {self.path}")
+            return False
+
+        self.capture = cv2.VideoCapture(self.path)
+        if not self.capture.isOpened():
+            print(f"동영상 파일을 열 수 없습니다: {self.path}")
+            self.capture.release()
+            self.capture = None
+            return False
+
+        # 파일의 원래 FPS로 실시간 재생
+        file_fps = self.capture.get(cv2.CAP_PROP_FPS)
+        if file_fps and file_fps > 0:
+            self.fps = file_fps
+            self.pacer.set_target_fps(file_fps if self.realtime else 0)
+
+        self.opened = True
+        return True
+
+    def _next_frame(self, image: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        success, frame = self.capture.read(image) if image is not None else self.capture.read()
+        if not success and self.loop:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, frame = self.capture.read(image) if image is not None else self.capture.read()
+        if not success:
+            return None
+
+        if frame.shape[1] != self.width or frame.shape[0] != self.height:
+            frame = cv2.resize(frame, (self.width, self.height))
+        return frame
+
+    def release(self):
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+        self.opened = False
+
+    def get_info(self) -> Dict[str, Any]:
+        info = super().get_info()
+        info["path"] = self.path
+        info["loop"] = self.loop
+        return info
+
+class ImageDirectoryFrameSource(FrameSource):
+    """이미지 폴더 소스 (파일 이름 순서로 반복 재생)"""
+
+    source_type = "images"
+
+    def __init__(self, path: str, width: int = 640, height: int = 480, fps: float = 30.0,
+                 realtime: bool = True, loop: bool = True):
+        """
+        이미지 폴더 소스 초기화
+
+        Args:
+            path (str): 이미지 폴더 경로
+            width (int): 출력 프레임 너비
+            height (int): 출력 프레임 높이
+            fps (float): 재생 FPS
+            realtime (bool): FPS에 맞춰 재생할지 여부
+            loop (bool): 마지막 이미지 후 반복할지 여부
+        """
+        super().__init__(width, height, fps, realtime)
+        self.path = path
+        self.loop = loop
+        self.image_paths: List[str] = []
+        self.cache: Dict[int, np.ndarray] = {}
+        self.position = 0
+
+    def open(self) -> bool:
+        if not os.path.isdir(self.path):
+            print(f"이미지 폴더를 찾을 수 없습니다: {self.path}")
+            return False
+
+        self.image_paths = sorted(
+            os.path.join(self.path, name) for name in os.listdir(self.path)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if not self.image_paths:
+            print(f"이미지 폴더가 비어있습니다: {self.path}")
+            return False
+
+        self.position = 0
+        self.opened = True
+        return True
+
+    def _next_frame(self, image: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        # 읽을 수 없는 파일은 건너뛰되 한 바퀴 이상 돌지 않음
+        for _ in range(len(self.image_paths)):
+            if self.position >= len(self.image_paths):
+                if not self.loop:
+                    return None
+                self.position = 0
+
+            index = self.position
+            self.position += 1
+
+            # 디코딩 비용이 벤치마크에 섞이지 않도록 한 번 읽은 이미지는 캐시
+            frame = self.cache.get(index)
+            if frame is None:
+                frame = cv2.imread(self.image_paths[index])
+                if frame is None:
+                    print(f"이미지를 읽을 수 없습니다: {self.image_paths[index]}")
+                    continue
+                if frame.shape[1] != self.width or frame.shape[0] != self.height:
+                    frame = cv2.resize(frame, (self.width, self.height))
+                self.cache[index] = frame
+
+            # 버퍼가 주어지면 read()에서 복사하므로 캐시를 그대로 넘김
+            return frame if image is not None else frame.copy()
+
+        return None
+
+    def release(self):
+        self.cache.clear()
+        self.opened = False
+
+    def get_info(self) -> Dict[str, Any]:
+        info = super().get_info()
+        info["path"] = self.path
+        info["image_count"] = len(self.image_paths)
+        info["loop"] = self.loop
+        return info
+
+class SyntheticFrameSource(FrameSource):
+    """결정적(deterministic) 합성 영상 소스 (움직이는 얼굴 스프라이트)"""
+
+    source_type = "synthetic"
+
+    def __init__(self, width: int = 640, height: int = 480, fps: float = 30.0, realtime: bool = True,
+                 num_faces: int = 1, seed: int = 0):
+        """
+        합성 영상 소스 초기화
+
+        Args:
+            width (int): 프레임 너비
+            height (int): 프레임 높이
+            fps (float): 재생 FPS
+            realtime (bool): FPS에 맞춰 생성할지 여부
+            num_faces (int): 화면에 움직이는 얼굴 수
+            seed (int): 얼굴 위치/크기/속도 생성용 시드
+        """
+        super().__init__(width, height, fps, realtime)
+        self.num_faces = num_faces
+        self.seed = seed
+
+        rng = np.random.default_rng(seed)
+        self.sprites = []
+        for _ in range(num_faces):
+            size = int(rng.uniform(0.22, 0.35) * min(width, height))
+            self.sprites.append({
+                "size": size,
+                "phase": rng.uniform(0, 2 * np.pi, size=2),
+                "speed": rng.uniform(0.01, 0.04, size=2),
+                "skin": tuple(int(c) for c in rng.integers(90, 200, size=3))
+            })
+
+        # 배경 그라디언트는 한 번만 생성
+        gradient = np.linspace(40, 110, width, dtype=np.uint8)
+        self.background = np.repeat(np.repeat(gradient[None, :, None], height, axis=0), 3, axis=2)
+        self.ground_truth: List[Tuple[int, int, int, int]] = []
+
+    def _sprite_box(self, sprite: Dict[str, Any], index: int) -> Tuple[int, int, int, int]:
+        """프레임 인덱스에서 스프라이트의 바운딩 박스를 계산합니다."""
+        size = sprite["size"]
+        w = int(size * 0.8)
+        cx_range = max(1, self.width - w)
+        cy_range = max(1, self.height - size)
+        cx = int((np.sin(sprite["phase"][0] + sprite["speed"][0] * index) + 1) / 2 * cx_range)
+        cy = int((np.sin(sprite["phase"][1] + sprite["speed"][1] * index) + 1) / 2 * cy_range)
+        return cx, cy, cx + w, cy + size
+
+    def _next_frame(self, image: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        if image is not None and image.shape == self.background.shape:
+            frame = image
+            np.copyto(frame, self.background)
+        else:
+            frame = self.background.copy()
+        self.ground_truth = []
+
+        for sprite in self.sprites:
+            x1, y1, x2, y2 = self._sprite_box(sprite, self.frame_index)
+            w, h = x2 - x1, y2 - y1
+            center = (x1 + w // 2, y1 + h // 2)
+
+            # 얼굴, 눈, 코, 입
+            cv2.ellipse(frame, center, (w // 2, h // 2), 0, 0, 360, sprite["skin"], -1)
+            eye_y = y1 + int(h * 0.4)
+            eye_r = max(2, w // 12)
+            cv2.circle(frame, (x1 + int(w * 0.32), eye_y), eye_r, (40, 30, 30), -1)
+            cv2.circle(frame, (x1 + int(w * 0.68), eye_y), eye_r, (40, 30, 30), -1)
+            cv2.line(frame, (center[0], eye_y + eye_r), (center[0], y1 + int(h * 0.62)), (60, 60, 90), 2)
+            cv2.ellipse(frame, (center[0], y1 + int(h * 0.75)), (w // 5, h // 14), 0, 0, 180, (50, 40, 140), -1)
+
+            self.ground_truth.append((x1, y1, x2, y2))
+
+        return frame
+
+    def get_ground_truth(self) -> List[Tuple[int, int, int, int]]:
+        """마지막으로 생성한 프레임의 얼굴 바운딩 박스를 반환합니다."""
+        return list(self.ground_truth)
+
+    def get_info(self) -> Dict[str, Any]:
+        info = super().get_info()
+        info["num_faces"] = self.num_faces
+        info["seed"] = self.seed
+        return info
+
+def create_frame_source(source_type: str = "camera", path: Optional[str] = None, camera_index: int = 0,
+                        width: int = 640, height: int = 480, fps: float = 30.0, realtime: bool = True,
+                        **kwargs) -> FrameSource:
+    """
+    소스 종류에 맞는 프레임 소스를 생성합니다 (열지는 않음).
+
+    Args:
+        source_type (str): "camera", "video", "images", "synthetic" 중 하나
+        path (Optional[str]): 동영상 파일 또는 이미지 폴더 경로
+        camera_index (int): 카메라 인덱스 (camera 소스)
+        width (int): 프레임 너비
+        height (int): 프레임 높이
+        fps (float): 소스 FPS
+        realtime (bool): 실시간 페이싱 여부 (False면 최대 속도)
+        **kwargs: 소스별 추가 옵션
+
+    Returns:
+        FrameSource: 생성된 프레임 소스
+    """
+    if source_type == "camera":
+        return CameraFrameSource(camera_index, width, height, fps, **kwargs)
+
+    if source_type in ("video", "images") and not path:
+        raise ValueError(f"'{source_type}' 소스에는 경로가 필요합니다.")
+
+    if source_type == "video":
+        return VideoFileFrameSource(path, width, height, realtime, **kwargs)
+    if source_type == "images":
+        return ImageDirectoryFrameSource(path, width, height, fps, realtime, **kwargs)
+    if source_type == "synthetic":
+        return SyntheticFrameSource(width, height, fps, realtime, **kwargs)
+
+    raise ValueError(f"지원하지 않는 프레임 소스입니다: {source_type}")
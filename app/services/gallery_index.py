@@ -0,0 +1,552 @@
+import threading
+import numpy as np
+from typing import List, Tuple, Optional, Dict, Any, Sequence
+from .user_directory import UserDirectory
+
+# 임베딩 저장 형식: 행렬 dtype (int8은 행별 float32 스케일을 함께 저장)
+STORAGE_DTYPES = {
+    "float32": np.float32,
+    "float16": np.float16,
+    "int8": np.int8
+}
+
+# 압축 행렬을 float32로 풀어 곱할 때 한 번에 처리할 행 수 (임시 메모리 상한)
+SCORE_CHUNK_ROWS = 8192
+
+def encode_vectors(vectors: np.ndarray, storage: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    정규화된 float32 행렬을 저장 형식으로 변환합니다.
+
+    Args:
+        vectors (np.ndarray): (N, dim) 정규화된 행렬
+        storage (str): "float32", "float16", "int8"
+
+    Returns:
+        Tuple[np.ndarray, Optional[np.ndarray]]: (저장 행렬, int8이면 행별 스케일)
+    """
+    if storage == "int8":
+        # 행별 최대 절댓값을 127에 맞추는 대칭 양자화
+        scales = np.maximum(np.abs(vectors).max(axis=1), 1e-12).astype(np.float32) / 127.0
+        codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales
+    return vectors.astype(STORAGE_DTYPES[storage], copy=False), None
+
+def decode_rows(matrix: np.ndarray, scales: Optional[np.ndarray]) -> np.ndarray:
+    """저장 행렬을 float32로 되돌립니다."""
+    rows = np.asarray(matrix, dtype=np.float32)
+    return rows * scales[:, None] if scales is not None else rows
+
+class GalleryIndex:
+    """
+    메모리 상주 얼굴 임베딩 인덱스
+
+    L2 정규화된 행렬과 ID 배열을 유지하고, 행렬-벡터 곱 한 번으로 코사인 유사도 top-k를 계산합니다.
+    행렬은 float32, float16 또는 행별 스케일 int8로 저장할 수 있으며, 압축 형식은 블록 단위로 풀어 곱합니다.
+    numpy에는 빠른 float16 변환/연산 경로가 없어 float16 검색은 float32보다 약 10배 느립니다
+    (1만 행 기준 p50 약 8 ms vs 0.8 ms). 메모리를 줄이면서 검색 속도도 유지하려면 int8을 사용합니다.
+    영구 저장은 ChromaDB가 담당하며, 이 인덱스는 추가/삭제/초기화 시 함께 갱신되는 검색용 사본입니다.
+    """
+
+    def __init__(self, dim: int = 512, initial_capacity: int = 256, storage: str = "float32"):
+        """
+        인덱스 초기화
+
+        Args:
+            dim (int): 임베딩 차원
+            initial_capacity (int): 처음 할당할 행 수 (가득 차면 두 배로 늘림)
+            storage (str): 저장 형식 ("float32", "float16", "int8")
+        """
+        if storage not in STORAGE_DTYPES:
+            raise ValueError(f"지원하지 않는 저장 형식입니다: {storage} (가능: {', '.join(STORAGE_DTYPES)})")
+        self.dim = dim
+        self.storage = storage
+        self.matrix = np.zeros((max(1, initial_capacity), dim), dtype=STORAGE_DTYPES[storage])
+        self.scales = np.zeros(len(self.matrix), dtype=np.float32) if storage == "int8" else None
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _ensure_capacity(self, size: int):
+        writeable = self.matrix.flags.writeable and (self.scales is None or self.scales.flags.writeable)
+        if size <= len(self.matrix) and writeable:
+            return
+        # 읽기 전용(mmap 스냅샷) 행렬은 처음 수정할 때 메모리로 복사
+        capacity = max(1, len(self.matrix))
+        while capacity < size:
+            capacity *= 2
+        grown = np.zeros((capacity, self.dim), dtype=self.matrix.dtype)
+        grown[:len(self.ids)] = self.matrix[:len(self.ids)]
+        self.matrix = grown
+        if self.scales is not None:
+            grown_scales = np.zeros(capacity, dtype=np.float32)
+            grown_scales[:len(self.ids)] = self.scales[:len(self.ids)]
+            self.scales = grown_scales
+
+    def _store(self, start: int, vectors: np.ndarray):
+        """정규화된 float32 행들을 start 행부터 저장 형식으로 기록합니다 (lock 보유 상태에서 호출)."""
+        codes, scales = encode_vectors(vectors, self.storage)
+        self.matrix[start:start + len(vectors)] = codes
+        if scales is not None:
+            self.scales[start:start + len(vectors)] = scales
+
+    def _decode(self, start: int, end: int) -> np.ndarray:
+        return decode_rows(self.matrix[start:end], self.scales[start:end] if self.scales is not None else None)
+
+    def _scores(self, query: np.ndarray, size: int) -> np.ndarray:
+        """모든 행과 질의의 내적을 계산합니다 (lock 보유 상태에서 호출)."""
+        if self.storage == "float32":
+            return self.matrix[:size] @ query
+        scores = np.empty(size, dtype=np.float32)
+        # 블록마다 float32로 풀어 BLAS로 곱함 (int8 변환은 빠르지만 float16 변환은 numpy에서 느려 전체 지연을 좌우함)
+        for start in range(0, size, SCORE_CHUNK_ROWS):
+            end = min(size, start + SCORE_CHUNK_ROWS)
+            scores[start:end] = np.asarray(self.matrix[start:end], dtype=np.float32) @ query
+        if self.scales is not None:
+            scores *= self.scales[:size]
+        # 양자화 오차로 1.0을 살짝 넘는 값 보정
+        return np.clip(scores, -1.0, 1.0, out=scores)
+
+    def load(self, ids: Sequence[str], embeddings: Sequence[np.ndarray]):
+        """
+        인덱스를 주어진 ID/임베딩으로 다시 채웁니다 (시작 시 ChromaDB에서 불러올 때 사용).
+
+        Args:
+            ids (Sequence[str]): 사용자 ID 목록
+            embeddings (Sequence[np.ndarray]): 같은 순서의 임베딩 목록
+        """
+        with self.lock:
+            self.ids = []
+            self.rows = {}
+            self._ensure_capacity(len(ids))
+            if len(ids):
+                vectors = np.asarray(embeddings, dtype=np.float32).reshape(len(ids), self.dim)
+                norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+                self._store(0, vectors / np.maximum(norms, 1e-12))
+            for row, user_id in enumerate(ids):
+                self.ids.append(user_id)
+                self.rows[user_id] = row
+
+    def adopt(self, ids: Sequence[str], matrix: np.ndarray, scales: Optional[np.ndarray] = None):
+        """
+        이미 정규화된 행렬을 복사 없이 그대로 사용합니다 (mmap 스냅샷에서 시작할 때 사용).
+        읽기 전용 행렬은 처음 수정될 때 메모리로 복사되고, 저장 형식이 다르면 변환해 불러옵니다.
+
+        Args:
+            ids (Sequence[str]): 행 순서의 ID 목록
+            matrix (np.ndarray): (len(ids), dim) 정규화된 행렬
+            scales (Optional[np.ndarray]): int8 행렬의 행별 스케일
+        """
+        with self.lock:
+            if matrix.dtype != STORAGE_DTYPES[self.storage] or (self.storage == "int8" and scales is None):
+                self.load(ids, decode_rows(matrix, scales))
+                return
+            self.matrix = matrix
+            self.scales = scales if self.storage == "int8" else None
+            self.ids = list(ids)
+            self.rows = {item_id: row for row, item_id in enumerate(self.ids)}
+
+    def export(self) -> Tuple[List[str], np.ndarray]:
+        """ID 목록과 float32 행렬 사본을 반환합니다."""
+        with self.lock:
+            return list(self.ids), self._decode(0, len(self.ids))
+
+    def export_stored(self) -> Tuple[List[str], np.ndarray, Optional[np.ndarray]]:
+        """ID 목록과 저장 형식 그대로의 행렬/스케일 사본을 반환합니다 (스냅샷 기록용)."""
+        with self.lock:
+            size = len(self.ids)
+            scales = self.scales[:size].copy() if self.scales is not None else None
+            return list(self.ids), np.array(self.matrix[:size]), scales
+
+    def upsert(self, user_id: str, embedding: np.ndarray):
+        """임베딩을 추가하거나, 이미 있는 ID면 교체합니다."""
+        vector = self._normalize(embedding)
+        with self.lock:
+            row = self.rows.get(user_id)
+            if row is None:
+                row = len(self.ids)
+                self._ensure_capacity(row + 1)
+                self.ids.append(user_id)
+                self.rows[user_id] = row
+            else:
+                self._ensure_capacity(len(self.ids))
+            self._store(row, vector.reshape(1, -1))
+
+    def remove(self, user_id: str) -> bool:
+        """ID를 제거합니다 (마지막 행을 빈자리로 옮겨 행렬을 연속으로 유지)."""
+        with self.lock:
+            row = self.rows.pop(user_id, None)
+            if row is None:
+                return False
+
+            last = len(self.ids) - 1
+            if row != last:
+                self._ensure_capacity(len(self.ids))
+                moved_id = self.ids[last]
+                self.matrix[row] = self.matrix[last]
+                if self.scales is not None:
+                    self.scales[row] = self.scales[last]
+                self.ids[row] = moved_id
+                self.rows[moved_id] = row
+            self.ids.pop()
+            return True
+
+    def clear(self):
+        """모든 항목을 제거합니다."""
+        with self.lock:
+            self.ids = []
+            self.rows = {}
+
+    def search(self, embedding: np.ndarray, top_k: int = 1) -> List[Tuple[str, float]]:
+        """
+        코사인 유사도가 높은 순으로 top-k를 반환합니다.
+
+        Args:
+            embedding (np.ndarray): 검색할 임베딩
+            top_k (int): 반환할 결과 수
+
+        Returns:
+            List[Tuple[str, float]]: [(사용자_ID, 유사도), ...] (유사도 내림차순)
+        """
+        query = self._normalize(embedding)
+        with self.lock:
+            size = len(self.ids)
+            if size == 0:
+                return []
+
+            scores = self._scores(query, size)
+            k = min(top_k, size)
+            if k < size:
+                candidates = np.argpartition(-scores, k - 1)[:k]
+            else:
+                candidates = np.arange(size)
+            order = candidates[np.argsort(-scores[candidates])]
+            return [(self.ids[i], float(scores[i])) for i in order]
+
+    def get_embedding(self, user_id: str) -> Optional[np.ndarray]:
+        """정규화된 임베딩(float32) 사본을 반환합니다."""
+        with self.lock:
+            row = self.rows.get(user_id)
+            return None if row is None else self._decode(row, row + 1)[0]
+
+    def get_embeddings(self, item_ids: Sequence[str]) -> np.ndarray:
+        """여러 ID의 정규화된 임베딩을 (N, dim) float32 행렬로 반환합니다 (없는 ID는 제외)."""
+        with self.lock:
+            rows = [self.rows[item_id] for item_id in item_ids if item_id in self.rows]
+            if not rows:
+                return np.zeros((0, self.dim), dtype=np.float32)
+            scales = self.scales[rows] if self.scales is not None else None
+            return decode_rows(self.matrix[rows], scales)
+
+    def memory_bytes(self) -> int:
+        """할당된 행렬(와 스케일)의 크기"""
+        return int(self.matrix.nbytes + (self.scales.nbytes if self.scales is not None else 0))
+
+    def get_info(self) -> Dict[str, Any]:
+        """
+        인덱스 정보를 반환합니다.
+
+        Returns:
+            Dict: 항목 수, 할당된 행 수, 저장 형식, 메모리 사용량
+        """
+        with self.lock:
+            size = len(self.ids)
+            return {
+                "size": size,
+                "capacity": len(self.matrix),
+                "dim": self.dim,
+                "storage": self.storage,
+                "dtype": str(self.matrix.dtype),
+                "memory_bytes": self.memory_bytes(),
+                "bytes_per_vector": int(self.matrix.itemsize * self.dim + (4 if self.scales is not None else 0)),
+                "float32_bytes": int(len(self.matrix) * self.dim * 4),
+                "mmap": isinstance(self.matrix, np.memmap)
+            }
+
+class TemplateGallery:
+    """
+    사용자별 다중 템플릿 갤러리
+
+    사용자마다 최대 K개의 템플릿 임베딩과 그 중심(centroid)을 유지합니다.
+    검색은 중심 인덱스에서 후보 사용자를 먼저 고른 뒤, 후보들의 템플릿 최대 유사도로 다시 순위를 매깁니다.
+    """
+
+    def __init__(self, dim: int = 512, max_templates: int = 5, shortlist: int = 10,
+                 search_index: str = "bruteforce", index_options: Optional[Dict[str, Any]] = None,
+                 storage: str = "float32"):
+        """
+        갤러리 초기화
+
+        Args:
+            dim (int): 임베딩 차원
+            max_templates (int): 사용자당 최대 템플릿 수
+            shortlist (int): 중심 검색 후 템플릿으로 재정렬할 후보 사용자 수
+            search_index (str): 후보 사용자를 고를 중심 검색 인덱스 ("bruteforce", "chroma", "ivfpq")
+            index_options (Optional[Dict]): 검색 인덱스 설정 (예: {"nprobe": 16})
+            storage (str): 템플릿/중심 저장 형식 ("float32", "float16", "int8")
+        """
+        self.dim = dim
+        self.max_templates = max(1, max_templates)
+        self.shortlist = max(1, shortlist)
+        self.storage = storage
+        self.centroids = GalleryIndex(dim, storage=storage)  # 사용자 ID -> 중심 임베딩
+        self.templates = GalleryIndex(dim, storage=storage)  # 템플릿 ID -> 템플릿 임베딩
+        self.user_templates: Dict[str, List[str]] = {}  # 사용자 ID -> 템플릿 ID (오래된 순)
+        self.template_users: Dict[str, str] = {}
+        self.users = UserDirectory()  # 정렬된 사용자 ID (페이지 조회/접두사 검색용)
+        self.lock = threading.RLock()
+
+        # 전수 검색이 아니면 중심 행렬은 그대로 두고 별도 근사 인덱스로 후보를 고름 (재정렬은 정확한 템플릿으로)
+        self.search_index = search_index
+        self.centroid_search = None
+        if search_index != "bruteforce":
+            from .vector_index import create_index
+            self.centroid_search = create_index(search_index, dim, **(index_options or {}))
+
+    def __len__(self) -> int:
+        return len(self.user_templates)
+
+    def load(self, template_ids: Sequence[str], user_ids: Sequence[str], embeddings: Sequence[np.ndarray]):
+        """
+        템플릿 목록으로 갤러리를 다시 만듭니다 (ChromaDB에서 불러올 때 사용).
+
+        Args:
+            template_ids (Sequence[str]): 템플릿 ID 목록
+            user_ids (Sequence[str]): 각 템플릿의 사용자 ID
+            embeddings (Sequence[np.ndarray]): 각 템플릿의 임베딩
+        """
+        with self.lock:
+            self.templates.load(template_ids, embeddings)
+            self.user_templates = {}
+            self.template_users = {}
+            for template_id, user_id in zip(template_ids, user_ids):
+                self.user_templates.setdefault(user_id, []).append(template_id)
+                self.template_users[template_id] = user_id
+
+            self.centroids.clear()
+            for user_id in self.user_templates:
+                self._update_centroid(user_id, mirror=False)
+            self.users.rebuild(self.user_templates)
+            self._rebuild_search()
+
+    def load_arrays(self, template_ids: Sequence[str], user_ids: Sequence[str], templates: np.ndarray,
+                    centroid_ids: Sequence[str], centroids: np.ndarray,
+                    template_scales: Optional[np.ndarray] = None, centroid_scales: Optional[np.ndarray] = None):
+        """
+        스냅샷의 템플릿/중심 행렬을 복사 없이 사용해 갤러리를 만듭니다 (중심 재계산 없음).
+        스냅샷의 저장 형식이 갤러리와 다르면 변환해 불러옵니다.
+
+        Args:
+            template_ids (Sequence[str]): 템플릿 ID 목록
+            user_ids (Sequence[str]): 각 템플릿의 사용자 ID
+            templates (np.ndarray): 정규화된 템플릿 행렬 (mmap 가능)
+            centroid_ids (Sequence[str]): 중심 행렬의 사용자 ID 목록
+            centroids (np.ndarray): 정규화된 중심 행렬 (mmap 가능)
+            template_scales (Optional[np.ndarray]): int8 템플릿 행렬의 행별 스케일
+            centroid_scales (Optional[np.ndarray]): int8 중심 행렬의 행별 스케일
+        """
+        with self.lock:
+            self.templates.adopt(template_ids, templates, template_scales)
+            self.centroids.adopt(centroid_ids, centroids, centroid_scales)
+            self.user_templates = {}
+            self.template_users = {}
+            for template_id, user_id in zip(template_ids, user_ids):
+                self.user_templates.setdefault(user_id, []).append(template_id)
+                self.template_users[template_id] = user_id
+            self.users.rebuild(self.user_templates)
+            self._rebuild_search()
+
+    def _rebuild_search(self):
+        """중심 행렬로 근사 검색 인덱스를 다시 만듭니다 (lock 보유 상태에서 호출)."""
+        if self.centroid_search is not None:
+            self.centroid_search.build(*self.centroids.export())
+
+    def export_stored(self) -> Dict[str, Any]:
+        """
+        저장 형식 그대로의 스냅샷 기록용 사본을 반환합니다 (float16/int8 갤러리도 mmap으로 바로 쓸 수 있도록).
+
+        Returns:
+            Dict: template_ids, user_ids, templates, template_scales, centroid_ids, centroids, centroid_scales, storage
+        """
+        with self.lock:
+            template_ids, templates, template_scales = self.templates.export_stored()
+            centroid_ids, centroids, centroid_scales = self.centroids.export_stored()
+            return {
+                "template_ids": template_ids,
+                "user_ids": [self.template_users[template_id] for template_id in template_ids],
+                "templates": templates,
+                "template_scales": template_scales,
+                "centroid_ids": centroid_ids,
+                "centroids": centroids,
+                "centroid_scales": centroid_scales,
+                "storage": self.storage
+            }
+
+    def remove_template(self, template_id: str) -> bool:
+        """템플릿 하나를 제거하고 중심을 갱신합니다 (delta 적용 시 사용)."""
+        with self.lock:
+            user_id = self.template_users.pop(template_id, None)
+            if user_id is None:
+                return False
+            self.templates.remove(template_id)
+            template_ids = self.user_templates.get(user_id, [])
+            if template_id in template_ids:
+                template_ids.remove(template_id)
+            if not template_ids:
+                self.user_templates.pop(user_id, None)
+            self._update_centroid(user_id)
+            return True
+
+    def get_template_ids_all(self) -> List[str]:
+        """모든 템플릿 ID를 반환합니다."""
+        with self.lock:
+            return list(self.templates.ids)
+
+    def _update_centroid(self, user_id: str, mirror: bool = True):
+        """
+        사용자 템플릿의 정규화 평균으로 중심을 갱신합니다 (lock 보유 상태에서 호출).
+        mirror=False면 검색 인덱스와 사용자 목록은 호출 측에서 한 번에 다시 만듭니다.
+        """
+        template_ids = self.user_templates.get(user_id)
+        if not template_ids:
+            self.centroids.remove(user_id)
+            if mirror:
+                self.users.remove(user_id)
+                if self.centroid_search is not None:
+                    self.centroid_search.remove(user_id)
+            return
+        vectors = self.templates.get_embeddings(template_ids)
+        self.centroids.upsert(user_id, vectors.mean(axis=0))
+        if mirror:
+            self.users.add(user_id)
+            if self.centroid_search is not None:
+                self.centroid_search.upsert(user_id, self.centroids.get_embedding(user_id))
+
+    def add_template(self, user_id: str, template_id: str, embedding: np.ndarray) -> List[str]:
+        """
+        템플릿을 추가합니다. K개를 넘으면 가장 중복된 템플릿을 제거합니다 (첫 등록 템플릿은 유지).
+
+        Args:
+            user_id (str): 사용자 ID
+            template_id (str): 새 템플릿 ID
+            embedding (np.ndarray): 템플릿 임베딩
+
+        Returns:
+            List[str]: 제거된 템플릿 ID 목록
+        """
+        with self.lock:
+            self.templates.upsert(template_id, embedding)
+            template_ids = self.user_templates.setdefault(user_id, [])
+            if template_id not in template_ids:
+                template_ids.append(template_id)
+            self.template_users[template_id] = user_id
+
+            evicted = []
+            while len(template_ids) > self.max_templates:
+                victim = self._most_redundant(template_ids)
+                template_ids.remove(victim)
+                self.template_users.pop(victim, None)
+                self.templates.remove(victim)
+                evicted.append(victim)
+
+            self._update_centroid(user_id)
+            return evicted
+
+    def _most_redundant(self, template_ids: List[str]) -> str:
+        """다른 템플릿과 평균 유사도가 가장 높은 템플릿을 고릅니다 (첫 템플릿 제외)."""
+        vectors = self.templates.get_embeddings(template_ids)
+        similarity = vectors @ vectors.T
+        np.fill_diagonal(similarity, 0.0)
+        redundancy = similarity.sum(axis=1) / max(1, len(template_ids) - 1)
+        redundancy[0] = -np.inf
+        return template_ids[int(np.argmax(redundancy))]
+
+    def remove_user(self, user_id: str) -> List[str]:
+        """사용자와 모든 템플릿을 제거하고, 제거된 템플릿 ID를 반환합니다."""
+        with self.lock:
+            template_ids = self.user_templates.pop(user_id, [])
+            for template_id in template_ids:
+                self.template_users.pop(template_id, None)
+                self.templates.remove(template_id)
+            self.centroids.remove(user_id)
+            self.users.remove(user_id)
+            if self.centroid_search is not None:
+                self.centroid_search.remove(user_id)
+            return template_ids
+
+    def clear(self):
+        """모든 사용자와 템플릿을 제거합니다."""
+        with self.lock:
+            self.centroids.clear()
+            self.templates.clear()
+            if self.centroid_search is not None:
+                self.centroid_search.clear()
+            self.users.clear()
+            self.user_templates = {}
+            self.template_users = {}
+
+    def max_template_similarity(self, user_id: str, embedding: np.ndarray) -> Optional[float]:
+        """사용자 템플릿 중 가장 높은 유사도를 반환합니다."""
+        with self.lock:
+            template_ids = self.user_templates.get(user_id)
+            if not template_ids:
+                return None
+            query = GalleryIndex._normalize(embedding)
+            vectors = self.templates.get_embeddings(template_ids)
+            return min(1.0, float(np.max(vectors @ query)))
+
+    def search(self, embedding: np.ndarray, top_k: int = 1) -> List[Tuple[str, float]]:
+        """
+        중심 인덱스로 후보를 고른 뒤 템플릿 최대 유사도로 재정렬합니다.
+
+        Args:
+            embedding (np.ndarray): 검색할 임베딩
+            top_k (int): 반환할 사용자 수
+
+        Returns:
+            List[Tuple[str, float]]: [(사용자_ID, 템플릿 최대 유사도), ...] (내림차순)
+        """
+        with self.lock:
+            index = self.centroid_search if self.centroid_search is not None else self.centroids
+            candidates = index.search(embedding, max(top_k, self.shortlist))
+            reranked = [(user_id, self.max_template_similarity(user_id, embedding)) for user_id, _ in candidates]
+            reranked.sort(key=lambda item: item[1], reverse=True)
+            return reranked[:top_k]
+
+    def get_centroid(self, user_id: str) -> Optional[np.ndarray]:
+        """사용자 중심 임베딩을 반환합니다."""
+        return self.centroids.get_embedding(user_id)
+
+    def get_template_ids(self, user_id: str) -> List[str]:
+        """사용자의 템플릿 ID 목록을 반환합니다."""
+        with self.lock:
+            return list(self.user_templates.get(user_id, []))
+
+    def get_info(self) -> Dict[str, Any]:
+        """
+        갤러리 정보를 반환합니다.
+
+        Returns:
+            Dict: 사용자/템플릿 수와 인덱스 메모리 사용량
+        """
+        with self.lock:
+            return {
+                "users": len(self.user_templates),
+                "templates": len(self.templates),
+                "max_templates": self.max_templates,
+                "storage": self.storage,
+                "memory_bytes": self.centroids.memory_bytes() + self.templates.memory_bytes(),
+                "shortlist": self.shortlist,
+                "search_index": self.centroid_search.get_info() if self.centroid_search is not None
+                else {"backend": "bruteforce"},
+                "centroid_index": self.centroids.get_info(),
+                "template_index": self.templates.get_info()
+            }
@@ -0,0 +1,217 @@
+import json
+import os
+import shutil
+import time
+import urllib.request
+import urllib.parse
+import numpy as np
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any
+from .gallery_index import decode_rows
+
+SNAPSHOT_FORMAT = 1
+LATEST_FILE = "LATEST"
+MANIFEST_FILE = "manifest.json"
+TEMPLATES_FILE = "templates.npy"
+CENTROIDS_FILE = "centroids.npy"
+TEMPLATE_SCALES_FILE = "templates_scale.npy"  # int8 저장 시 행별 스케일
+CENTROID_SCALES_FILE = "centroids_scale.npy"
+
+@dataclass
+class GallerySnapshot:
+    """버전이 있는 갤러리 스냅샷 (임베딩 행렬은 mmap으로 열 수 있음)"""
+    version: int
+    created_at: str
+    template_ids: List[str]
+    template_metadatas: List[Dict[str, Any]]  # user_id, source, created_at, updated_at
+    templates: np.ndarray  # (N, dim) 정규화된 템플릿
+    centroid_ids: List[str]
+    centroids: np.ndarray  # (U, dim) 사용자 중심
+    storage: str = "float32"  # 행렬 저장 형식 (float32, float16, int8)
+    template_scales: Optional[np.ndarray] = None
+    centroid_scales: Optional[np.ndarray] = None
+
+    @property
+    def user_ids(self) -> List[str]:
+        return [metadata["user_id"] for metadata in self.template_metadatas]
+
+def _version_dir(directory: str, version: int) -> str:
+    return os.path.join(directory, f"v{version:06d}")
+
+def latest_version(directory: str) -> int:
+    """스냅샷 폴더의 최신 버전을 반환합니다 (없으면 0)."""
+    try:
+        with open(os.path.join(directory, LATEST_FILE), encoding="utf-8") as f:
+            return int(f.read().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+def write_snapshot(directory: str, template_ids: List[str], template_metadatas: List[Dict[str, Any]],
+                   templates: np.ndarray, centroid_ids: List[str], centroids: np.ndarray,
+                   keep_versions: int = 5, storage: str = "float32",
+                   template_scales: Optional[np.ndarray] = None, centroid_scales: Optional[np.ndarray] = None) -> int:
+    """
+    새 버전의 스냅샷을 기록합니다. 임시 폴더에 쓴 뒤 이름을 바꾸고 LATEST를 갱신하므로
+    읽는 쪽은 항상 완성된 버전만 보게 됩니다.
+
+    Args:
+        directory (str): 스냅샷 폴더
+        template_ids (List[str]): 템플릿 ID 목록
+        template_metadatas (List[Dict]): 템플릿별 metadata (user_id 포함)
+        templates (np.ndarray): 템플릿 행렬
+        centroid_ids (List[str]): 중심 임베딩의 사용자 ID 목록
+        centroids (np.ndarray): 중심 임베딩 행렬
+        keep_versions (int): 보관할 이전 버전 수 (delta 계산용)
+        storage (str): 행렬 저장 형식 (서비스는 ChromaDB 원본을 float32로 기록, 다른 형식은 시작 시 갤러리 형식으로 변환)
+        template_scales (Optional[np.ndarray]): int8 템플릿 행렬의 행별 스케일
+        centroid_scales (Optional[np.ndarray]): int8 중심 행렬의 행별 스케일
+
+    Returns:
+        int: 기록된 버전
+    """
+    os.makedirs(directory, exist_ok=True)
+    version = latest_version(directory) + 1
+    target = _version_dir(directory, version)
+    staging = target + ".tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    np.save(os.path.join(staging, TEMPLATES_FILE), np.ascontiguousarray(templates))
+    np.save(os.path.join(staging, CENTROIDS_FILE), np.ascontiguousarray(centroids))
+    if template_scales is not None:
+        np.save(os.path.join(staging, TEMPLATE_SCALES_FILE), np.ascontiguousarray(template_scales, dtype=np.float32))
+    if centroid_scales is not None:
+        np.save(os.path.join(staging, CENTROID_SCALES_FILE), np.ascontiguousarray(centroid_scales, dtype=np.float32))
+    with open(os.path.join(staging, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump({
+            "format": SNAPSHOT_FORMAT,
+            "version": version,
+            "created_at": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "dim": int(templates.shape[1]) if templates.ndim == 2 else 0,
+            "storage": storage,
+            "template_ids": list(template_ids),
+            "template_metadatas": list(template_metadatas),
+            "centroid_ids": list(centroid_ids)
+        }, f, ensure_ascii=False)
+
+    os.replace(staging, target)
+    latest_tmp = os.path.join(directory, LATEST_FILE + ".tmp")
+    with open(latest_tmp, "w", encoding="utf-8") as f:
+        f.write(str(version))
+    os.replace(latest_tmp, os.path.join(directory, LATEST_FILE))
+
+    # 오래된 버전 정리 (manifest만 있어도 delta 계산이 가능하므로 행렬 파일만 먼저 지우지는 않음)
+    for old in range(version - keep_versions, 0, -1):
+        old_dir = _version_dir(directory, old)
+        if not os.path.isdir(old_dir):
+            break
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    return version
+
+def read_manifest(directory: str, version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """스냅샷 manifest를 읽습니다 (버전 미지정 시 최신, 없으면 None)."""
+    version = version or latest_version(directory)
+    if version <= 0:
+        return None
+    try:
+        with open(os.path.join(_version_dir(directory, version), MANIFEST_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def read_snapshot(directory: str, version: Optional[int] = None, mmap: bool = True) -> Optional[GallerySnapshot]:
+    """
+    스냅샷을 불러옵니다. mmap=True면 임베딩 행렬을 복사하지 않고 읽기 전용 메모리 맵으로 엽니다.
+
+    Args:
+        directory (str): 스냅샷 폴더
+        version (Optional[int]): 버전 (기본값: 최신)
+        mmap (bool): 메모리 맵 사용 여부
+
+    Returns:
+        Optional[GallerySnapshot]: 스냅샷 또는 None
+    """
+    manifest = read_manifest(directory, version)
+    if manifest is None:
+        return None
+    if manifest.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"지원하지 않는 스냅샷 형식입니다: {manifest.get('format')}")
+
+    path = _version_dir(directory, manifest["version"])
+    mmap_mode = "r" if mmap else None
+
+    def load_optional(name: str) -> Optional[np.ndarray]:
+        file_path = os.path.join(path, name)
+        return np.load(file_path, mmap_mode=mmap_mode) if os.path.exists(file_path) else None
+
+    return GallerySnapshot(
+        version=manifest["version"],
+        created_at=manifest["created_at"],
+        template_ids=manifest["template_ids"],
+        template_metadatas=manifest["template_metadatas"],
+        templates=np.load(os.path.join(path, TEMPLATES_FILE), mmap_mode=mmap_mode),
+        centroid_ids=manifest["centroid_ids"],
+        centroids=np.load(os.path.join(path, CENTROIDS_FILE), mmap_mode=mmap_mode),
+        storage=manifest.get("storage", "float32"),
+        template_scales=load_optional(TEMPLATE_SCALES_FILE),
+        centroid_scales=load_optional(CENTROID_SCALES_FILE)
+    )
+
+def compute_delta(directory: str, since_version: int) -> Optional[Dict[str, Any]]:
+    """
+    since_version 이후 최신 스냅샷까지의 변경분을 계산합니다.
+    이전 버전이 없거나 0이면 전체 목록을 담은 full delta를 반환합니다.
+
+    Args:
+        directory (str): 스냅샷 폴더
+        since_version (int): 받는 쪽이 가진 버전
+
+    Returns:
+        Optional[Dict]: {"version", "full", "added": [...], "removed": [...]} 또는 스냅샷이 없으면 None
+    """
+    snapshot = read_snapshot(directory)
+    if snapshot is None:
+        return None
+
+    delta = {"version": snapshot.version, "since_version": since_version, "full": False, "added": [], "removed": []}
+    if since_version >= snapshot.version:
+        return delta
+
+    previous = read_manifest(directory, since_version) if since_version > 0 else None
+    if previous is None:
+        delta["full"] = True
+        previous_ids = set()
+    else:
+        previous_ids = set(previous["template_ids"])
+
+    current_ids = set(snapshot.template_ids)
+    for row, template_id in enumerate(snapshot.template_ids):
+        if template_id not in previous_ids:
+            delta["added"].append({
+                "id": template_id,
+                "metadata": snapshot.template_metadatas[row],
+                "embedding": decode_rows(
+                    snapshot.templates[row:row + 1],
+                    snapshot.template_scales[row:row + 1] if snapshot.template_scales is not None else None
+                )[0].tolist()
+            })
+    delta["removed"] = sorted(previous_ids - current_ids)
+    return delta
+
+def fetch_delta(master_url: str, since_version: int, timeout: float = 30.0) -> Dict[str, Any]:
+    """
+    마스터 노드의 /face/snapshot/delta 에서 변경분을 받아옵니다.
+
+    Args:
+        master_url (str): 마스터 서버 주소 (예: http://192.168.0.10:8000)
+        since_version (int): 현재 동기화된 마스터 버전
+        timeout (float): 요청 제한 시간 (초)
+
+    Returns:
+        Dict: 마스터가 반환한 delta
+    """
+    query = urllib.parse.urlencode({"since_version": since_version})
+    url = f"{master_url.rstrip('/')}/face/snapshot/delta?{query}"
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read().decode("utf-8"))["delta"]
@@ -0,0 +1,235 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any, Tuple, Deque
+from ..config import config
+
+@dataclass
+class VoteObservation:
+    """한 번의 검색 결과 (top-k 후보와 얼굴 품질)"""
+    candidates: List[Tuple[str, float]]  # [(사용자_ID, 유사도), ...] 유사도 내림차순
+    quality: float
+    created_at: float = field(default_factory=time.time)
+
+@dataclass
+class VoteDecision:
+    """투표 결과"""
+    state: str  # "pending" (판단 보류), "recognized", "unknown"
+    user_id: Optional[str] = None
+    confidence: float = 0.0
+    similarity: Optional[float] = None  # 확정된 사용자의 최근 최대 유사도
+    votes: int = 0
+    changed: bool = False  # 이번 관측으로 확정 결과가 바뀌었으면 True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "user_id": self.user_id,
+            "confidence": round(self.confidence, 3),
+            "similarity": round(self.similarity, 3) if self.similarity is not None else None,
+            "votes": self.votes
+        }
+
+class TrackVotes:
+    """트랙 하나의 최근 K개 관측과 확정된 신원"""
+
+    def __init__(self, window_size: int):
+        self.observations: Deque[VoteObservation] = deque(maxlen=window_size)
+        self.committed: Optional[VoteDecision] = None
+        self.last_update = time.time()
+
+class IdentityVoter:
+    """
+    트랙별 시간 투표로 신원을 확정합니다.
+
+    최근 K번의 top-k 검색 결과를 유사도 x 품질로 가중해 사용자별 근거를 누적하고,
+    한 사용자(또는 미등록)의 비중이 기준 이상일 때만 확정합니다. 확정된 신원은 다른 신원이
+    같은 기준을 넘을 때까지 유지되므로, 잡음 프레임 하나로 다른 손님이 로그인되거나 세션이 흔들리지 않습니다.
+    """
+
+    def __init__(self, window_size: int = 5, top_k: int = 3, commit_confidence: float = 0.7,
+                 min_votes: int = 2, instant_similarity: float = 0.85, track_ttl: float = 10.0):
+        """
+        투표기 초기화
+
+        Args:
+            window_size (int): 트랙별로 보관할 최근 검색 결과 수 (K)
+            top_k (int): 검색 한 번에 투표에 반영할 후보 수
+            commit_confidence (float): 확정에 필요한 최고 후보의 근거 비중 (0.0-1.0)
+            min_votes (int): 확정에 필요한 최소 관측 수
+            instant_similarity (float): 이 유사도 이상이고 경쟁 후보가 없으면 관측 1회로 바로 확정
+            track_ttl (float): 이 시간 동안 갱신되지 않은 트랙은 제거 (초)
+        """
+        self.window_size = max(1, window_size)
+        self.top_k = max(1, top_k)
+        self.commit_confidence = commit_confidence
+        self.min_votes = max(1, min_votes)
+        self.instant_similarity = instant_similarity
+        self.track_ttl = track_ttl
+        self.tracks: Dict[int, TrackVotes] = {}
+        self.lock = threading.Lock()
+
+        # 통계
+        self.observations = 0
+        self.commits = 0
+        self.switches = 0  # 확정된 신원이 다른 신원으로 바뀐 횟수
+        self.instant_commits = 0
+        self.last_decision: Optional[VoteDecision] = None
+
+    def _tally(self, votes: TrackVotes, match_threshold: float) -> Dict[Optional[str], float]:
+        """
+        관측별 근거를 합산합니다. 임계값을 넘는 후보는 품질 x 유사도만큼, 넘는 후보가 없는 관측은
+        품질 x 임계값만큼 미등록(None)에 투표합니다 (경계선 일치 한 번과 같은 무게).
+        """
+        evidence: Dict[Optional[str], float] = {}
+        for observation in votes.observations:
+            weight = max(observation.quality, 0.05)
+            matched = [(user_id, similarity) for user_id, similarity in observation.candidates
+                       if similarity >= match_threshold]
+            if not matched:
+                evidence[None] = evidence.get(None, 0.0) + weight * match_threshold
+                continue
+            for user_id, similarity in matched:
+                evidence[user_id] = evidence.get(user_id, 0.0) + weight * similarity
+        return evidence
+
+    def add(self, track_id: Optional[int], candidates: List[Tuple[str, float]], quality: float,
+            match_threshold: float) -> VoteDecision:
+        """
+        검색 결과를 트랙의 투표 구간에 추가하고 현재 판단을 반환합니다.
+
+        Args:
+            track_id (Optional[int]): 트랙 ID (None이면 투표 없이 관측 1회로 판단)
+            candidates (List[Tuple[str, float]]): top-k 검색 결과 (유사도 내림차순)
+            quality (float): 검색에 사용된 얼굴의 품질 점수
+            match_threshold (float): 사용자 일치로 볼 최소 유사도
+
+        Returns:
+            VoteDecision: 확정되었으면 recognized/unknown, 아니면 pending (이전 확정 결과는 유지)
+        """
+        now = time.time()
+        candidates = list(candidates[:self.top_k])
+
+        with self.lock:
+            self.observations += 1
+            self._prune(now)
+
+            votes = self.tracks.get(track_id) if track_id is not None else None
+            if votes is None:
+                votes = TrackVotes(self.window_size)
+                if track_id is not None:
+                    self.tracks[track_id] = votes
+            votes.observations.append(VoteObservation(candidates, quality, now))
+            votes.last_update = now
+
+            evidence = self._tally(votes, match_threshold)
+            total = sum(evidence.values())
+            best_id, best_weight = max(evidence.items(), key=lambda item: item[1])
+            confidence = best_weight / total if total > 0 else 0.0
+            vote_count = len(votes.observations)
+            min_votes = self.min_votes if track_id is not None else 1
+
+            # 경쟁 후보 없이 매우 높은 유사도면 관측 1회로 확정 (대기 시간 단축)
+            top_id, top_similarity = candidates[0] if candidates else (None, None)
+            runner_up = candidates[1][1] if len(candidates) > 1 else None
+            instant = (
+                top_similarity is not None and top_similarity >= self.instant_similarity and
+                (runner_up is None or runner_up < match_threshold) and
+                (votes.committed is None or votes.committed.user_id in (None, top_id))
+            )
+            if instant:
+                best_id, confidence = top_id, max(confidence, top_similarity)
+
+            committed = votes.committed
+            if instant or (vote_count >= min_votes and confidence >= self.commit_confidence):
+                similarity = max(
+                    (similarity for observation in votes.observations
+                     for user_id, similarity in observation.candidates if user_id == best_id),
+                    default=top_similarity if best_id is None else None
+                )
+                changed = committed is None or committed.user_id != best_id
+                decision = VoteDecision("recognized" if best_id is not None else "unknown", best_id,
+                                        confidence, similarity, vote_count, changed)
+                if changed:
+                    self.commits += 1
+                    if instant:
+                        self.instant_commits += 1
+                    if committed is not None and committed.user_id != best_id:
+                        self.switches += 1
+                votes.committed = decision
+            elif committed is not None:
+                # 새 신원이 기준을 넘기 전까지는 기존 확정 결과 유지
+                decision = VoteDecision(committed.state, committed.user_id,
+                                        evidence.get(committed.user_id, 0.0) / total if total > 0 else 0.0,
+                                        committed.similarity, vote_count, False)
+            else:
+                decision = VoteDecision("pending", best_id, confidence, None, vote_count, False)
+
+            self.last_decision = decision
+            return decision
+
+    def get_decision(self, track_id: Optional[int]) -> Optional[VoteDecision]:
+        """트랙의 확정된 판단을 반환합니다 (없으면 None)."""
+        if track_id is None:
+            return None
+        with self.lock:
+            votes = self.tracks.get(track_id)
+            return votes.committed if votes is not None else None
+
+    def _prune(self, now: float):
+        """오래 갱신되지 않은 트랙을 제거합니다 (lock 보유 상태에서 호출)."""
+        for track_id in [tid for tid, votes in self.tracks.items() if now - votes.last_update >= self.track_ttl]:
+            del self.tracks[track_id]
+
+    def discard(self, track_id: Optional[int]):
+        """트랙의 투표 기록을 제거합니다."""
+        with self.lock:
+            self.tracks.pop(track_id, None)
+
+    def invalidate_user(self, user_id: str):
+        """삭제된 사용자가 포함된 관측을 모든 트랙에서 제거합니다."""
+        with self.lock:
+            for track_id, votes in list(self.tracks.items()):
+                kept = [observation for observation in votes.observations
+                        if all(candidate_id != user_id for candidate_id, _ in observation.candidates)]
+                votes.observations = deque(kept, maxlen=self.window_size)
+                if votes.committed is not None and votes.committed.user_id == user_id:
+                    votes.committed = None
+
+    def clear(self):
+        """모든 트랙의 투표 기록을 제거합니다."""
+        with self.lock:
+            self.tracks.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        투표 설정과 통계를 반환합니다.
+
+        Returns:
+            Dict: 설정값, 추적 중인 트랙 수, 관측/확정/전환 횟수, 마지막 판단
+        """
+        with self.lock:
+            return {
+                "window_size": self.window_size,
+                "top_k": self.top_k,
+                "commit_confidence": self.commit_confidence,
+                "min_votes": self.min_votes,
+                "instant_similarity": self.instant_similarity,
+                "tracks": len(self.tracks),
+                "observations": self.observations,
+                "commits": self.commits,
+                "instant_commits": self.instant_commits,
+                "switches": self.switches,
+                "observations_per_commit": round(self.observations / self.commits, 2) if self.commits else None,
+                "last_decision": self.last_decision.to_dict() if self.last_decision is not None else None
+            }
+
+# 전역 인스턴스
+identity_voter = IdentityVoter(
+    window_size=config.IDENTITY_VOTE_WINDOW,
+    top_k=config.IDENTITY_VOTE_TOP_K,
+    commit_confidence=config.IDENTITY_COMMIT_CONFIDENCE,
+    min_votes=config.IDENTITY_MIN_VOTES,
+    instant_similarity=config.IDENTITY_INSTANT_SIMILARITY
+)
@@ -0,0 +1,261 @@
+import copy
+import hashlib
+import os
+import tempfile
+import cv2
+import numpy as np
+import torch
+from typing import Optional, Dict, Any, List
+
+FACENET_INPUT_SHAPE = (3, 160, 160)
+ONNX_OPSET_VERSION = 13
+
+class EmbeddingBackend:
+    """InceptionResnetV1 추론 백엔드 기본 클래스 (정렬된 얼굴 배치 -> 임베딩)"""
+
+    name = "base"
+
+    def __init__(self, model: torch.nn.Module, device: torch.device):
+        self.model = model
+        self.device = device
+
+    def __call__(self, batch: torch.Tensor) -> np.ndarray:
+        """
+        얼굴 배치의 임베딩을 계산합니다.
+
+        Args:
+            batch (torch.Tensor): (N, 3, 160, 160) 정규화된 얼굴 텐서
+
+        Returns:
+            np.ndarray: (N, 512) 임베딩
+        """
+        with torch.no_grad():
+            return self.model(batch.to(self.device)).cpu().numpy()
+
+    def get_info(self) -> Dict[str, Any]:
+        return {"backend": self.name, "device": str(self.device)}
+
+class EagerBackend(EmbeddingBackend):
+    """기본 eager fp32 모델"""
+
+    name = "eager"
+
+class TorchScriptBackend(EmbeddingBackend):
+    """TorchScript로 trace + freeze한 모델 (파이썬 오버헤드 제거, 연산 융합)"""
+
+    name = "torchscript"
+
+    def __init__(self, model: torch.nn.Module, device: torch.device):
+        example = torch.zeros((1,) + FACENET_INPUT_SHAPE, device=device)
+        with torch.no_grad():
+            traced = torch.jit.trace(model, example)
+            traced = torch.jit.freeze(traced)
+            traced = torch.jit.optimize_for_inference(traced)
+        super().__init__(traced, device)
+
+class QuantizedInt8Backend(EmbeddingBackend):
+    """
+    동적 int8 양자화 모델 (CPU 전용)
+
+    PyTorch 동적 양자화는 Linear 계층만 대상으로 하므로, InceptionResnetV1에서는
+    마지막 임베딩 계층(1792 -> 512)이 int8로 계산되고 합성곱은 fp32로 남습니다.
+    """
+
+    name = "int8"
+
+    def __init__(self, model: torch.nn.Module, device: torch.device):
+        quantized = torch.ao.quantization.quantize_dynamic(
+            copy.deepcopy(model).cpu(), {torch.nn.Linear}, dtype=torch.qint8
+        )
+        super().__init__(quantized.eval(), torch.device('cpu'))
+
+def model_fingerprint(model: torch.nn.Module) -> str:
+    """
+    모델 가중치와 torch 버전, ONNX opset으로 내보내기 결과를 식별하는 해시를 만듭니다.
+
+    Args:
+        model (torch.nn.Module): 내보낼 모델
+
+    Returns:
+        str: 16자리 16진수 해시
+    """
+    digest = hashlib.sha256(f"{torch.__version__}:{ONNX_OPSET_VERSION}".encode())
+    for key, tensor in model.state_dict().items():
+        digest.update(key.encode())
+        digest.update(tensor.detach().cpu().contiguous().numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+class OnnxRuntimeBackend(EmbeddingBackend):
+    """
+    ONNX로 내보낸 모델을 ONNX Runtime(CPU)으로 실행 (onnxruntime 설치 필요)
+
+    내보낸 파일은 가중치/버전 해시를 파일명에 넣어 캐시하므로, 가중치나 torch 버전이 바뀌면 다시 내보냅니다.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model: torch.nn.Module, device: torch.device, model_path: Optional[str] = None):
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise RuntimeError("onnx 백엔드를 사용하려면 onnxruntime을 설치하세요: pip install onnxruntime")
+
+        self.model_path = model_path or os.path.join(
+            tempfile.gettempdir(), f"inception_resnet_v1-{model_fingerprint(model)}.onnx"
+        )
+        if not os.path.exists(self.model_path):
+            self._export(model, self.model_path)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(self.model_path, options, providers=["CPUExecutionProvider"])
+        super().__init__(model, torch.device('cpu'))
+
+    @staticmethod
+    def _export(model: torch.nn.Module, path: str):
+        """같은 폴더의 임시 파일로 내보낸 뒤 교체하여, 동시에 시작한 프로세스가 쓰다 만 파일을 읽지 않게 합니다."""
+        fd, tmp_path = tempfile.mkstemp(suffix=".onnx", dir=os.path.dirname(path) or ".")
+        os.close(fd)
+        try:
+            example = torch.zeros((1,) + FACENET_INPUT_SHAPE)
+            torch.onnx.export(
+                copy.deepcopy(model).cpu().eval(), example, tmp_path,
+                input_names=["faces"], output_names=["embeddings"],
+                dynamic_axes={"faces": {0: "batch"}, "embeddings": {0: "batch"}},
+                opset_version=ONNX_OPSET_VERSION
+            )
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def __call__(self, batch: torch.Tensor) -> np.ndarray:
+        faces = batch.detach().cpu().numpy().astype(np.float32)
+        return self.session.run(["embeddings"], {"faces": faces})[0]
+
+    def get_info(self) -> Dict[str, Any]:
+        info = super().get_info()
+        info["model_path"] = self.model_path
+        return info
+
+BACKENDS = {
+    "eager": EagerBackend,
+    "torchscript": TorchScriptBackend,
+    "int8": QuantizedInt8Backend,
+    "onnx": OnnxRuntimeBackend
+}
+
+def create_backend(name: str, model: torch.nn.Module, device: torch.device) -> EmbeddingBackend:
+    """
+    이름에 해당하는 추론 백엔드를 생성합니다.
+
+    Args:
+        name (str): "eager", "torchscript", "int8", "onnx" 중 하나
+        model (torch.nn.Module): eval 모드의 InceptionResnetV1 (fp32 기준 모델)
+        device (torch.device): 실행 장치
+
+    Returns:
+        EmbeddingBackend: 생성된 백엔드
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"지원하지 않는 추론 백엔드입니다: {name} (가능: {', '.join(BACKENDS)})")
+    return BACKENDS[name](model, device)
+
+FIXTURE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+def check_fixture_faces(path: Optional[str], min_count: int = 1) -> List[str]:
+    """
+    운영자가 넣은 백엔드 검증용 얼굴 이미지가 충분한지 확인합니다.
+
+    저장소에는 얼굴 이미지를 포함하지 않으므로, eager 이외의 백엔드를 쓰려면
+    FACE_BACKEND_FIXTURES 폴더에 정렬된 얼굴 크롭을 직접 넣어야 합니다.
+
+    Args:
+        path (Optional[str]): 정렬된 얼굴 크롭 이미지 폴더
+        min_count (int): 필요한 최소 이미지 수
+
+    Returns:
+        List[str]: 이미지 파일 경로 (이름순)
+
+    Raises:
+        RuntimeError: 폴더가 없거나 이미지가 min_count개 미만인 경우 (설정 이름 포함)
+    """
+    if not path or not os.path.isdir(path):
+        raise RuntimeError(
+            f"백엔드 검증용 얼굴 이미지 폴더가 없습니다: {path!r}. "
+            f"FACE_BACKEND_FIXTURES에 정렬된 얼굴 크롭 {min_count}장 이상이 든 폴더를 지정하세요 "
+            f"(eager 이외의 추론 백엔드에 필요)."
+        )
+
+    files = [os.path.join(path, name) for name in sorted(os.listdir(path))
+             if name.lower().endswith(FIXTURE_EXTENSIONS)]
+    if len(files) < max(1, min_count):
+        raise RuntimeError(
+            f"FACE_BACKEND_FIXTURES({path})의 얼굴 이미지가 {len(files)}장으로 "
+            f"FACE_BACKEND_MIN_FIXTURES({min_count})보다 적습니다. 정렬된 얼굴 크롭을 추가하세요."
+        )
+    return files
+
+def load_fixture_faces(path: Optional[str], min_count: int = 1) -> torch.Tensor:
+    """
+    정확도 검증용 얼굴 텐서 묶음을 불러옵니다.
+
+    균일 잡음 같은 합성 입력은 실제 얼굴의 활성 분포와 달라 양자화 오차를 가리므로 사용하지 않습니다.
+    실제 얼굴 이미지가 부족하면 예외를 발생시켜 검증 없이 백엔드가 바뀌지 않도록 합니다.
+
+    Args:
+        path (Optional[str]): 정렬된 얼굴 크롭 이미지 폴더 (160x160으로 리사이즈)
+        min_count (int): 필요한 최소 이미지 수
+
+    Returns:
+        torch.Tensor: (N, 3, 160, 160) 정규화된 얼굴 텐서
+
+    Raises:
+        RuntimeError: 폴더가 없거나 읽을 수 있는 얼굴 이미지가 min_count개 미만인 경우
+    """
+    faces: List[torch.Tensor] = []
+    for file_path in check_fixture_faces(path, min_count):
+        image = cv2.imread(file_path)
+        if image is None:
+            continue
+        image = cv2.resize(image, FACENET_INPUT_SHAPE[1:][::-1])
+        rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        faces.append((torch.from_numpy(rgb).permute(2, 0, 1).float() - 127.5) / 128.0)
+
+    if len(faces) < max(1, min_count):
+        raise RuntimeError(
+            f"FACE_BACKEND_FIXTURES({path})에서 읽을 수 있는 얼굴 이미지가 {len(faces)}장으로 "
+            f"FACE_BACKEND_MIN_FIXTURES({min_count})보다 적습니다."
+        )
+
+    return torch.stack(faces)
+
+def verify_backend_accuracy(backend: EmbeddingBackend, reference: EmbeddingBackend,
+                            fixtures: torch.Tensor, min_cosine: float = 0.99) -> Dict[str, Any]:
+    """
+    백엔드 임베딩을 fp32 기준 모델과 코사인 유사도로 비교합니다.
+
+    Args:
+        backend (EmbeddingBackend): 검증할 백엔드
+        reference (EmbeddingBackend): 기준 eager fp32 백엔드
+        fixtures (torch.Tensor): 검증용 얼굴 텐서
+        min_cosine (float): 통과 기준 최소 코사인 유사도
+
+    Returns:
+        Dict: 평균/최소 코사인 유사도와 통과 여부
+    """
+    expected = reference(fixtures)
+    actual = backend(fixtures)
+
+    expected = expected / np.linalg.norm(expected, axis=1, keepdims=True)
+    actual = actual / np.linalg.norm(actual, axis=1, keepdims=True)
+    cosines = np.sum(expected * actual, axis=1)
+
+    return {
+        "backend": backend.name,
+        "fixtures": int(len(fixtures)),
+        "mean_cosine": float(np.mean(cosines)),
+        "min_cosine": float(np.min(cosines)),
+        "threshold": min_cosine,
+        "passed": bool(np.min(cosines) >= min_cosine)
+    }
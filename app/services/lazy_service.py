@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Optional, Dict, Any, List
+
+class LazyService:
+    """
+    처음 사용할 때 생성되는 서비스 프록시
+
+    모델 로딩이 무거운 서비스를 모듈 import 시점이 아니라 첫 사용(또는 시작 시 백그라운드 워밍업) 때
+    생성합니다. 속성 접근은 생성된 인스턴스로 그대로 전달되므로 기존 전역 인스턴스처럼 사용할 수 있습니다.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any], warmup: Optional[Callable[[Any], None]] = None):
+        """
+        지연 서비스 초기화
+
+        Args:
+            name (str): 컴포넌트 이름 (/ready 응답에 사용)
+            factory (Callable): 서비스 인스턴스를 생성하는 함수
+            warmup (Optional[Callable]): 생성 직후 더미 추론 등 워밍업 함수
+        """
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_warmup", warmup)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+        object.__setattr__(self, "_status", "pending")  # pending, loading, warming, ready, error
+        object.__setattr__(self, "_error", None)
+        object.__setattr__(self, "_load_ms", None)
+        object.__setattr__(self, "_warmup_ms", None)
+        _registry.append(self)
+
+    def load(self) -> Any:
+        """서비스 인스턴스를 반환합니다 (없으면 생성, 다른 스레드가 생성 중이면 대기)."""
+        instance = self._instance
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if self._instance is None:
+                object.__setattr__(self, "_status", "loading")
+                start = time.perf_counter()
+                try:
+                    instance = self._factory()
+                except Exception as e:
+                    object.__setattr__(self, "_status", "error")
+                    object.__setattr__(self, "_error", str(e))
+                    raise
+                object.__setattr__(self, "_load_ms", round((time.perf_counter() - start) * 1000, 1))
+                object.__setattr__(self, "_instance", instance)
+                object.__setattr__(self, "_status", "ready" if self._warmup is None else "warming")
+            return self._instance
+
+    def warm_up(self):
+        """서비스를 생성하고 워밍업 함수를 한 번 실행합니다 (이미 완료되었으면 무시)."""
+        instance = self.load()
+        if self._warmup is None or self._warmup_ms is not None:
+            return
+
+        start = time.perf_counter()
+        try:
+            self._warmup(instance)
+        except Exception as e:
+            # 워밍업 실패는 서비스 사용을 막지 않음
+            print(f"'{self._name}' 워밍업 오류: {e}")
+            object.__setattr__(self, "_error", f"warmup: {e}")
+        object.__setattr__(self, "_warmup_ms", round((time.perf_counter() - start) * 1000, 1))
+        object.__setattr__(self, "_status", "ready")
+
+    @property
+    def is_loaded(self) -> bool:
+        """인스턴스가 생성되었는지 여부"""
+        return self._instance is not None
+
+    def get_load_status(self) -> Dict[str, Any]:
+        """
+        컴포넌트 준비 상태를 반환합니다.
+
+        Returns:
+            Dict: 상태, 생성 시간(ms), 워밍업 시간(ms), 오류
+        """
+        return {
+            "status": self._status,
+            "ready": self._status == "ready",
+            "load_ms": self._load_ms,
+            "warmup_ms": self._warmup_ms,
+            "error": self._error
+        }
+
+    def __getattr__(self, item):
+        return getattr(self.load(), item)
+
+    def __setattr__(self, key, value):
+        setattr(self.load(), key, value)
+
+# 생성된 지연 서비스 목록
+_registry: List[LazyService] = []
+
+def get_lazy_services() -> Dict[str, LazyService]:
+    """등록된 지연 서비스를 이름별로 반환합니다."""
+    return {service._name: service for service in _registry}
+
+async def warm_up_services() -> Dict[str, Dict[str, Any]]:
+    """
+    등록된 모든 지연 서비스를 스레드에서 병렬로 생성/워밍업합니다.
+
+    Returns:
+        Dict: 컴포넌트별 준비 상태
+    """
+    services = list(get_lazy_services().values())
+    results = await asyncio.gather(
+        *(asyncio.to_thread(service.warm_up) for service in services),
+        return_exceptions=True
+    )
+
+    for service, result in zip(services, results):
+        if isinstance(result, Exception):
+            print(f"⚠️ '{service._name}' 로딩 실패: {result}")
+        else:
+            status = service.get_load_status()
+            print(f"✅ '{service._name}' 준비 완료 (로딩 {status['load_ms']} ms, 워밍업 {status['warmup_ms']} ms)")
+
+    return {service._name: service.get_load_status() for service in services}
@@ -0,0 +1,343 @@
+import queue
+import threading
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Optional, Tuple, List, Dict, Any
+from ..config import config
+from .face_recognition_service import face_recognition_service
+from .face_database_service import face_database_service
+from .session_manager import session_manager
+from .embedding_cache import embedding_cache
+from .identity_voting import identity_voter
+
+@dataclass
+class FaceSample:
+    """등록용 추가 얼굴 크롭"""
+    face_crop: np.ndarray
+    bbox: Tuple[int, int, int, int]
+    keypoints: List[Tuple[float, float]] = field(default_factory=list)
+    quality: float = 0.0
+
+@dataclass
+class RecognitionJob:
+    """인식 워커에 전달되는 얼굴 작업"""
+    frame_id: int
+    track_id: Optional[int]  # 트랙 ID는 모든 카메라에서 겹치지 않음
+    face_crop: np.ndarray  # 프레임에서 복사한 얼굴 주변 영역 (BGR)
+    bbox: Tuple[int, int, int, int]  # face_crop 내부의 얼굴 바운딩 박스
+    keypoints: List[Tuple[float, float]] = field(default_factory=list)  # face_crop 기준 키포인트
+    kind: str = "search"  # "search" (DB 검색) 또는 "register" (등록)
+    user_id: Optional[str] = None  # 등록할 사용자 ID
+    quality: float = 0.0  # 제출 시점의 얼굴 품질 점수 (임베딩 캐시 갱신 판단용)
+    extra_samples: List[FaceSample] = field(default_factory=list)  # 등록 시 함께 평균할 추가 크롭
+    camera_id: int = 0  # 결과를 반영할 카메라 세션
+    created_at: float = field(default_factory=time.time)
+
+def crop_face_region(frame: np.ndarray, bbox: Tuple[int, int, int, int],
+                     keypoints: Optional[List[Tuple[float, float]]] = None,
+                     margin: float = 0.2) -> Optional[Tuple[np.ndarray, Tuple[int, int, int, int], List[Tuple[float, float]]]]:
+    """
+    프레임에서 여백을 포함한 얼굴 영역을 복사하고, 크롭 기준 좌표로 변환합니다.
+
+    Args:
+        frame (np.ndarray): 입력 프레임 (BGR)
+        bbox (Tuple): 프레임 기준 바운딩 박스 (x1, y1, x2, y2)
+        keypoints (Optional[List]): 프레임 기준 키포인트
+        margin (float): 박스 크기 대비 여백 비율
+
+    Returns:
+        Optional[Tuple]: (크롭 이미지, 크롭 기준 박스, 크롭 기준 키포인트) 또는 None
+    """
+    h, w = frame.shape[:2]
+    x1, y1, x2, y2 = bbox
+    if x2 <= x1 or y2 <= y1:
+        return None
+
+    mx, my = int((x2 - x1) * margin), int((y2 - y1) * margin)
+    cx1, cy1 = max(0, x1 - mx), max(0, y1 - my)
+    cx2, cy2 = min(w, x2 + mx), min(h, y2 + my)
+    if cx2 <= cx1 or cy2 <= cy1:
+        return None
+
+    # 프레임 버퍼는 재사용되므로 반드시 복사
+    crop = frame[cy1:cy2, cx1:cx2].copy()
+    local_bbox = (x1 - cx1, y1 - cy1, x2 - cx1, y2 - cy1)
+    local_keypoints = [(x - cx1, y - cy1) for x, y in (keypoints or [])]
+    return crop, local_bbox, local_keypoints
+
+class EnrollmentWindow:
+    """
+    등록 요청 후 짧은 수집 구간 동안 얼굴 크롭을 모아 품질 상위 k개를 고릅니다.
+
+    품질 기준을 통과한 크롭이 하나 이상 모이면 수집 시간 종료 시 완료되고,
+    끝까지 통과한 크롭이 없으면 최대 대기 시간 후 가장 좋은 크롭 하나를 사용합니다.
+    """
+
+    def __init__(self, user_id: str, track_id: Optional[int], duration: float = 1.5,
+                 top_k: int = 3, max_wait: float = 5.0):
+        self.user_id = user_id
+        self.track_id = track_id
+        self.duration = duration
+        self.top_k = max(1, top_k)
+        self.max_wait = max(duration, max_wait)
+        self.started_at = time.time()
+        self.samples: List[FaceSample] = []  # 기준 통과 크롭 (품질 내림차순, 최대 top_k개)
+        self.fallback: Optional[FaceSample] = None  # 기준 미달 크롭 중 최고 품질
+        self.frames_seen = 0
+
+    def accepts(self, quality: float, passed: bool) -> bool:
+        """해당 품질의 크롭이 보관 대상인지 확인합니다 (크롭 복사 전에 호출)."""
+        self.frames_seen += 1
+        if passed:
+            return len(self.samples) < self.top_k or quality > self.samples[-1].quality
+        return not self.samples and (self.fallback is None or quality > self.fallback.quality)
+
+    def add(self, sample: FaceSample, passed: bool):
+        """크롭을 추가합니다."""
+        if passed:
+            self.samples.append(sample)
+            self.samples.sort(key=lambda s: s.quality, reverse=True)
+            del self.samples[self.top_k:]
+        else:
+            self.fallback = sample
+
+    def is_complete(self) -> bool:
+        elapsed = time.time() - self.started_at
+        return (elapsed >= self.duration and bool(self.samples)) or elapsed >= self.max_wait
+
+    def select(self) -> List[FaceSample]:
+        """등록에 사용할 크롭을 품질 순으로 반환합니다."""
+        if self.samples:
+            return list(self.samples)
+        return [self.fallback] if self.fallback is not None else []
+
+class RecognitionWorker:
+    """
+    영상 루프와 분리된 백그라운드 얼굴 인식 워커
+
+    탐지 단계가 넣은 얼굴 크롭을 제한된 큐에서 꺼내 FaceNet 임베딩 추출과 DB 검색을 수행하고,
+    결과를 SessionManager에 반영합니다. 큐가 가득 차면 가장 오래된 작업을 버립니다.
+    """
+
+    def __init__(self, queue_size: int = 4, max_batch_size: int = 4):
+        """
+        인식 워커 초기화
+
+        Args:
+            queue_size (int): 대기 가능한 최대 작업 수
+            max_batch_size (int): 한 번의 FaceNet forward로 묶을 최대 작업 수
+        """
+        self.jobs: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.max_batch_size = max(1, max_batch_size)
+        self.lock = threading.Lock()
+        self.in_flight = set()  # (작업 종류, 트랙 ID) - 같은 얼굴의 중복 제출 방지
+        self.thread: Optional[threading.Thread] = None
+        self.running = False
+
+        # 통계
+        self.processed_jobs = 0
+        self.dropped_jobs = 0
+        self.failed_jobs = 0
+        self.batches = 0
+        self.templates_added = 0
+        self.total_latency = 0.0
+        self.last_result: Optional[Dict[str, Any]] = None
+
+    def start(self):
+        """워커 스레드를 시작합니다 (이미 실행 중이면 무시)."""
+        with self.lock:
+            if self.running:
+                return
+            self.running = True
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+        print("얼굴 인식 워커 시작됨")
+
+    def stop(self):
+        """워커 스레드를 종료합니다."""
+        with self.lock:
+            if not self.running:
+                return
+            self.running = False
+            thread = self.thread
+            self.thread = None
+
+        if thread is not None:
+            thread.join(timeout=5.0)
+
+        # 남은 작업 정리
+        while True:
+            try:
+                self.jobs.get_nowait()
+            except queue.Empty:
+                break
+        with self.lock:
+            self.in_flight.clear()
+        print("얼굴 인식 워커 중지됨")
+
+    def submit(self, job: RecognitionJob) -> bool:
+        """
+        인식 작업을 큐에 넣습니다. 호출 측(영상 루프)을 절대 막지 않습니다.
+
+        Args:
+            job (RecognitionJob): 인식 작업
+
+        Returns:
+            bool: 작업이 큐에 들어갔으면 True (같은 트랙 작업이 진행 중이면 False)
+        """
+        key = (job.kind, job.track_id)
+        with self.lock:
+            if not self.running or key in self.in_flight:
+                return False
+            self.in_flight.add(key)
+
+        while True:
+            try:
+                self.jobs.put_nowait(job)
+                return True
+            except queue.Full:
+                # 가장 오래된 작업을 버리고 최신 얼굴을 우선
+                try:
+                    dropped = self.jobs.get_nowait()
+                    self._finish(dropped)
+                    self.dropped_jobs += 1
+                except queue.Empty:
+                    pass
+
+    def is_pending(self, kind: str, track_id: Optional[int]) -> bool:
+        """해당 트랙의 작업이 대기/처리 중인지 확인합니다."""
+        with self.lock:
+            return (kind, track_id) in self.in_flight
+
+    def _finish(self, job: RecognitionJob):
+        with self.lock:
+            self.in_flight.discard((job.kind, job.track_id))
+
+    def _run(self):
+        """큐에서 작업을 꺼내 처리합니다. 밀린 작업은 한 번의 FaceNet forward로 묶어 처리합니다."""
+        while self.running:
+            try:
+                jobs = [self.jobs.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+
+            while len(jobs) < self.max_batch_size:
+                try:
+                    jobs.append(self.jobs.get_nowait())
+                except queue.Empty:
+                    break
+
+            start = time.time()
+            try:
+                self._process_batch(jobs)
+                self.processed_jobs += len(jobs)
+            except Exception as e:
+                self.failed_jobs += len(jobs)
+                print(f"얼굴 인식 워커 오류: {e}")
+            finally:
+                self.total_latency += time.time() - start
+                self.batches += 1
+                for job in jobs:
+                    self._finish(job)
+
+    def _process_batch(self, jobs: List[RecognitionJob]):
+        """작업들의 임베딩을 한 번에 추출한 뒤 작업별로 검색 또는 등록을 수행합니다."""
+        face_tensors, owners = [], []
+        for index, job in enumerate(jobs):
+            samples = [(job.face_crop, job.bbox, job.keypoints)]
+            samples += [(sample.face_crop, sample.bbox, sample.keypoints) for sample in job.extra_samples]
+            for face_crop, bbox, keypoints in samples:
+                try:
+                    face_tensors.append(face_recognition_service.get_face_tensor(face_crop, bbox, keypoints))
+                except Exception as e:
+                    print(f"얼굴 정렬 오류: {e}")
+                    face_tensors.append(None)
+                owners.append(index)
+
+        embeddings = face_recognition_service.embed_face_tensors(face_tensors)
+
+        grouped: List[List[np.ndarray]] = [[] for _ in jobs]
+        for index, embedding in zip(owners, embeddings):
+            if embedding is not None:
+                grouped[index].append(embedding)
+
+        for job, job_embeddings in zip(jobs, grouped):
+            self._process(job, job_embeddings)
+
+    def _process(self, job: RecognitionJob, embeddings: List[np.ndarray]):
+        """
+        추출된 임베딩으로 검색 또는 등록을 수행하고 세션에 반영합니다.
+
+        등록 작업은 크롭별 임베딩을 각각 템플릿으로 저장하고, 검색 작업은 첫 임베딩으로 검색합니다.
+        """
+        if not embeddings:
+            self.last_result = {"frame_id": job.frame_id, "camera_id": job.camera_id,
+                                "track_id": job.track_id, "kind": job.kind, "status": "no_embedding"}
+            return
+
+        embedding = embeddings[0]
+
+        if job.kind == "register":
+            success = face_database_service.add_templates(job.user_id, embeddings)
+            session_manager.clear_pending_registration(job.camera_id, track_id=job.track_id)
+            if success:
+                embedding_cache.put(job.track_id, embedding, job.quality, job.user_id, 1.0)
+                session_manager.set_recognized_user(job.user_id, track_id=job.track_id, camera_id=job.camera_id)
+            self.last_result = {"frame_id": job.frame_id, "camera_id": job.camera_id,
+                                "track_id": job.track_id, "kind": job.kind,
+                                "status": "registered" if success else "failed", "user_id": job.user_id,
+                                "samples": len(embeddings), "quality": job.quality}
+            return
+
+        # top-k 결과를 트랙의 투표 구간에 넣고, 신뢰도가 기준을 넘을 때만 세션에 확정
+        candidates = face_database_service.search_faces(embedding, identity_voter.top_k)
+        decision = identity_voter.add(job.track_id, candidates, job.quality,
+                                      face_recognition_service.similarity_threshold)
+        user_id, similarity = decision.user_id, decision.similarity
+        
+        if decision.state == "recognized":
+            session_manager.set_recognized_user(user_id, track_id=job.track_id,
+                                                confidence=decision.confidence, camera_id=job.camera_id)
+            # 확정된 사용자와 일치하는 고신뢰 결과는 조명/각도 변화에 대비해 템플릿으로 추가
+            if candidates and candidates[0][0] == user_id and \
+                    face_database_service.maybe_add_template(user_id, embedding, candidates[0][1]):
+                self.templates_added += 1
+        elif decision.state == "unknown":
+            session_manager.set_unknown_user(track_id=job.track_id, confidence=decision.confidence,
+                                             camera_id=job.camera_id)
+        
+        if decision.state != "pending":
+            embedding_cache.put(job.track_id, embedding, job.quality, user_id, similarity)
+        status = decision.state
+        
+        self.last_result = {"frame_id": job.frame_id, "camera_id": job.camera_id,
+                            "track_id": job.track_id, "kind": job.kind, "status": status, "user_id": user_id, "similarity": similarity,
+                            "confidence": round(decision.confidence, 3), "votes": decision.votes,
+                            "queue_wait_ms": round((time.time() - job.created_at) * 1000, 1)}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        워커 통계를 반환합니다.
+
+        Returns:
+            Dict: 처리/드롭/실패 작업 수, 평균 처리 시간, 마지막 결과
+        """
+        handled = self.processed_jobs + self.failed_jobs
+        return {
+            "running": self.running,
+            "queue_size": self.jobs.qsize(),
+            "processed_jobs": self.processed_jobs,
+            "dropped_jobs": self.dropped_jobs,
+            "failed_jobs": self.failed_jobs,
+            "batches": self.batches,
+            "templates_added": self.templates_added,
+            "avg_latency_ms": round(self.total_latency / handled * 1000, 1) if handled else None,
+            "last_result": self.last_result
+        }
+
+# 전역 인스턴스
+recognition_worker = RecognitionWorker(
+    queue_size=config.RECOGNITION_QUEUE_SIZE,
+    max_batch_size=config.RECOGNITION_BATCH_SIZE
+)
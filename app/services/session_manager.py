@@ -1,214 +1,417 @@
 import time
 import threading
-from typing import Optional, Dict, Any
-from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Tuple, Mapping, Iterable
+from dataclasses import dataclass, field, replace
+from ..config import config
 
-@dataclass
+@dataclass(frozen=True)
 class FaceState:
-    """얼굴 상태 정보를 담는 데이터 클래스"""
+    """얼굴 상태 정보를 담는 데이터 클래스 (불변, 갱신 시 새 객체로 교체)"""
     has_face: bool = False
     user_id: Optional[str] = None
     is_recognized: bool = False
     last_seen: float = 0.0
     search_performed: bool = False
     bbox: Optional[tuple] = None
+    track_id: Optional[int] = None  # 트래커가 부여한 얼굴 트랙 ID
+    confidence: Optional[float] = None  # 트랙별 신원 투표의 확정 신뢰도
+    camera_id: int = 0  # 얼굴이 보이는 카메라(카운터) ID
+    first_seen: float = 0.0
+    
+    def to_dict(self, now: Optional[float] = None) -> Dict[str, Any]:
+        now = time.time() if now is None else now
+        return {
+            "has_face": self.has_face,
+            "user_id": self.user_id,
+            "is_recognized": self.is_recognized,
+            "search_performed": self.search_performed,
+            "bbox": self.bbox,
+            "camera_id": self.camera_id,
+            "track_id": self.track_id,
+            "confidence": self.confidence,
+            "time_since_last_seen": now - self.last_seen if self.has_face else None
+        }
+
+@dataclass(frozen=True)
+class CameraSession:
+    """
+    한 카메라의 세션 스냅샷 (불변)
+    
+    쓰기는 새 스냅샷을 만들어 통째로 교체하므로, 읽는 쪽은 lock 없이 참조한 스냅샷을 그대로 사용합니다.
+    """
+    camera_id: int
+    version: int = 0
+    faces: Mapping[Optional[int], FaceState] = field(default_factory=lambda: MappingProxyType({}))  # 트랙 ID -> 얼굴 상태
+    primary_track_id: Optional[int] = None  # 카운터 앞 손님 (화면에서 가장 큰 얼굴)
+    pending_registration: Optional[Dict] = None  # 등록 대기 중인 사용자 정보
+    
+    @property
+    def primary_face(self) -> Optional[FaceState]:
+        return self.faces.get(self.primary_track_id)
+    
+    def recognized_faces(self) -> List[FaceState]:
+        return [state for state in self.faces.values() if state.is_recognized]
 
 class SessionManager:
     def __init__(self, face_timeout: float = 5.0):
         """
         세션 관리자 초기화
         
+        얼굴 상태는 (카메라 ID, 트랙 ID)별로 관리하므로 한 카메라에 여러 사용자가 동시에 인식될 수 있고,
+        카메라(카운터)마다 독립된 세션을 가집니다. 트랙은 각자 마지막으로 보인 시각부터 타임아웃을 계산합니다.
+        
         Args:
-            face_timeout (float): 얼굴 사라짐 후 로그아웃까지의 시간 (초)
+            face_timeout (float): 트랙이 화면에서 사라진 후 로그아웃까지의 시간 (초)
         """
         self.face_timeout = face_timeout
-        self.face_state = FaceState()
-        self.lock = threading.Lock()
-        self.pending_user_registration = None  # 등록 대기 중인 사용자 정보
+        self.sessions: Dict[int, CameraSession] = {}  # 카메라 ID -> 최신 스냅샷 (항목 교체만 수행)
+        self.camera_locks: Dict[int, threading.Lock] = {}  # 쓰기만 카메라 단위로 직렬화
+        self.lock = threading.Lock()  # 카메라 추가용
         
         print(f"세션 매니저 초기화 (타임아웃: {face_timeout}초)")
     
-    def update_face_detected(self, bbox: tuple) -> bool:
+    def _camera_lock(self, camera_id: int) -> threading.Lock:
+        lock = self.camera_locks.get(camera_id)
+        if lock is None:
+            with self.lock:
+                lock = self.camera_locks.setdefault(camera_id, threading.Lock())
+        return lock
+    
+    def _publish(self, session: CameraSession, **changes) -> CameraSession:
+        """변경 사항을 적용한 새 스냅샷을 게시합니다 (카메라 lock 보유 상태에서 호출)."""
+        if "faces" in changes:
+            changes["faces"] = MappingProxyType(changes["faces"])
+        published = replace(session, version=session.version + 1, **changes)
+        if session.camera_id in self.sessions:
+            self.sessions[session.camera_id] = published
+        else:
+            with self.lock:
+                self.sessions[session.camera_id] = published
+        return published
+    
+    def get_snapshot(self, camera_id: int = 0) -> CameraSession:
         """
-        얼굴이 감지되었을 때 상태를 업데이트합니다.
+        카메라의 최신 세션 스냅샷을 반환합니다. lock을 잡지 않으므로 영상 루프를 막지 않습니다.
         
         Args:
-            bbox (tuple): 얼굴 바운딩 박스 좌표
-            
+            camera_id (int): 카메라 ID
+        
         Returns:
-            bool: 새로운 얼굴이 감지되었으면 True (DB 검색 필요)
+            CameraSession: 불변 세션 스냅샷
         """
-        with self.lock:
+        return self.sessions.get(camera_id) or CameraSession(camera_id)
+    
+    def get_snapshots(self) -> List[CameraSession]:
+        """모든 카메라의 세션 스냅샷을 반환합니다."""
+        return sorted(list(self.sessions.values()), key=lambda session: session.camera_id)
+    
+    def update_faces(self, camera_id: int, faces: Iterable[Tuple[Optional[int], tuple]],
+                     primary_track_id: Optional[int] = None) -> CameraSession:
+        """
+        한 프레임의 얼굴들을 세션에 반영합니다 (카메라 프레임당 한 번 호출).
+        
+        새 트랙은 검색이 필요한 상태로 추가되고, 화면에 없는 트랙은 타임아웃이 지나면 삭제됩니다.
+        
+        Args:
+            camera_id (int): 카메라 ID
+            faces (Iterable[Tuple]): (트랙 ID, 바운딩 박스) 목록
+            primary_track_id (Optional[int]): 카운터 앞 손님으로 볼 트랙 ID (없으면 이전 값 유지)
+        
+        Returns:
+            CameraSession: 갱신된 세션 스냅샷
+        """
+        with self._camera_lock(camera_id):
+            session = self.get_snapshot(camera_id)
             current_time = time.time()
+            states = dict(session.faces)
+            seen = set()
+            
+            for track_id, bbox in faces:
+                seen.add(track_id)
+                state = states.get(track_id)
+                if state is None:
+                    states[track_id] = FaceState(
+                        has_face=True,
+                        last_seen=current_time,
+                        first_seen=current_time,
+                        bbox=bbox,
+                        track_id=track_id,
+                        camera_id=camera_id
+                    )
+                    print(f"새로운 얼굴 감지됨 (카메라 {camera_id}, 트랙 {track_id}) - DB 검색 필요")
+                else:
+                    states[track_id] = replace(state, last_seen=current_time, bbox=bbox)
+            
+            # 트랙마다 마지막으로 보인 시각 기준으로 타임아웃
+            for track_id, state in list(states.items()):
+                if track_id not in seen and current_time - state.last_seen >= self.face_timeout:
+                    del states[track_id]
+                    print(f"얼굴 타임아웃 (카메라 {camera_id}, 트랙 {track_id}) - 로그아웃 필요")
             
-            # 이전에 얼굴이 없었다면 새로운 얼굴 감지
-            if not self.face_state.has_face:
-                self.face_state.has_face = True
-                self.face_state.last_seen = current_time
-                self.face_state.bbox = bbox
-                self.face_state.search_performed = False
-                
-                print("새로운 얼굴 감지됨 - DB 검색 필요")
-                return True
+            primary = primary_track_id if primary_track_id in seen else session.primary_track_id
+            if primary not in states:
+                primary = None
             
-            # 기존 얼굴이 계속 있는 경우
-            self.face_state.last_seen = current_time
-            self.face_state.bbox = bbox
-            return False
+            pending_registration = session.pending_registration
+            if pending_registration is not None and pending_registration["track_id"] not in seen:
+                # 등록 대상 얼굴이 화면에서 사라지면 즉시 취소 (다른 손님 얼굴로 넘어가지 않음)
+                print(f"등록 대상 얼굴이 사라져 등록 취소: {pending_registration['user_id']} (카메라 {camera_id})")
+                pending_registration = None
+            
+            return self._publish(session, faces=states, primary_track_id=primary,
+                                 pending_registration=pending_registration)
     
-    def update_no_face_detected(self) -> bool:
+    def update_face_detected(self, bbox: tuple, track_id: Optional[int] = None, camera_id: int = 0) -> bool:
+        """
+        얼굴이 감지되었을 때 상태를 업데이트합니다 (해당 얼굴을 카메라의 주 얼굴로 설정).
+        
+        Args:
+            bbox (tuple): 얼굴 바운딩 박스 좌표
+            track_id (Optional[int]): 트래커가 부여한 트랙 ID (바뀌면 다른 사람으로 간주)
+            camera_id (int): 카메라 ID
+        
+        Returns:
+            bool: 새로운 얼굴이 감지되었으면 True (DB 검색 필요)
+        """
+        is_new = track_id not in self.get_snapshot(camera_id).faces
+        self.update_faces(camera_id, [(track_id, bbox)], primary_track_id=track_id)
+        return is_new
+    
+    def update_no_face_detected(self, camera_id: int = 0) -> bool:
         """
         얼굴이 감지되지 않았을 때 상태를 업데이트합니다.
         
+        Args:
+            camera_id (int): 카메라 ID
+        
         Returns:
-            bool: 로그아웃이 필요하면 True
+            bool: 주 얼굴의 로그아웃이 필요하면 True
         """
-        with self.lock:
-            current_time = time.time()
-            
-            # 얼굴이 있었는데 없어진 경우
-            if self.face_state.has_face:
-                # 타임아웃 체크
-                if current_time - self.face_state.last_seen >= self.face_timeout:
-                    self.reset_face_state()
-                    print("얼굴 타임아웃 - 로그아웃 필요")
-                    return True
-            
-            return False
+        had_face = self.get_snapshot(camera_id).primary_face is not None
+        return had_face and self.update_faces(camera_id, []).primary_face is None
     
-    def set_recognized_user(self, user_id: str):
+    def _update_face(self, camera_id: int, track_id: Optional[int], **changes) -> Optional[FaceState]:
+        """
+        트랙의 얼굴 상태를 변경합니다. 트랙 ID가 없으면 주 얼굴을 변경합니다.
+        
+        Returns:
+            Optional[FaceState]: 변경 전 상태 (이미 타임아웃된 트랙이면 None)
+        """
+        with self._camera_lock(camera_id):
+            session = self.get_snapshot(camera_id)
+            if track_id is None:
+                track_id = session.primary_track_id
+            state = session.faces.get(track_id)
+            if state is None:
+                # 비동기 인식 결과가 이미 화면을 떠난 트랙의 것
+                return None
+            states = dict(session.faces)
+            states[track_id] = replace(state, **changes)
+            self._publish(session, faces=states)
+            return state
+    
+    def set_recognized_user(self, user_id: str, track_id: Optional[int] = None,
+                            confidence: Optional[float] = None, camera_id: int = 0):
         """
         인식된 사용자 정보를 설정합니다.
         
         Args:
             user_id (str): 인식된 사용자 ID
+            track_id (Optional[int]): 인식에 사용된 얼굴 트랙 ID (없으면 주 얼굴, 타임아웃된 트랙이면 무시)
+            confidence (Optional[float]): 신원 투표의 확정 신뢰도
+            camera_id (int): 카메라 ID
         """
-        with self.lock:
-            self.face_state.user_id = user_id
-            self.face_state.is_recognized = True
-            self.face_state.search_performed = True
-            print(f"사용자 인식됨: {user_id}")
+        previous = self._update_face(camera_id, track_id, user_id=user_id, is_recognized=True,
+                                     search_performed=True, confidence=confidence)
+        if previous is not None and (not previous.is_recognized or previous.user_id != user_id):
+            print(f"사용자 인식됨: {user_id} (카메라 {camera_id}, 트랙 {previous.track_id})")
     
-    def set_unknown_user(self):
+    def set_unknown_user(self, track_id: Optional[int] = None, confidence: Optional[float] = None,
+                         camera_id: int = 0):
         """
         알 수 없는 사용자로 설정합니다.
+        
+        Args:
+            track_id (Optional[int]): 검색에 사용된 얼굴 트랙 ID (없으면 주 얼굴, 타임아웃된 트랙이면 무시)
+            confidence (Optional[float]): 신원 투표의 확정 신뢰도
+            camera_id (int): 카메라 ID
         """
-        with self.lock:
-            self.face_state.user_id = None
-            self.face_state.is_recognized = False
-            self.face_state.search_performed = True
-            print("알 수 없는 사용자로 설정됨")
+        previous = self._update_face(camera_id, track_id, user_id=None, is_recognized=False,
+                                     search_performed=True, confidence=confidence)
+        if previous is not None and (previous.is_recognized or not previous.search_performed):
+            print(f"알 수 없는 사용자로 설정됨 (카메라 {camera_id}, 트랙 {previous.track_id})")
     
-    def should_perform_search(self) -> bool:
+    def should_perform_search(self, camera_id: int = 0, track_id: Optional[int] = None) -> bool:
         """
         DB 검색을 수행해야 하는지 확인합니다.
         
+        Args:
+            camera_id (int): 카메라 ID
+            track_id (Optional[int]): 트랙 ID (없으면 주 얼굴)
+        
         Returns:
             bool: 검색이 필요하면 True
         """
-        with self.lock:
-            return (self.face_state.has_face and 
-                   not self.face_state.search_performed)
+        session = self.get_snapshot(camera_id)
+        state = session.primary_face if track_id is None else session.faces.get(track_id)
+        return state is not None and not state.search_performed
+    
+    def get_face_state(self, camera_id: int, track_id: Optional[int]) -> Optional[FaceState]:
+        """(카메라, 트랙)의 얼굴 상태를 반환합니다."""
+        return self.get_snapshot(camera_id).faces.get(track_id)
     
-    def get_current_face_info(self) -> Dict[str, Any]:
+    def get_current_face_info(self, camera_id: int = 0) -> Dict[str, Any]:
         """
-        현재 얼굴 상태 정보를 반환합니다.
+        카메라의 주 얼굴 상태 정보를 반환합니다.
+        
+        Args:
+            camera_id (int): 카메라 ID
         
         Returns:
             Dict: 얼굴 상태 정보
         """
-        with self.lock:
-            return {
-                "has_face": self.face_state.has_face,
-                "user_id": self.face_state.user_id,
-                "is_recognized": self.face_state.is_recognized,
-                "search_performed": self.face_state.search_performed,
-                "bbox": self.face_state.bbox,
-                "time_since_last_seen": time.time() - self.face_state.last_seen if self.face_state.has_face else None
-            }
+        state = self.get_snapshot(camera_id).primary_face
+        return (state or FaceState(camera_id=camera_id)).to_dict()
     
-    def get_face_bbox(self) -> Optional[tuple]:
+    def get_face_bbox(self, camera_id: int = 0) -> Optional[tuple]:
         """
-        현재 얼굴의 바운딩 박스를 반환합니다.
+        카메라의 주 얼굴 바운딩 박스를 반환합니다.
+        
+        Args:
+            camera_id (int): 카메라 ID
         
         Returns:
             Optional[tuple]: 바운딩 박스 좌표 또는 None
         """
-        with self.lock:
-            return self.face_state.bbox
+        state = self.get_snapshot(camera_id).primary_face
+        return state.bbox if state is not None else None
     
-    def get_current_user_id(self) -> Optional[str]:
+    def get_current_user_id(self, camera_id: int = 0) -> Optional[str]:
         """
-        현재 인식된 사용자 ID를 반환합니다.
+        카메라의 주 얼굴로 인식된 사용자 ID를 반환합니다.
+        
+        Args:
+            camera_id (int): 카메라 ID
         
         Returns:
             Optional[str]: 사용자 ID 또는 None
         """
-        with self.lock:
-            return self.face_state.user_id if self.face_state.is_recognized else None
+        state = self.get_snapshot(camera_id).primary_face
+        return state.user_id if state is not None and state.is_recognized else None
+    
+    def get_recognized_users(self, camera_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        현재 인식된 모든 사용자를 반환합니다.
+        
+        Args:
+            camera_id (Optional[int]): 카메라 ID (None이면 모든 카메라)
+        
+        Returns:
+            List[Dict]: (카메라, 트랙)별 인식된 얼굴 상태
+        """
+        sessions = self.get_snapshots() if camera_id is None else [self.get_snapshot(camera_id)]
+        now = time.time()
+        return [state.to_dict(now) for session in sessions for state in session.recognized_faces()]
     
-    def reset_face_state(self):
+    def reset_face_state(self, camera_id: Optional[int] = None):
         """
         얼굴 상태를 초기화합니다.
+        
+        Args:
+            camera_id (Optional[int]): 카메라 ID (None이면 모든 카메라)
         """
-        with self.lock:
-            self.face_state = FaceState()
-            self.pending_user_registration = None
-            print("얼굴 상태 초기화됨")
+        camera_ids = list(self.sessions) if camera_id is None else [camera_id]
+        for cid in camera_ids:
+            with self._camera_lock(cid):
+                self._publish(self.get_snapshot(cid), faces={}, primary_track_id=None,
+                              pending_registration=None)
+        print("얼굴 상태 초기화됨" if camera_id is None else f"얼굴 상태 초기화됨 (카메라 {camera_id})")
     
-    def set_pending_registration(self, user_id: str, bbox: tuple):
+    def set_pending_registration(self, user_id: str, bbox: tuple, camera_id: int = 0,
+                                 track_id: Optional[int] = None):
         """
         사용자 등록 대기 상태를 설정합니다.
         
+        등록은 요청 시점의 트랙에서만 수집하며, 그 트랙이 화면에서 사라지면 취소됩니다.
+        
         Args:
             user_id (str): 등록할 사용자 ID
             bbox (tuple): 얼굴 바운딩 박스
+            camera_id (int): 등록할 얼굴이 보이는 카메라 ID
+            track_id (Optional[int]): 등록할 얼굴의 트랙 ID (없으면 현재 주 얼굴)
         """
-        with self.lock:
-            self.pending_user_registration = {
+        with self._camera_lock(camera_id):
+            session = self.get_snapshot(camera_id)
+            if track_id is None:
+                track_id = session.primary_track_id
+            self._publish(session, pending_registration={
                 "user_id": user_id,
                 "bbox": bbox,
+                "track_id": track_id,
                 "timestamp": time.time()
-            }
-            print(f"사용자 등록 대기 중: {user_id}")
+            })
+        print(f"사용자 등록 대기 중: {user_id} (카메라 {camera_id}, 트랙 {track_id})")
     
-    def get_pending_registration(self) -> Optional[Dict]:
+    def get_pending_registration(self, camera_id: int = 0) -> Optional[Dict]:
         """
         대기 중인 사용자 등록 정보를 반환합니다.
         
+        Args:
+            camera_id (int): 카메라 ID
+        
         Returns:
             Optional[Dict]: 등록 정보 또는 None
         """
-        with self.lock:
-            return self.pending_user_registration
+        return self.get_snapshot(camera_id).pending_registration
     
-    def clear_pending_registration(self):
+    def clear_pending_registration(self, camera_id: int = 0, track_id: Optional[int] = None):
         """
         대기 중인 사용자 등록 정보를 삭제합니다.
+        
+        Args:
+            camera_id (int): 카메라 ID
+            track_id (Optional[int]): 주어지면 이 트랙의 등록 요청일 때만 삭제 (그 사이 들어온 새 요청은 유지)
         """
-        with self.lock:
-            self.pending_user_registration = None
+        with self._camera_lock(camera_id):
+            session = self.get_snapshot(camera_id)
+            pending_registration = session.pending_registration
+            if pending_registration is not None and (track_id is None or pending_registration["track_id"] == track_id):
+                self._publish(session, pending_registration=None)
     
     def get_session_stats(self) -> Dict[str, Any]:
         """
         세션 통계 정보를 반환합니다.
         
         Returns:
-            Dict: 세션 통계
+            Dict: 세션 통계 (current_state/pending_registration은 기본 카메라 기준)
         """
-        with self.lock:
-            current_time = time.time()
-            return {
-                "face_timeout": self.face_timeout,
-                "current_state": {
-                    "has_face": self.face_state.has_face,
-                    "user_id": self.face_state.user_id,
-                    "is_recognized": self.face_state.is_recognized,
-                    "time_since_last_seen": current_time - self.face_state.last_seen if self.face_state.has_face else None
-                },
-                "pending_registration": self.pending_user_registration is not None,
-                "uptime": current_time
-            }
+        current_time = time.time()
+        sessions = self.get_snapshots()
+        default_session = self.get_snapshot(0)
+        primary = default_session.primary_face or FaceState()
+        return {
+            "face_timeout": self.face_timeout,
+            "current_state": {
+                "has_face": primary.has_face,
+                "user_id": primary.user_id,
+                "is_recognized": primary.is_recognized,
+                "time_since_last_seen": current_time - primary.last_seen if primary.has_face else None
+            },
+            "pending_registration": default_session.pending_registration is not None,
+            "active_faces": sum(len(session.faces) for session in sessions),
+            "recognized_users": sum(len(session.recognized_faces()) for session in sessions),
+            "cameras": {
+                str(session.camera_id): {
+                    "version": session.version,
+                    "faces": [state.to_dict(current_time) for state in session.faces.values()],
+                    "primary_track_id": session.primary_track_id,
+                    "pending_registration": session.pending_registration is not None
+                }
+                for session in sessions
+            },
+            "uptime": current_time
+        }
 
 # 전역 인스턴스
-session_manager = SessionManager(face_timeout=5.0)
\ No newline at end of file
+session_manager = SessionManager(face_timeout=config.SESSION_FACE_TIMEOUT)
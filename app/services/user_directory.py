@@ -0,0 +1,89 @@
+import base64
+import bisect
+import threading
+from typing import List, Tuple, Optional, Iterable
+
+def encode_cursor(user_id: str) -> str:
+    """마지막으로 반환한 사용자 ID를 URL에 안전한 커서 문자열로 바꿉니다."""
+    return base64.urlsafe_b64encode(user_id.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> str:
+    """커서 문자열을 사용자 ID로 되돌립니다 (형식이 잘못되면 ValueError)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+    except Exception as e:
+        raise ValueError(f"잘못된 커서입니다: {cursor}") from e
+
+class UserDirectory:
+    """
+    정렬된 사용자 ID 목록
+
+    사용자 추가/삭제 시 이진 탐색으로 위치를 유지하므로, 사용자 수는 O(1),
+    접두사 검색과 커서 기반 페이지 조회는 O(log N + 페이지 크기)로 처리합니다.
+    """
+
+    def __init__(self):
+        self.user_ids: List[str] = []
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def rebuild(self, user_ids: Iterable[str]):
+        """목록을 다시 만듭니다."""
+        with self.lock:
+            self.user_ids = sorted(set(user_ids))
+
+    def add(self, user_id: str):
+        with self.lock:
+            index = bisect.bisect_left(self.user_ids, user_id)
+            if index == len(self.user_ids) or self.user_ids[index] != user_id:
+                self.user_ids.insert(index, user_id)
+
+    def remove(self, user_id: str):
+        with self.lock:
+            index = bisect.bisect_left(self.user_ids, user_id)
+            if index < len(self.user_ids) and self.user_ids[index] == user_id:
+                del self.user_ids[index]
+
+    def clear(self):
+        with self.lock:
+            self.user_ids = []
+
+    def _prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """접두사로 시작하는 ID의 [시작, 끝) 위치 (lock 보유 상태에서 호출)."""
+        if not prefix:
+            return 0, len(self.user_ids)
+        start = bisect.bisect_left(self.user_ids, prefix)
+        # 접두사 뒤에 올 수 있는 가장 큰 문자를 붙여 범위 끝을 찾음
+        end = bisect.bisect_left(self.user_ids, prefix + "\U0010ffff", lo=start)
+        return start, end
+
+    def count(self, prefix: str = "") -> int:
+        """접두사에 해당하는 사용자 수를 반환합니다."""
+        with self.lock:
+            start, end = self._prefix_range(prefix)
+            return end - start
+
+    def page(self, limit: int = 50, cursor: Optional[str] = None, prefix: str = "") -> Tuple[List[str], Optional[str]]:
+        """
+        사용자 ID 한 페이지를 반환합니다.
+
+        Args:
+            limit (int): 페이지 크기
+            cursor (Optional[str]): 이전 페이지의 next_cursor (없으면 처음부터)
+            prefix (str): 사용자 ID 접두사
+
+        Returns:
+            Tuple[List[str], Optional[str]]: (사용자 ID 목록, 다음 페이지 커서 또는 None)
+        """
+        after = decode_cursor(cursor) if cursor else None
+        with self.lock:
+            start, end = self._prefix_range(prefix)
+            if after is not None:
+                start = max(start, bisect.bisect_right(self.user_ids, after))
+            stop = min(end, start + max(1, limit))
+            page = self.user_ids[start:stop]
+            next_cursor = encode_cursor(page[-1]) if page and stop < end else None
+            return page, next_cursor
@@ -0,0 +1,388 @@
+import threading
+import numpy as np
+from typing import List, Tuple, Optional, Dict, Any, Sequence
+from .gallery_index import GalleryIndex
+
+class VectorIndex:
+    """
+    코사인 유사도 top-k 검색 인덱스의 공통 인터페이스
+
+    모든 백엔드는 L2 정규화된 벡터를 받아 (ID, 유사도) 목록을 돌려주며,
+    build로 전체를 다시 만들고 upsert/remove로 하나씩 갱신합니다.
+    """
+
+    name = "base"
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    @staticmethod
+    def _normalize_rows(vectors) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def build(self, ids: Sequence[str], vectors: np.ndarray):
+        """인덱스를 주어진 ID/벡터로 다시 만듭니다."""
+        raise NotImplementedError
+
+    def upsert(self, item_id: str, vector: np.ndarray):
+        """벡터를 추가하거나, 이미 있는 ID면 교체합니다."""
+        raise NotImplementedError
+
+    def remove(self, item_id: str) -> bool:
+        """ID를 제거합니다 (없으면 False)."""
+        raise NotImplementedError
+
+    def clear(self):
+        self.build([], np.zeros((0, self.dim), dtype=np.float32))
+
+    def search(self, query: np.ndarray, top_k: int = 1) -> List[Tuple[str, float]]:
+        """유사도가 높은 순으로 top-k를 반환합니다."""
+        raise NotImplementedError
+
+    def memory_bytes(self) -> int:
+        """검색 구조가 차지하는 메모리 (ID 문자열 제외)"""
+        raise NotImplementedError
+
+    def get_info(self) -> Dict[str, Any]:
+        return {"backend": self.name, "size": len(self), "dim": self.dim, "memory_bytes": int(self.memory_bytes())}
+
+class BruteForceIndex(VectorIndex):
+    """NumPy 행렬-벡터 곱 전수 검색 (float32는 정확한 기준선, float16/int8 저장 가능)"""
+
+    name = "bruteforce"
+
+    def __init__(self, dim: int = 512, storage: str = "float32"):
+        super().__init__(dim)
+        self.index = GalleryIndex(dim, storage=storage)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def build(self, ids: Sequence[str], vectors: np.ndarray):
+        self.index.load(ids, vectors)
+
+    def upsert(self, item_id: str, vector: np.ndarray):
+        self.index.upsert(item_id, vector)
+
+    def remove(self, item_id: str) -> bool:
+        return self.index.remove(item_id)
+
+    def search(self, query: np.ndarray, top_k: int = 1) -> List[Tuple[str, float]]:
+        return self.index.search(query, top_k)
+
+    def memory_bytes(self) -> int:
+        return self.index.memory_bytes()
+
+class ChromaHnswIndex(VectorIndex):
+    """ChromaDB 메모리 컬렉션의 HNSW 그래프 검색 (chromadb 필요)"""
+
+    name = "chroma"
+
+    def __init__(self, dim: int = 512, m: int = 16, construction_ef: int = 100, search_ef: int = 64,
+                 batch_size: int = 5000):
+        """
+        Args:
+            dim (int): 임베딩 차원
+            m (int): HNSW 노드당 연결 수
+            construction_ef (int): 그래프 생성 시 탐색 폭
+            search_ef (int): 검색 시 탐색 폭 (클수록 정확하고 느림)
+            batch_size (int): build 시 한 번에 넣을 벡터 수
+        """
+        super().__init__(dim)
+        import chromadb
+        self.m = m
+        self.construction_ef = construction_ef
+        self.search_ef = search_ef
+        self.batch_size = batch_size
+        self.client = chromadb.EphemeralClient()
+        self.collection_name = f"vector_index_{id(self)}"
+        self.collection = None
+        self._create_collection()
+
+    def _create_collection(self):
+        if self.collection is not None:
+            self.client.delete_collection(self.collection_name)
+        self.collection = self.client.create_collection(
+            name=self.collection_name,
+            metadata={"hnsw:space": "cosine", "hnsw:M": self.m,
+                      "hnsw:construction_ef": self.construction_ef, "hnsw:search_ef": self.search_ef}
+        )
+
+    def __len__(self) -> int:
+        return self.collection.count()
+
+    def build(self, ids: Sequence[str], vectors: np.ndarray):
+        self._create_collection()
+        vectors = self._normalize_rows(vectors).reshape(-1, self.dim)
+        ids = list(ids)
+        for start in range(0, len(ids), self.batch_size):
+            self.collection.add(ids=ids[start:start + self.batch_size],
+                                embeddings=vectors[start:start + self.batch_size].tolist())
+
+    def upsert(self, item_id: str, vector: np.ndarray):
+        self.collection.upsert(ids=[item_id], embeddings=self._normalize_rows(vector.reshape(1, -1)).tolist())
+
+    def remove(self, item_id: str) -> bool:
+        if not self.collection.get(ids=[item_id], include=[])["ids"]:
+            return False
+        self.collection.delete(ids=[item_id])
+        return True
+
+    def search(self, query: np.ndarray, top_k: int = 1) -> List[Tuple[str, float]]:
+        size = len(self)
+        if size == 0:
+            return []
+        results = self.collection.query(
+            query_embeddings=self._normalize_rows(np.asarray(query).reshape(1, -1)).tolist(),
+            n_results=min(top_k, size), include=["distances"]
+        )
+        # 코사인 거리 -> 유사도
+        return [(item_id, 1.0 - float(distance))
+                for item_id, distance in zip(results["ids"][0], results["distances"][0])]
+
+    def memory_bytes(self) -> int:
+        # Chroma는 크기를 노출하지 않으므로 hnswlib 구조로 추정 (float32 벡터 + 레벨 0 이웃 2M개)
+        return len(self) * (self.dim * 4 + self.m * 2 * 4)
+
+def _assign(vectors: np.ndarray, centers: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
+    """각 벡터에 가장 가까운(L2) 중심 번호를 반환합니다."""
+    half_norms = 0.5 * np.einsum("ij,ij->i", centers, centers)
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), chunk_size):
+        scores = vectors[start:start + chunk_size] @ centers.T - half_norms
+        labels[start:start + chunk_size] = scores.argmax(axis=1)
+    return labels
+
+def _kmeans(vectors: np.ndarray, k: int, iterations: int, rng: np.random.Generator) -> np.ndarray:
+    """Lloyd k-means (빈 군집은 임의의 점으로 다시 시작)"""
+    k = min(k, len(vectors))
+    centers = vectors[rng.choice(len(vectors), k, replace=False)].copy()
+    for _ in range(iterations):
+        labels = _assign(vectors, centers)
+        counts = np.bincount(labels, minlength=k)
+        empty = counts == 0
+        # 군집별 합: 라벨 순으로 정렬한 뒤 구간 합 (np.add.at보다 훨씬 빠름)
+        order = np.argsort(labels, kind="stable")
+        starts = np.searchsorted(labels[order], np.arange(k))
+        sums = np.add.reduceat(vectors[order], starts[~empty], axis=0)
+        centers[~empty] = sums / counts[~empty, None]
+        if empty.any():
+            centers[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+    return centers
+
+class IvfPqIndex(VectorIndex):
+    """
+    IVF + PQ 압축 인덱스
+
+    k-means 역색인(nlist개 목록)으로 후보 목록 nprobe개만 보고, 잔차는 subvectors개 부분공간의
+    8비트 코드로 압축해 벡터당 subvectors 바이트만 저장합니다. 유사도는 질의와 코드북의
+    내적표(ADC)로 근사하므로 정확한 값이 필요하면 템플릿 재정렬 등 후단에서 보정합니다.
+    학습에 필요한 벡터 수(min_train_size)가 모이기 전에는 전수 검색으로 동작합니다.
+    """
+
+    name = "ivfpq"
+
+    def __init__(self, dim: int = 512, nlist: Optional[int] = None, subvectors: int = 64, nprobe: int = 8,
+                 min_train_size: int = 1024, max_train_size: int = 65536, iterations: int = 10, seed: int = 0):
+        """
+        Args:
+            dim (int): 임베딩 차원
+            nlist (Optional[int]): 역색인 목록 수 (기본값: sqrt(N))
+            subvectors (int): PQ 부분공간 수 (벡터당 바이트 수, dim의 약수)
+            nprobe (int): 검색 시 확인할 목록 수
+            min_train_size (int): 학습을 시작할 최소 벡터 수
+            max_train_size (int): 학습에 사용할 최대 표본 수
+            iterations (int): k-means 반복 횟수
+            seed (int): 학습 시드
+        """
+        super().__init__(dim)
+        if dim % subvectors != 0:
+            raise ValueError(f"subvectors({subvectors})는 dim({dim})의 약수여야 합니다.")
+        self.requested_nlist = nlist
+        self.subvectors = subvectors
+        self.sub_dim = dim // subvectors
+        self.nprobe = nprobe
+        self.min_train_size = max(256, min_train_size)
+        self.max_train_size = max_train_size
+        self.iterations = iterations
+        self.rng = np.random.default_rng(seed)
+        self.lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.coarse: Optional[np.ndarray] = None  # (nlist, dim)
+        self.codebooks: Optional[np.ndarray] = None  # (subvectors, 256, sub_dim)
+        # 행 수는 len(self.ids), 배열은 용량을 두 배씩 늘려 추가 시 전체 복사를 피함
+        self.codes = np.zeros((0, self.subvectors), dtype=np.uint8)
+        self.lists = np.zeros(0, dtype=np.int32)  # 행 -> 목록 번호
+        self.members: List[List[int]] = []  # 목록 번호 -> 행 목록
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.raw = GalleryIndex(self.dim)  # 학습 전 버퍼
+
+    @property
+    def is_trained(self) -> bool:
+        return self.coarse is not None
+
+    def __len__(self) -> int:
+        return len(self.ids) if self.is_trained else len(self.raw)
+
+    def _train(self, vectors: np.ndarray):
+        nlist = self.requested_nlist or max(1, int(np.sqrt(len(vectors))))
+        sample = vectors
+        if len(vectors) > self.max_train_size:
+            sample = vectors[self.rng.choice(len(vectors), self.max_train_size, replace=False)]
+        self.coarse = _kmeans(sample, nlist, self.iterations, self.rng)
+        residuals = sample - self.coarse[_assign(sample, self.coarse)]
+        self.codebooks = np.stack([
+            _kmeans(np.ascontiguousarray(residuals[:, j * self.sub_dim:(j + 1) * self.sub_dim]), 256,
+                    self.iterations, self.rng)
+            for j in range(self.subvectors)
+        ]).astype(np.float32)
+        self.members = [[] for _ in range(len(self.coarse))]
+
+    def _ensure_capacity(self, size: int):
+        if size <= len(self.codes):
+            return
+        capacity = max(1, len(self.codes))
+        while capacity < size:
+            capacity *= 2
+        grown_codes = np.zeros((capacity, self.subvectors), dtype=np.uint8)
+        grown_lists = np.zeros(capacity, dtype=np.int32)
+        grown_codes[:len(self.ids)] = self.codes[:len(self.ids)]
+        grown_lists[:len(self.ids)] = self.lists[:len(self.ids)]
+        self.codes, self.lists = grown_codes, grown_lists
+
+    def _encode(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        lists = _assign(vectors, self.coarse)
+        residuals = vectors - self.coarse[lists]
+        codes = np.empty((len(vectors), self.subvectors), dtype=np.uint8)
+        for j in range(self.subvectors):
+            codes[:, j] = _assign(np.ascontiguousarray(residuals[:, j * self.sub_dim:(j + 1) * self.sub_dim]),
+                                  self.codebooks[j])
+        return lists, codes
+
+    def build(self, ids: Sequence[str], vectors: np.ndarray):
+        vectors = self._normalize_rows(vectors).reshape(-1, self.dim)
+        with self.lock:
+            self._reset()
+            if len(vectors) < self.min_train_size:
+                self.raw.load(ids, vectors)
+                return
+            self._train(vectors)
+            self.lists, self.codes = self._encode(vectors)
+            self.ids = list(ids)
+            self.rows = {item_id: row for row, item_id in enumerate(self.ids)}
+            for row, list_id in enumerate(self.lists):
+                self.members[list_id].append(row)
+
+    def upsert(self, item_id: str, vector: np.ndarray):
+        vector = self._normalize_rows(np.asarray(vector).reshape(1, -1))
+        with self.lock:
+            if not self.is_trained:
+                self.raw.upsert(item_id, vector[0])
+                if len(self.raw) >= self.min_train_size:
+                    ids, matrix = self.raw.export()
+                    self.build(ids, matrix)
+                return
+
+            self.remove(item_id)
+            lists, codes = self._encode(vector)
+            row = len(self.ids)
+            self._ensure_capacity(row + 1)
+            self.lists[row] = lists[0]
+            self.codes[row] = codes[0]
+            self.ids.append(item_id)
+            self.rows[item_id] = row
+            self.members[int(lists[0])].append(row)
+
+    def remove(self, item_id: str) -> bool:
+        with self.lock:
+            if not self.is_trained:
+                return self.raw.remove(item_id)
+
+            row = self.rows.pop(item_id, None)
+            if row is None:
+                return False
+            self.members[int(self.lists[row])].remove(row)
+
+            # 마지막 행을 빈자리로 옮김
+            last = len(self.ids) - 1
+            if row != last:
+                moved_id = self.ids[last]
+                members = self.members[int(self.lists[last])]
+                members[members.index(last)] = row
+                self.ids[row] = moved_id
+                self.rows[moved_id] = row
+                self.lists[row] = self.lists[last]
+                self.codes[row] = self.codes[last]
+            self.ids.pop()
+            return True
+
+    def search(self, query: np.ndarray, top_k: int = 1) -> List[Tuple[str, float]]:
+        query = self._normalize_rows(np.asarray(query).reshape(1, -1))[0]
+        with self.lock:
+            if not self.is_trained:
+                return self.raw.search(query, top_k)
+            if not self.ids:
+                return []
+
+            coarse_scores = self.coarse @ query
+            probe = np.argsort(-coarse_scores)[:self.nprobe]
+            candidates = [np.asarray(self.members[list_id], dtype=np.int64) for list_id in probe]
+            candidates = np.concatenate(candidates) if candidates else np.zeros(0, dtype=np.int64)
+            if len(candidates) == 0:
+                return []
+
+            # 내적 = q.목록중심 + sum_j q_j.코드북_j[코드_j] (부분공간별 내적표 조회)
+            table = np.einsum("jkd,jd->jk", self.codebooks, query.reshape(self.subvectors, self.sub_dim))
+            scores = coarse_scores[self.lists[candidates]] + \
+                table[np.arange(self.subvectors), self.codes[candidates]].sum(axis=1)
+
+            k = min(top_k, len(candidates))
+            best = np.argpartition(-scores, k - 1)[:k] if k < len(candidates) else np.arange(len(candidates))
+            best = best[np.argsort(-scores[best])]
+            return [(self.ids[candidates[i]], float(scores[i])) for i in best]
+
+    def memory_bytes(self) -> int:
+        if not self.is_trained:
+            return self.raw.memory_bytes()
+        return self.codes.nbytes + self.lists.nbytes + self.coarse.nbytes + self.codebooks.nbytes
+
+    def get_info(self) -> Dict[str, Any]:
+        info = super().get_info()
+        info.update({
+            "trained": self.is_trained,
+            "nlist": len(self.coarse) if self.is_trained else None,
+            "nprobe": self.nprobe,
+            "subvectors": self.subvectors,
+            "bytes_per_vector": self.subvectors
+        })
+        return info
+
+INDEX_BACKENDS = {
+    "bruteforce": BruteForceIndex,
+    "chroma": ChromaHnswIndex,
+    "ivfpq": IvfPqIndex
+}
+
+def create_index(name: str, dim: int = 512, **kwargs) -> VectorIndex:
+    """
+    이름에 해당하는 검색 인덱스를 생성합니다.
+
+    Args:
+        name (str): "bruteforce", "chroma", "ivfpq" 중 하나
+        dim (int): 임베딩 차원
+        **kwargs: 백엔드별 설정 (예: nprobe, search_ef)
+
+    Returns:
+        VectorIndex: 생성된 인덱스
+    """
+    if name not in INDEX_BACKENDS:
+        raise ValueError(f"지원하지 않는 검색 인덱스입니다: {name} (가능: {', '.join(INDEX_BACKENDS)})")
+    return INDEX_BACKENDS[name](dim, **kwargs)
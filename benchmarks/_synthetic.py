@@ -0,0 +1,49 @@
+"""
+벤치마크/테스트 공용 합성 임베딩 생성기와 지연 시간 요약
+
+얼굴 임베딩처럼 군집 구조를 갖도록 사람 수보다 적은 "닮은꼴" 중심 주변에 벡터를 만들고,
+질의는 등록된 벡터에 잡음을 더해 같은 사람의 다른 프레임을 흉내 냅니다.
+"""
+import numpy as np
+
+CHUNK_ROWS = 65536  # 1M 규모 갤러리에서도 잡음 행렬을 한 번에 만들지 않도록 나눠서 생성
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def random_embeddings(rng: np.random.Generator, count: int, dim: int) -> np.ndarray:
+    """구면에 고르게 퍼진 정규화 벡터 (군집 없음)"""
+    return _normalize(rng.standard_normal((count, dim)).astype(np.float32))
+
+def synthetic_gallery(rng: np.random.Generator, count: int, dim: int, clusters: int, spread: float) -> np.ndarray:
+    """
+    닮은꼴 군집 주변의 정규화 벡터 갤러리를 만듭니다.
+
+    Args:
+        rng (np.random.Generator): 난수 생성기
+        count (int): 벡터 수
+        dim (int): 차원
+        clusters (int): 군집(닮은꼴) 수
+        spread (float): 군집 내 퍼짐 (벡터 노름 대비)
+
+    Returns:
+        np.ndarray: (count, dim) float32
+    """
+    centers = _normalize(rng.standard_normal((clusters, dim)).astype(np.float32))
+    vectors = np.empty((count, dim), dtype=np.float32)
+    for start in range(0, count, CHUNK_ROWS):
+        end = min(count, start + CHUNK_ROWS)
+        picks = centers[rng.integers(0, clusters, end - start)]
+        noise = rng.standard_normal((end - start, dim)).astype(np.float32) / np.sqrt(dim)
+        vectors[start:end] = _normalize(picks + spread * noise)
+    return vectors
+
+def make_queries(rng: np.random.Generator, gallery: np.ndarray, count: int, noise: float) -> np.ndarray:
+    """등록된 벡터에 잡음(벡터 노름 대비 크기)을 더한 정규화 질의"""
+    picks = gallery[rng.integers(0, len(gallery), count)]
+    return _normalize(picks + noise * rng.standard_normal(picks.shape).astype(np.float32) / np.sqrt(gallery.shape[1]))
+
+def percentiles(latencies, width: int = 8) -> str:
+    """초 단위 지연 시간 목록의 p50/p99 (ms) 문자열"""
+    values = np.array(latencies) * 1000
+    return f"p50 {np.percentile(values, 50):{width}.3f} ms  p99 {np.percentile(values, 99):{width}.3f} ms"
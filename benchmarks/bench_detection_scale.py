@@ -0,0 +1,80 @@
+"""
+탐지 해상도별 지연 시간 vs 재현율(recall) 벤치마크
+
+녹화된 영상의 프레임마다 원본 해상도 탐지 결과를 기준으로 삼고,
+축소 해상도 탐지 결과가 기준 박스를 얼마나 찾아내는지(IoU >= 임계값)와
+프레임당 탐지 시간을 비교합니다.
+
+사용 예:
+    python -m benchmarks.bench_detection_scale --path clip.mp4 --scales 480 320 240 160
+"""
+import argparse
+import time
+import numpy as np
+from app.services.frame_sources import create_frame_source
+from app.services.face_detection_service import FaceDetectionService
+from app.services.face_tracker import _iou_matrix
+
+def load_frames(source_type: str, path: str, max_frames: int):
+    """디코딩 시간이 측정에 섞이지 않도록 프레임을 미리 메모리에 읽어둡니다."""
+    source = create_frame_source(source_type, path=path, realtime=False, loop=False)
+    if not source.open():
+        raise SystemExit(f"프레임 소스를 열 수 없습니다: {path}")
+
+    frames = []
+    while len(frames) < max_frames:
+        success, frame = source.read()
+        if not success:
+            break
+        frames.append(frame.copy())
+    source.release()
+    return frames
+
+def detect_all(service: FaceDetectionService, frames):
+    results, latencies = [], []
+    for frame in frames:
+        t0 = time.perf_counter()
+        results.append(service.detect_faces(frame))
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return results, np.array(latencies)
+
+def recall(reference, candidate, iou_threshold: float) -> float:
+    matched, total = 0, 0
+    for ref_boxes, cand_boxes in zip(reference, candidate):
+        total += len(ref_boxes)
+        if ref_boxes and cand_boxes:
+            # 기준 박스마다 IoU가 임계값 이상인 후보가 하나라도 있으면 찾은 것으로 집계
+            ious = _iou_matrix(np.asarray(ref_boxes, dtype=np.float32), np.asarray(cand_boxes, dtype=np.float32))
+            matched += int((ious.max(axis=1) >= iou_threshold).sum())
+    return matched / total if total else 1.0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="탐지 해상도 벤치마크")
+    parser.add_argument("--path", required=True, help="녹화된 동영상 파일 또는 이미지 폴더")
+    parser.add_argument("--source", default="video", choices=["video", "images"])
+    parser.add_argument("--scales", type=int, nargs="+", default=[480, 320, 240, 160],
+                        help="탐지 입력 최대 변 길이 목록")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--iou", type=float, default=0.5)
+    args = parser.parse_args()
+
+    frames = load_frames(args.source, args.path, args.frames)
+    service = FaceDetectionService()
+
+    # 기준: 원본 해상도 탐지
+    service.set_detection_max_side(None)
+    detect_all(service, frames[:10])  # 워밍업
+    reference, base_latency = detect_all(service, frames)
+    faces = sum(len(boxes) for boxes in reference)
+    print(f"프레임 {len(frames)}개, 기준 얼굴 {faces}개")
+    print(f"{'max_side':>9} {'p50 ms':>8} {'p95 ms':>8} {'recall':>8}")
+    print(f"{'full':>9} {np.percentile(base_latency, 50):8.2f} {np.percentile(base_latency, 95):8.2f} {1.0:8.3f}")
+
+    for max_side in args.scales:
+        service.set_detection_max_side(max_side)
+        detect_all(service, frames[:10])
+        results, latency = detect_all(service, frames)
+        print(f"{max_side:>9} {np.percentile(latency, 50):8.2f} {np.percentile(latency, 95):8.2f} "
+              f"{recall(reference, results, args.iou):8.3f}")
+
+    service.close()
@@ -0,0 +1,71 @@
+"""
+갤러리 임베딩 저장 형식별 recall@1 / 메모리 / 지연 시간 비교 (float32 vs float16 vs int8)
+
+같은 갤러리를 각 저장 형식의 GalleryIndex에 넣고, float32 전수 검색의 top-1과 일치하는 비율(recall@1),
+최대 유사도 오차, 메모리 사용량, p50/p99 검색 지연 시간을 보고합니다.
+recall@1이 --min-recall 미만인 형식이 있으면 종료 코드 1로 끝나므로 배포 전 점검에 사용할 수 있습니다.
+
+픽스처는 (N, dim) 임베딩 .npy(예: 스냅샷의 templates.npy) 또는 합성 군집 갤러리를 사용합니다.
+
+사용 예:
+    python -m benchmarks.bench_embedding_storage --size 10000 --queries 1000
+    python -m benchmarks.bench_embedding_storage --fixtures ./faces_snapshot/v000003/templates.npy
+"""
+import argparse
+import sys
+import time
+import numpy as np
+from app.services.gallery_index import GalleryIndex, STORAGE_DTYPES
+from benchmarks._synthetic import synthetic_gallery, make_queries, percentiles
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="임베딩 저장 형식 비교")
+    parser.add_argument("--fixtures", default=None, help="(N, dim) 임베딩 .npy 파일")
+    parser.add_argument("--size", type=int, default=10000, help="합성 갤러리 크기 (픽스처가 없을 때)")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--noise", type=float, default=0.6, help="질의 잡음 크기 (벡터 노름 대비)")
+    parser.add_argument("--spread", type=float, default=0.6, help="군집 내 퍼짐 (벡터 노름 대비)")
+    parser.add_argument("--min-recall", type=float, default=0.999, help="float32 대비 최소 recall@1")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    if args.fixtures:
+        gallery = np.load(args.fixtures).astype(np.float32)
+        gallery /= np.maximum(np.linalg.norm(gallery, axis=1, keepdims=True), 1e-12)
+    else:
+        gallery = synthetic_gallery(rng, args.size, args.dim, clusters=max(1, args.size // 20), spread=args.spread)
+    ids = [f"user_{i}" for i in range(len(gallery))]
+    queries = make_queries(rng, gallery, args.queries, args.noise)
+
+    indexes = {}
+    for storage in STORAGE_DTYPES:
+        index = GalleryIndex(dim=gallery.shape[1], initial_capacity=len(gallery), storage=storage)
+        index.load(ids, gallery)
+        indexes[storage] = index
+
+    reference = [indexes["float32"].search(query, 1)[0] for query in queries]
+
+    print(f"갤러리 {len(gallery)}개, 질의 {len(queries)}개")
+    failed = False
+    for storage, index in indexes.items():
+        latencies, hits, max_error = [], 0, 0.0
+        for query, (expected_id, expected_score) in zip(queries, reference):
+            t0 = time.perf_counter()
+            top_id, score = index.search(query, 1)[0]
+            latencies.append(time.perf_counter() - t0)
+            hits += top_id == expected_id
+            if top_id == expected_id:
+                max_error = max(max_error, abs(score - expected_score))
+
+        recall = hits / len(queries)
+        info = index.get_info()
+        print(f"  {storage:<8} recall@1 {recall:.4f} | 최대 유사도 오차 {max_error:.5f} | "
+              f"메모리 {info['memory_bytes'] / 1024 / 1024:8.2f} MB ({info['bytes_per_vector']} B/벡터) | "
+              f"{percentiles(latencies, width=7)}")
+        failed |= recall < args.min_recall
+
+    if failed:
+        print(f"recall@1이 기준({args.min_recall}) 미만인 저장 형식이 있습니다.")
+        sys.exit(1)
@@ -0,0 +1,65 @@
+"""
+캡처 루프의 프레임당 메모리 할당량 측정 (tracemalloc)
+
+기존 방식(매 프레임 새 배열 + 복사본 그리기)과 사전 할당 버퍼 방식의
+정상 상태(steady-state) 프레임당 할당량을 비교합니다.
+JPEG 인코딩 결과는 구독자에게 넘겨야 하므로 두 방식 모두 측정에서 제외합니다.
+
+사용 예:
+    python -m benchmarks.bench_frame_alloc --frames 200
+"""
+import argparse
+import tracemalloc
+import cv2
+from app.services.frame_sources import create_frame_source
+from app.services.frame_buffers import FrameBufferRing
+from app.services.face_detection_service import face_detection_service
+
+def legacy_step(source, state):
+    success, frame = source.read()
+    frame = cv2.flip(frame, 1)
+    bboxes = face_detection_service.detect_faces(frame)
+    return face_detection_service.draw_face_boxes(frame, bboxes)
+
+def buffered_step(source, state):
+    capture_ring, output_ring, shape = state["capture"], state["output"], state["shape"]
+    success, raw = source.read(capture_ring.acquire(shape))
+    frame = cv2.flip(raw, 1, dst=output_ring.acquire(shape))
+    bboxes = face_detection_service.detect_faces(frame)
+    return face_detection_service.draw_face_boxes(frame, bboxes, inplace=True)
+
+def measure(step, frames: int, warmup: int) -> float:
+    source = create_frame_source("synthetic", realtime=False, num_faces=2)
+    source.open()
+    state = {
+        "capture": FrameBufferRing(size=2),
+        "output": FrameBufferRing(size=3),
+        "shape": (source.height, source.width, 3)
+    }
+
+    for _ in range(warmup):
+        step(source, state)
+
+    tracemalloc.start()
+    total = 0
+    for _ in range(frames):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        step(source, state)
+        _, peak = tracemalloc.get_traced_memory()
+        total += peak - before
+    tracemalloc.stop()
+    source.release()
+
+    return total / frames
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="프레임당 할당량 벤치마크")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    args = parser.parse_args()
+
+    legacy = measure(legacy_step, args.frames, args.warmup)
+    buffered = measure(buffered_step, args.frames, args.warmup)
+    print(f"기존 방식:      프레임당 {legacy / 1024:.1f} KiB 할당")
+    print(f"사전 할당 버퍼: 프레임당 {buffered / 1024:.1f} KiB 할당")
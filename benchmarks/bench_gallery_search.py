@@ -0,0 +1,65 @@
+"""
+갤러리 크기별 얼굴 검색 지연 시간 벤치마크 (ChromaDB 쿼리 vs 메모리 인덱스)
+
+임시 ChromaDB 컬렉션과 GalleryIndex에 같은 무작위 정규화 임베딩을 넣고,
+기존 검색 경로(count + query)와 행렬-벡터 곱 검색의 p50/p99 지연 시간 및 top-1 일치율을 보고합니다.
+
+사용 예:
+    python -m benchmarks.bench_gallery_search --sizes 100 1000 10000 --queries 200
+"""
+import argparse
+import tempfile
+import time
+import chromadb
+import numpy as np
+from app.services.gallery_index import GalleryIndex
+from benchmarks._synthetic import random_embeddings, make_queries, percentiles
+
+def chroma_search(collection, query: np.ndarray):
+    if collection.count() == 0:
+        return None
+    results = collection.query(query_embeddings=[query.tolist()], n_results=1, include=["distances"])
+    return results["ids"][0][0]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="갤러리 검색 벤치마크")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100, 1000, 5000, 10000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--noise", type=float, default=0.68, help="질의 잡음 크기 (벡터 노름 대비)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+
+    for size in args.sizes:
+        gallery = random_embeddings(rng, size, args.dim)
+        ids = [f"user_{i}" for i in range(size)]
+        queries = make_queries(rng, gallery, args.queries, args.noise)
+
+        with tempfile.TemporaryDirectory() as db_path:
+            client = chromadb.PersistentClient(db_path)
+            collection = client.get_or_create_collection(name="bench", metadata={"hnsw:space": "cosine"})
+            for start in range(0, size, 1000):
+                collection.add(ids=ids[start:start + 1000], embeddings=gallery[start:start + 1000].tolist())
+
+            index = GalleryIndex(dim=args.dim)
+            t0 = time.perf_counter()
+            index.load(ids, gallery)
+            build_ms = (time.perf_counter() - t0) * 1000
+
+            chroma_latency, index_latency, agree = [], [], 0
+            for query in queries:
+                t0 = time.perf_counter()
+                chroma_top = chroma_search(collection, query)
+                chroma_latency.append(time.perf_counter() - t0)
+
+                t0 = time.perf_counter()
+                index_top = index.search(query, 1)[0][0]
+                index_latency.append(time.perf_counter() - t0)
+
+                agree += chroma_top == index_top
+
+        print(f"갤러리 {size:>7}명 | chroma {percentiles(chroma_latency)} | "
+              f"index {percentiles(index_latency)} (로드 {build_ms:.1f} ms) | "
+              f"top-1 일치 {agree / len(queries):.3f}")
@@ -0,0 +1,83 @@
+"""
+갤러리 시작 시간 벤치마크 (ChromaDB에서 재구성 vs mmap 스냅샷)
+
+임시 ChromaDB 컬렉션에 무작위 템플릿을 넣고 스냅샷으로 내보낸 뒤,
+기존 시작 경로(collection.get + TemplateGallery.load)와 스냅샷 경로(read_snapshot + load_arrays)의
+시작 시간, 첫 검색 지연 시간, 스냅샷 크기를 보고합니다.
+
+사용 예:
+    python -m benchmarks.bench_gallery_snapshot --users 1000 10000 --templates 3
+"""
+import argparse
+import os
+import tempfile
+import time
+import chromadb
+import numpy as np
+from app.services.gallery_index import TemplateGallery
+from app.services import gallery_snapshot
+from benchmarks._synthetic import random_embeddings
+
+def directory_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(path) for name in files)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="갤러리 스냅샷 시작 시간 벤치마크")
+    parser.add_argument("--users", nargs="+", type=int, default=[1000, 10000])
+    parser.add_argument("--templates", type=int, default=3, help="사용자당 템플릿 수")
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+
+    for users in args.users:
+        count = users * args.templates
+        embeddings = random_embeddings(rng, count, args.dim)
+        user_ids = [f"user_{i // args.templates}" for i in range(count)]
+        template_ids = [f"{user_id}#{i:012x}" for i, user_id in enumerate(user_ids)]
+        metadatas = [{"user_id": user_id, "source": "bench"} for user_id in user_ids]
+        query = embeddings[0]
+
+        with tempfile.TemporaryDirectory() as workdir:
+            db_path = os.path.join(workdir, "faces")
+            snapshot_dir = os.path.join(workdir, "snapshot")
+
+            client = chromadb.PersistentClient(db_path)
+            collection = client.get_or_create_collection(name="bench", metadata={"hnsw:space": "cosine"})
+            for start in range(0, count, 1000):
+                collection.add(ids=template_ids[start:start + 1000],
+                               embeddings=embeddings[start:start + 1000].tolist(),
+                               metadatas=metadatas[start:start + 1000])
+
+            gallery = TemplateGallery(dim=args.dim, max_templates=args.templates)
+            gallery.load(template_ids, user_ids, embeddings)
+            exported = gallery.export_stored()
+            gallery_snapshot.write_snapshot(snapshot_dir, exported["template_ids"], metadatas, exported["templates"],
+                                            exported["centroid_ids"], exported["centroids"])
+
+            # 기존 경로: ChromaDB에서 전체 임베딩을 읽어 정규화/중심 계산
+            t0 = time.perf_counter()
+            results = collection.get(include=["embeddings", "metadatas"])
+            chroma_gallery = TemplateGallery(dim=args.dim, max_templates=args.templates)
+            chroma_gallery.load(results["ids"], [m["user_id"] for m in results["metadatas"]], results["embeddings"])
+            chroma_ms = (time.perf_counter() - t0) * 1000
+            t0 = time.perf_counter()
+            chroma_gallery.search(query)
+            chroma_first_ms = (time.perf_counter() - t0) * 1000
+
+            # 스냅샷 경로: manifest만 파싱하고 행렬은 mmap으로 연결
+            t0 = time.perf_counter()
+            snapshot = gallery_snapshot.read_snapshot(snapshot_dir, mmap=True)
+            snapshot_gallery = TemplateGallery(dim=args.dim, max_templates=args.templates)
+            snapshot_gallery.load_arrays(snapshot.template_ids, snapshot.user_ids, snapshot.templates,
+                                         snapshot.centroid_ids, snapshot.centroids)
+            snapshot_ms = (time.perf_counter() - t0) * 1000
+            t0 = time.perf_counter()
+            snapshot_gallery.search(query)
+            snapshot_first_ms = (time.perf_counter() - t0) * 1000
+
+            snapshot_mb = directory_size(snapshot_dir) / 1024 / 1024
+
+        print(f"사용자 {users:>7}명 (템플릿 {count:>7}개) | chroma 시작 {chroma_ms:9.1f} ms, 첫 검색 {chroma_first_ms:7.2f} ms | "
+              f"snapshot 시작 {snapshot_ms:8.1f} ms, 첫 검색 {snapshot_first_ms:7.2f} ms | 스냅샷 {snapshot_mb:.1f} MB")
@@ -0,0 +1,71 @@
+"""
+FaceNet 추론 백엔드별 얼굴당 지연 시간 및 정확도 벤치마크
+
+eager fp32, TorchScript, 동적 int8, ONNX Runtime 백엔드를 같은 입력으로 실행하고,
+배치 크기별 얼굴당 지연 시간과 fp32 기준 모델 대비 코사인 유사도를 보고합니다.
+
+사용 예:
+    python -m benchmarks.bench_inference_backends --fixtures ./fixtures/faces --batch-sizes 1 4 8
+"""
+import argparse
+import time
+import numpy as np
+import torch
+from facenet_pytorch import InceptionResnetV1
+from app.config import config
+from app.services.inference_backends import (
+    BACKENDS, EagerBackend, create_backend, load_fixture_faces, verify_backend_accuracy
+)
+
+def measure_latency(backend, fixtures: torch.Tensor, batch_size: int, repeats: int) -> np.ndarray:
+    batch = fixtures[:batch_size]
+    if len(batch) < batch_size:
+        batch = batch.repeat((batch_size + len(batch) - 1) // len(batch), 1, 1, 1)[:batch_size]
+
+    # 워밍업
+    for _ in range(3):
+        backend(batch)
+
+    latencies = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        backend(batch)
+        latencies.append((time.perf_counter() - t0) * 1000 / batch_size)
+    return np.array(latencies)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FaceNet 추론 백엔드 벤치마크")
+    parser.add_argument("--fixtures", default=config.FACE_BACKEND_FIXTURES, help="정렬된 얼굴 이미지 폴더")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 4])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU 스레드 수")
+    parser.add_argument("--min-cosine", type=float, default=0.99)
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    device = torch.device('cpu')
+    try:
+        fixtures = load_fixture_faces(args.fixtures, config.FACE_BACKEND_MIN_FIXTURES)
+    except RuntimeError as e:
+        raise SystemExit(str(e))
+    model = InceptionResnetV1(pretrained='casia-webface').eval().to(device)
+    reference = EagerBackend(model, device)
+    print(f"입력 {len(fixtures)}개 ({args.fixtures}), 스레드 {torch.get_num_threads()}")
+
+    for name in args.backends:
+        try:
+            backend = reference if name == "eager" else create_backend(name, model, device)
+        except Exception as e:
+            print(f"{name:>12}: 생성 실패 - {e}")
+            continue
+
+        report = verify_backend_accuracy(backend, reference, fixtures, args.min_cosine)
+        timings = "  ".join(
+            f"b{size} {np.percentile(measure_latency(backend, fixtures, size, args.repeats), 50):6.2f} ms"
+            for size in args.batch_sizes
+        )
+        print(f"{name:>12}: 얼굴당 p50 {timings}  |  코사인 평균 {report['mean_cosine']:.4f} "
+              f"최소 {report['min_cosine']:.4f}  {'통과' if report['passed'] else '미달'}")
@@ -0,0 +1,72 @@
+"""
+검색 인덱스 백엔드별 갤러리 규모 벤치마크 (bruteforce / chroma HNSW / IVF-PQ)
+
+합성 512차원 갤러리(기본 1k-1M)를 만들어 백엔드별 생성 시간, 메모리, p50/p99 질의 지연 시간과
+전수 검색 대비 recall@1을 보고합니다. 얼굴 임베딩처럼 군집 구조를 갖도록 사람 수보다 적은
+"닮은꼴" 중심 주변에 벡터를 생성하고, 질의는 등록된 벡터에 잡음을 더해 만듭니다.
+
+사용 예:
+    python -m benchmarks.bench_vector_index --sizes 1000 10000 100000 --backends bruteforce ivfpq
+    python -m benchmarks.bench_vector_index --sizes 1000000 --backends bruteforce ivfpq --queries 200
+"""
+import argparse
+import time
+import numpy as np
+from app.services.gallery_index import GalleryIndex
+from app.services.vector_index import INDEX_BACKENDS, create_index
+from benchmarks._synthetic import synthetic_gallery, make_queries, percentiles
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="검색 인덱스 백엔드 벤치마크")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--backends", nargs="+", default=list(INDEX_BACKENDS), choices=list(INDEX_BACKENDS))
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--noise", type=float, default=0.5, help="질의 잡음 크기 (벡터 노름 대비)")
+    parser.add_argument("--spread", type=float, default=1.0, help="군집 내 퍼짐 (벡터 노름 대비)")
+    parser.add_argument("--nprobe", type=int, default=8, help="IVF-PQ 검색 목록 수")
+    parser.add_argument("--subvectors", type=int, default=64, help="IVF-PQ 벡터당 바이트 수")
+    parser.add_argument("--search-ef", type=int, default=64, help="HNSW 검색 폭")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    options = {
+        "bruteforce": {},
+        "chroma": {"search_ef": args.search_ef},
+        "ivfpq": {"nprobe": args.nprobe, "subvectors": args.subvectors, "seed": args.seed}
+    }
+
+    for size in args.sizes:
+        gallery = synthetic_gallery(rng, size, args.dim, clusters=max(1, size // 20), spread=args.spread)
+        ids = [f"user_{i}" for i in range(size)]
+        queries = make_queries(rng, gallery, args.queries, args.noise)
+
+        # 기준: 전수 검색 top-1
+        exact = GalleryIndex(dim=args.dim)
+        exact.load(ids, gallery)
+        truth = [exact.search(query, 1)[0][0] for query in queries]
+        del exact
+
+        print(f"갤러리 {size:>8}개")
+        for backend in args.backends:
+            try:
+                index = create_index(backend, args.dim, **options[backend])
+            except ImportError as e:
+                print(f"  {backend:<10} 건너뜀 ({e})")
+                continue
+
+            t0 = time.perf_counter()
+            index.build(ids, gallery)
+            build_s = time.perf_counter() - t0
+
+            latencies, hits = [], 0
+            for query, expected in zip(queries, truth):
+                t0 = time.perf_counter()
+                results = index.search(query, 1)
+                latencies.append(time.perf_counter() - t0)
+                hits += bool(results) and results[0][0] == expected
+
+            print(f"  {backend:<10} 생성 {build_s:8.2f} s | 메모리 {index.memory_bytes() / 1024 / 1024:9.1f} MB | "
+                  f"{percentiles(latencies)} | recall@1 {hits / len(queries):.3f}")
+            del index
@@ -19,6 +19,7 @@ document.addEventListener('DOMContentLoaded', function() {
     const cameraError = document.getElementById('camera-error');
     const cameraStatusText = document.getElementById('camera-status-text');
     const cameraStatusIndicator = document.getElementById('camera-status-indicator');
+    const cameraOverlay = document.getElementById('camera-overlay');
     
     // 로봇 상태 관련 요소들
     const robotStatusIndicator = document.getElementById('robot-status-indicator');
@@ -29,6 +30,7 @@ document.addEventListener('DOMContentLoaded', function() {
     let sessionId = null;
     let cameraActive = false;
     let faceSessionCheckInterval = null; // 얼굴 세션 체크 인터벌
+    let detectionEvents = null; // 얼굴 탐지 메타데이터 SSE 연결
 
     // 초기 상태: 채팅 비활성화
     setChatDisabled(true);
@@ -60,6 +62,9 @@ document.addEventListener('DOMContentLoaded', function() {
                 cameraActive = true;
                 updateCameraStatus('온라인', 'online');
                 
+                // 클라이언트 오버레이 모드라면 탐지 메타데이터 구독
+                startDetectionOverlay();
+                
                 // 카메라 스트림 로드 이벤트
                 cameraStream.onload = function() {
                     updateCameraStatus('스트리밍 중', 'online');
@@ -98,6 +103,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 cameraPlaceholder.style.display = 'flex';
                 cameraError.style.display = 'none';
                 cameraStream.src = '';
+                stopDetectionOverlay();
                 
                 cameraActive = false;
                 updateCameraStatus('오프라인', 'offline');
@@ -124,6 +130,7 @@ document.addEventListener('DOMContentLoaded', function() {
         cameraPlaceholder.style.display = 'none';
         cameraError.style.display = 'flex';
         cameraError.querySelector('p').textContent = message;
+        stopDetectionOverlay();
         
         cameraActive = false;
         updateCameraStatus('오류', 'offline');
@@ -143,6 +150,7 @@ document.addEventListener('DOMContentLoaded', function() {
                     cameraError.style.display = 'none';
                     cameraActive = true;
                     updateCameraStatus('스트리밍 중', 'online');
+                    startDetectionOverlay(data.overlay_mode);
                 }
             }
         } catch (error) {
@@ -150,6 +158,87 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
+    // 얼굴 탐지 오버레이 시작 함수 (서버가 박스를 그리지 않는 client 모드일 때만)
+    async function startDetectionOverlay(overlayMode) {
+        stopDetectionOverlay();
+        
+        if (overlayMode === undefined) {
+            try {
+                const response = await fetch('/camera/status');
+                if (!response.ok) return;
+                overlayMode = (await response.json()).overlay_mode;
+            } catch (error) {
+                console.error('오버레이 모드 확인 오류:', error);
+                return;
+            }
+        }
+        
+        if (overlayMode !== 'client') return;
+        
+        cameraOverlay.style.display = 'block';
+        detectionEvents = new EventSource('/camera/detections');
+        detectionEvents.onmessage = function(event) {
+            drawDetectionOverlay(JSON.parse(event.data));
+        };
+        detectionEvents.onerror = function() {
+            // 스트림이 끝나면 재연결하지 않고 오버레이를 정리
+            if (!cameraActive) {
+                stopDetectionOverlay();
+            }
+        };
+    }
+
+    // 얼굴 탐지 오버레이 중지 함수
+    function stopDetectionOverlay() {
+        if (detectionEvents) {
+            detectionEvents.close();
+            detectionEvents = null;
+        }
+        const ctx = cameraOverlay.getContext('2d');
+        ctx.clearRect(0, 0, cameraOverlay.width, cameraOverlay.height);
+        cameraOverlay.style.display = 'none';
+    }
+
+    // 탐지 메타데이터를 스트림 위 캔버스에 그리는 함수
+    function drawDetectionOverlay(snapshot) {
+        const width = cameraStream.clientWidth;
+        const height = cameraStream.clientHeight;
+        if (cameraOverlay.width !== width || cameraOverlay.height !== height) {
+            cameraOverlay.width = width;
+            cameraOverlay.height = height;
+        }
+        
+        const ctx = cameraOverlay.getContext('2d');
+        ctx.clearRect(0, 0, width, height);
+        if (!snapshot.width || !snapshot.height) return;
+        
+        // 스트림 이미지의 object-fit: cover 배치와 좌우 반전을 그대로 따름
+        const scale = Math.max(width / snapshot.width, height / snapshot.height);
+        const offsetX = (width - snapshot.width * scale) / 2;
+        const offsetY = (height - snapshot.height * scale) / 2;
+        
+        ctx.strokeStyle = '#ff0000';
+        ctx.fillStyle = '#ff0000';
+        ctx.lineWidth = 2;
+        ctx.font = '14px sans-serif';
+        
+        snapshot.faces.forEach(face => {
+            const [x1, y1, x2, y2] = face.bbox;
+            const left = width - (offsetX + x2 * scale);
+            const top = offsetY + y1 * scale;
+            const boxWidth = (x2 - x1) * scale;
+            const boxHeight = (y2 - y1) * scale;
+            
+            ctx.strokeRect(left, top, boxWidth, boxHeight);
+            
+            let label = face.user_id || 'Face';
+            if (face.track_id !== null && face.track_id !== undefined) {
+                label += ` #${face.track_id}`;
+            }
+            ctx.fillText(label, left, Math.max(12, top - 6));
+        });
+    }
+
     // 로봇 상태 업데이트 함수
     function updateRobotStatus(status) {
         if (robotStatusIndicator) {
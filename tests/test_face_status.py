@@ -0,0 +1,37 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+pytest.importorskip("chromadb")
+pytest.importorskip("torch")
+pytest.importorskip("facenet_pytorch")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.routers import face
+from app.services.face_database_service import FaceDatabaseService
+
+class StubRecognitionService:
+    """FaceNet 가중치를 내려받지 않도록 임베딩 정보만 돌려주는 대역"""
+
+    def get_embedding_info(self):
+        return {"embedding_size": 512}
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    database = FaceDatabaseService(db_path=str(tmp_path / "faces"), load_snapshot_on_start=False)
+    monkeypatch.setattr(face, "face_database_service", database)
+    monkeypatch.setattr(face, "face_recognition_service", StubRecognitionService())
+
+    app = FastAPI()
+    app.include_router(face.router, prefix="/face")
+    return TestClient(app)
+
+def test_status_reports_gallery_memory(client):
+    response = client.get("/face/status")
+    assert response.status_code == 200
+
+    memory = response.json()["gallery_memory"]
+    for key in ("storage", "bytes_per_vector", "memory_bytes", "float32_bytes", "compression_ratio", "mmap"):
+        assert key in memory
+    assert memory["storage"] == "float32"
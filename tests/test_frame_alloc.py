@@ -0,0 +1,107 @@
+import threading
+import tracemalloc
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from app.services.frame_buffers import FrameBufferRing
+
+FRAME_BYTES = 480 * 640 * 3
+# JPEG 인코딩 결과(구독자에게 넘기는 bytes)와 크롭 품질 평가는 매 프레임 할당되지만,
+# 프레임 크기 배열(캡처/반전/RGB 변환/축소/그리기 복사본)이 하나라도 새로 생기면 넘는 상한
+MAX_BYTES_PER_FRAME = FRAME_BYTES // 4
+
+class StubFaceDetection:
+    """합성 소스의 정답 박스를 MediaPipe 결과 형식으로 돌려주는 탐지 그래프 대역"""
+
+    def __init__(self, source):
+        self.source = source
+
+    def process(self, image_rgb):
+        width = self.source.width
+        detections = []
+        for x1, y1, x2, y2 in self.source.get_ground_truth():
+            # 캡처 루프가 좌우 반전한 프레임 기준 좌표
+            x1, x2 = width - x2, width - x1
+            w, h = (x2 - x1) / width, (y2 - y1) / self.source.height
+            xmin, ymin = x1 / width, y1 / self.source.height
+            points = [(0.32, 0.4), (0.68, 0.4), (0.5, 0.55), (0.5, 0.75), (0.05, 0.45), (0.95, 0.45)]
+            detections.append(SimpleNamespace(
+                score=[0.95],
+                location_data=SimpleNamespace(
+                    relative_bounding_box=SimpleNamespace(xmin=xmin, ymin=ymin, width=w, height=h),
+                    relative_keypoints=[SimpleNamespace(x=xmin + px * w, y=ymin + py * h) for px, py in points]
+                )
+            ))
+        return SimpleNamespace(detections=detections)
+
+@pytest.fixture
+def manager(monkeypatch):
+    pytest.importorskip("fastapi")
+    pytest.importorskip("mediapipe")
+    pytest.importorskip("torch")
+    pytest.importorskip("chromadb")
+
+    from app.routers import camera
+    from app.services import face_detection_service as detection_module
+    from app.services.frame_sources import create_frame_source
+    from app.services.recognition_worker import recognition_worker
+    from app.services.session_manager import session_manager
+
+    source = create_frame_source("synthetic", realtime=False, num_faces=2)
+    source.open()
+
+    # MediaPipe 탐지 그래프만 대역으로 바꾸고 FaceDetectionService의 입력 준비/트래킹은 실제 코드 사용
+    monkeypatch.setattr(detection_module, "mp", SimpleNamespace(solutions=SimpleNamespace(
+        face_detection=SimpleNamespace(FaceDetection=lambda **kwargs: StubFaceDetection(source)),
+        drawing_utils=None
+    )))
+    service = detection_module.FaceDetectionService(
+        detection_max_side=320, tracking_enabled=True, detection_interval=5
+    )
+    monkeypatch.setattr(camera, "face_detection_service", service)
+
+    # 워커 스레드 없이 인식 작업을 큐에만 쌓음 (트랙별 작업이 진행 중인 정상 상태)
+    monkeypatch.setattr(recognition_worker, "running", True)
+
+    manager = camera.CameraManager(camera_id=90)
+    manager.camera = source
+    manager.overlay_mode = "server"
+    yield manager
+
+    source.release()
+    with recognition_worker.lock:
+        recognition_worker.in_flight.clear()
+    while not recognition_worker.jobs.empty():
+        recognition_worker.jobs.get_nowait()
+    session_manager.reset_face_state(manager.camera_id)
+
+def test_capture_frame_allocation_stays_bounded(manager):
+    stop_event = threading.Event()
+    for _ in range(10):
+        assert manager.capture_frame(stop_event)
+
+    tracemalloc.start()
+    try:
+        worst = 0
+        for _ in range(50):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            assert manager.capture_frame(stop_event)
+            _, peak = tracemalloc.get_traced_memory()
+            worst = max(worst, peak - before)
+    finally:
+        tracemalloc.stop()
+
+    assert manager.broadcaster.frame_id >= 60
+    assert worst < MAX_BYTES_PER_FRAME, f"프레임당 최대 {worst / 1024:.1f} KiB 할당"
+
+def test_ring_reuses_buffers_until_shape_changes():
+    ring = FrameBufferRing(size=2)
+    first = ring.acquire((4, 4, 3))
+    second = ring.acquire((4, 4, 3))
+    assert first is not second
+    assert ring.acquire((4, 4, 3)) is first
+
+    resized = ring.acquire((8, 8, 3))
+    assert resized.shape == (8, 8, 3) and resized is not first
+    assert resized.dtype == np.uint8
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from app.services.gallery_index import GalleryIndex, STORAGE_DTYPES
+from benchmarks._synthetic import synthetic_gallery, make_queries
+
+DIM = 512
+
+def make_fixtures(seed: int = 0, users: int = 2000, queries: int = 500):
+    """닮은꼴 군집이 있는 고정 시드 갤러리와, 등록 벡터에 잡음을 더한 질의"""
+    rng = np.random.default_rng(seed)
+    gallery = synthetic_gallery(rng, users, DIM, clusters=users // 20, spread=0.6)
+    probes = make_queries(rng, gallery, queries, noise=0.6)
+    return [f"user_{i}" for i in range(users)], gallery, probes
+
+def build_index(storage: str, ids, gallery) -> GalleryIndex:
+    index = GalleryIndex(dim=DIM, initial_capacity=len(ids), storage=storage)
+    index.load(ids, gallery)
+    return index
+
+@pytest.fixture(scope="module")
+def fixtures():
+    return make_fixtures()
+
+@pytest.mark.parametrize("storage", [storage for storage in STORAGE_DTYPES if storage != "float32"])
+def test_compressed_storage_keeps_recall_at_1(fixtures, storage):
+    ids, gallery, probes = fixtures
+    reference = build_index("float32", ids, gallery)
+    compressed = build_index(storage, ids, gallery)
+
+    expected = [reference.search(probe, 1)[0][0] for probe in probes]
+    actual = [compressed.search(probe, 1)[0][0] for probe in probes]
+
+    recall = np.mean([a == e for a, e in zip(actual, expected)])
+    assert recall == 1.0
+
+@pytest.mark.parametrize("storage", list(STORAGE_DTYPES))
+def test_scores_close_to_float32(fixtures, storage):
+    ids, gallery, probes = fixtures
+    index = build_index(storage, ids, gallery)
+
+    for probe in probes[:50]:
+        user_id, score = index.search(probe, 1)[0]
+        exact = float(gallery[ids.index(user_id)] @ probe)
+        assert abs(score - exact) < 1e-2
+        assert -1.0 <= score <= 1.0
+
+@pytest.mark.parametrize("storage", list(STORAGE_DTYPES))
+def test_upsert_and_remove(storage):
+    ids, gallery, _ = make_fixtures(seed=1, users=100, queries=1)
+    index = build_index(storage, ids[:50], gallery[:50])
+
+    index.upsert("late_user", gallery[60])
+    assert index.search(gallery[60], 1)[0][0] == "late_user"
+
+    assert index.remove("late_user")
+    assert index.search(gallery[60], 1)[0][0] != "late_user"
+    assert len(index) == 50
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+cv2 = pytest.importorskip("cv2")
+
+from app.services.inference_backends import check_fixture_faces, load_fixture_faces
+
+def write_faces(directory, count):
+    rng = np.random.default_rng(0)
+    for i in range(count):
+        cv2.imwrite(str(directory / f"face_{i}.png"), rng.integers(0, 255, (160, 160, 3), dtype=np.uint8))
+
+def test_missing_fixture_folder_names_setting(tmp_path):
+    with pytest.raises(RuntimeError, match="FACE_BACKEND_FIXTURES"):
+        check_fixture_faces(str(tmp_path / "missing"), 8)
+
+def test_too_few_fixtures_rejected(tmp_path):
+    write_faces(tmp_path, 3)
+    (tmp_path / "README.md").write_text("not an image")
+    with pytest.raises(RuntimeError, match="FACE_BACKEND_MIN_FIXTURES"):
+        load_fixture_faces(str(tmp_path), 8)
+
+def test_fixture_faces_loaded_as_normalized_tensors(tmp_path):
+    write_faces(tmp_path, 8)
+    faces = load_fixture_faces(str(tmp_path), 8)
+    assert tuple(faces.shape) == (8, 3, 160, 160)
+    assert float(faces.min()) >= -1.0 and float(faces.max()) <= 1.0